@@ -1,20 +1,130 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-import json
+from flask import Blueprint, Flask, Response, current_app, render_template, request, redirect, url_for, session, jsonify, stream_with_context
+import io
 import os
 import random
-from utils.data_validator import load_and_validate_data, load_and_validate_por_para_data, load_and_validate_vocabulary_data
+from pathlib import Path
+from utils.answer_matching import UNGRADED
+from utils.conjugation_engine import persons_for
+from utils.content import ContentPaths, ContentStore, load_or_create_secret_key
+from utils.custom_sets import CustomSet, CustomSetStore, CustomSetView
+from utils.display_names import PARA_CATEGORY_NAMES, POR_CATEGORY_NAMES, VOCAB_SET_NAMES
+from utils.export import EXPORT_FORMATS, conjugation_cards, quiz_cards, vocab_cards
+from utils.sampling import allocate, interleave, sample_positions, stratified_positions
 from utils.settings_store import load_settings as load_persisted_settings, save_settings as save_persisted_settings, validate_settings
+from utils.tenants import TenantStore
+from utils.vocab_import import import_vocab_set
+from utils.vocab_search import DEFAULT_LIMIT as VOCAB_SEARCH_LIMIT
+from utils.worksheet import MAX_ITEMS as WORKSHEET_MAX_ITEMS, WORKSHEET_FORMATS, conjugation_batches, conjugation_slots, por_para_batches
 
-app = Flask(__name__)
-app.secret_key = os.urandom(24)  # Secret key for session management
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+DEFAULT_CONFIG = {
+    # Data files (validated when the content snapshot is built)
+    "CONJUGATIONS_FILE": os.path.join(DATA_DIR, 'conjugations.json'),
+    "POR_PARA_FILE": os.path.join(DATA_DIR, 'por_para.json'),
+    "VOCABULARY_FILE": os.path.join(DATA_DIR, 'vocabulary.json'),
+    # Compiled vocabulary (python -m utils.content_blob); when set it is
+    # memory-mapped instead of loading VOCABULARY_FILE
+    "VOCABULARY_BLOB_FILE": None,
+    # Per-set shard directory (python -m utils.vocab_shards); when set, only
+    # the shard index is read at startup and sets load on first selection,
+    # with least recently used shards evicted beyond the byte budget
+    "VOCABULARY_SHARD_DIR": None,
+    "VOCABULARY_SHARD_BUDGET_BYTES": 64 * 1024 * 1024,
+    # SQLite content database (python -m utils.sqlite_content); when set it
+    # replaces all three data files
+    "CONTENT_DB_FILE": None,
+    # Build the content snapshot inside create_app() instead of on first use.
+    # Production (gunicorn preload_app) turns this on so every worker forks
+    # from a master that already holds the indexes.
+    "CONTENT_PRELOAD": False,
+    # Directory of per-class overlays (<class>.json, see utils.tenants); a
+    # session that opened /class/<class> sees the shared content through it
+    "TENANTS_DIR": None,
+    # Bearer token for POST /events/rooms/<room> under the ASGI entry point
+    # (utils.asgi); publishing is disabled while it is unset
+    "PUSH_PUBLISH_TOKEN": None,
+}
+
+bp = Blueprint('main', __name__)
+
+
+def create_app(config=None) -> Flask:
+    """
+    Application factory.
+
+    Configuration is layered: DEFAULT_CONFIG, then SPANISCH_FLASH_* environment
+    variables (values parsed as JSON where possible), then the `config` mapping.
+    """
+    app = Flask(__name__)
+    app.config.from_mapping(DEFAULT_CONFIG)
+    app.config.from_prefixed_env("SPANISCH_FLASH")
+    if config:
+        app.config.from_mapping(config)
+
+    # Persisted options storage (global, server-side)
+    os.makedirs(app.instance_path, exist_ok=True)
+    app.config.setdefault("SETTINGS_FILE_PATH", os.path.join(app.instance_path, "quiz_settings.json"))
+    # User-defined vocab sets are stored next to the settings file
+    app.config.setdefault(
+        "CUSTOM_VOCAB_SETS_FILE",
+        os.path.join(os.path.dirname(app.config["SETTINGS_FILE_PATH"]), "custom_vocab_sets.json"),
+    )
+
+    # Secret key must be stable across workers and restarts, otherwise sessions
+    # break whenever a request lands on a different process.
+    if not app.config.get("SECRET_KEY"):
+        app.config["SECRET_KEY"] = load_or_create_secret_key(os.path.join(app.instance_path, "secret_key"))
+
+    store = ContentStore(
+        ContentPaths(
+            conjugations=app.config["CONJUGATIONS_FILE"],
+            por_para=app.config["POR_PARA_FILE"],
+            vocabulary=app.config["VOCABULARY_FILE"],
+            vocabulary_blob=app.config["VOCABULARY_BLOB_FILE"],
+            vocabulary_shards=app.config["VOCABULARY_SHARD_DIR"],
+            content_db=app.config["CONTENT_DB_FILE"],
+        ),
+        vocab_set_names=VOCAB_SET_NAMES,
+        por_category_names=POR_CATEGORY_NAMES,
+        para_category_names=PARA_CATEGORY_NAMES,
+        shard_budget_bytes=app.config["VOCABULARY_SHARD_BUDGET_BYTES"],
+    )
+    app.extensions["content_store"] = store
+    app.extensions["custom_sets"] = CustomSetStore(app.config["CUSTOM_VOCAB_SETS_FILE"])
+    app.extensions["tenants"] = TenantStore(app.config["TENANTS_DIR"])
+    if app.config["CONTENT_PRELOAD"]:
+        store.get()
+
+    app.register_blueprint(bp)
+    return app
 
-# Persisted options storage (global, server-side)
-os.makedirs(app.instance_path, exist_ok=True)
-app.config.setdefault("SETTINGS_FILE_PATH", os.path.join(app.instance_path, "quiz_settings.json"))
+
+def _content_store() -> ContentStore:
+    return current_app.extensions["content_store"]
+
+
+def _content():
+    """Current content snapshot (built on first use unless preloaded), through the session's class overlay."""
+    base = _content_store().get()
+    tenant = session.get('tenant')
+    if not tenant:
+        return base
+    try:
+        return current_app.extensions["tenants"].get(base, tenant) or base
+    except ValueError as exc:
+        current_app.logger.warning("class overlay %r ignored: %s", tenant, exc)
+        return base
+
+
+def _custom_sets() -> dict:
+    """key -> (CustomSet, CustomSetView) resolved against the current snapshot (the class's, if any)."""
+    return current_app.extensions["custom_sets"].views(_content())
 
 
 def _get_settings_file_path() -> str:
-    return app.config.get("SETTINGS_FILE_PATH", os.path.join(app.instance_path, "quiz_settings.json"))
+    return current_app.config.get("SETTINGS_FILE_PATH", os.path.join(current_app.instance_path, "quiz_settings.json"))
 
 
 def _load_persisted() -> dict:
@@ -31,6 +141,238 @@ def _filter_list(values, allowed_set):
     return [v for v in values if v in allowed_set]
 
 
+def _grade_current_question(questions_key: str, current_key: str):
+    """
+    Grade {'typed': ...} against the current question's answer.
+
+    Answers are looked up in the snapshot's precompiled acceptance sets, so
+    this is cheap enough to call on every keystroke.
+    """
+    payload = request.get_json(silent=True) or {}
+    typed = payload.get('typed', '')
+    questions = session.get(questions_key, [])
+    current = session.get(current_key, 0)
+    if not isinstance(typed, str) or current >= len(questions) or questions[current].get('mode') == 'identify':
+        return jsonify({'grade': UNGRADED})
+    return jsonify({'grade': _content().answer_keys.grade(questions[current]['answer'], typed)})
+
+
+def _selected_conjugations(values):
+    """(verbs, tenses) of a conjugations form, limited to the loaded content."""
+    view = _content().option_views.conjugations
+    return (
+        _filter_list(values.getlist('verbs'), view.verb_set),
+        _filter_list(values.getlist('tenses'), view.tense_set),
+    )
+
+
+def _selected_vocab_sets(set_keys):
+    """(selected keys, their entry sequences) for built-in and custom set keys."""
+    vocab_sets = _content().vocabulary_data.get('vocab_sets', {})
+    custom_sets = _custom_sets()
+    selected_keys = [set_key for set_key in set_keys if set_key in vocab_sets or set_key in custom_sets]
+    selected_sets = [
+        vocab_sets[set_key] if set_key in vocab_sets else custom_sets[set_key][1] for set_key in selected_keys
+    ]
+    return selected_keys, selected_sets
+
+
+def _vocab_direction_fields(direction: str):
+    return VOCAB_DIRECTION_FIELDS.get(direction, VOCAB_DIRECTION_FIELDS['spanish_to_german'])
+
+
+def _export_response(cards, export_format: str, name: str, title: str):
+    fmt = EXPORT_FORMATS.get(export_format, EXPORT_FORMATS['csv'])
+    headers = {}
+    if fmt.attachment:
+        headers['Content-Disposition'] = f'attachment; filename="{name}.{fmt.extension}"'
+    return Response(
+        stream_with_context(fmt.write(cards, title)),
+        mimetype=fmt.mimetype,
+        headers=headers,
+    )
+
+
+def _por_para_strata(por_para_index, por_categories, para_categories):
+    """Category ids of the selected por and para categories, as the two sampling strata."""
+    return [
+        por_para_index.category_ids('por', por_categories),
+        por_para_index.category_ids('para', para_categories),
+    ]
+
+
+def _por_share(value) -> int:
+    try:
+        return min(100, max(0, int(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_POR_SHARE
+
+
+def _mixed_share(value, quiz_type: str) -> int:
+    try:
+        return min(100, max(0, int(value)))
+    except (TypeError, ValueError):
+        return DEFAULT_MIXED_SHARES[quiz_type]
+
+
+def _conjugation_mode(value) -> str:
+    return value if value in CONJUGATION_MODES else CONJUGATION_MODES[0]
+
+
+def _vocab_mode(value) -> str:
+    return value if value in VOCAB_MODES else VOCAB_MODES[0]
+
+
+def _conjugation_questions(verbs, tenses, mode: str, count: int) -> list:
+    content = _content()
+    quiz_data = content.conjugations_data.get('conjugations_quiz', {})
+    questions = []
+    for _ in range(count):
+        verb = random.choice(verbs)
+        tense = random.choice(tenses)
+        person = random.choice(persons_for(tense))
+        
+        answer = quiz_data[verb][tense][person]
+        question = {
+            'verb': verb,
+            'tense': tense,
+            'person': person,
+            'answer': answer
+        }
+        if mode == 'identify':
+            # Every reading of the form across all verbs, not just the selected ones
+            question['mode'] = mode
+            question['analyses'] = [a.label() for a in content.form_index.analyses(answer)]
+        questions.append(question)
+    return questions
+
+
+def _por_para_questions(por_categories, para_categories, por_share: int, count: int) -> list:
+    # Por and para are drawn as separate strata, round-robin over the
+    # selected categories of each; only drawn sentences become question dicts
+    por_para_index = _content().por_para_index
+    strata = _por_para_strata(por_para_index, por_categories, para_categories)
+    drawn = stratified_positions(strata, por_para_index.lengths, count, (por_share, 100 - por_share))
+    return [por_para_index.question(category_id, position) for category_id, position in drawn]
+
+
+def _vocab_questions(set_keys, direction: str, mode: str, count: int) -> list:
+    content = _content()
+    selected_keys, selected_sets = _selected_vocab_sets(set_keys)
+    
+    # Draw (set, position) pairs directly from the selected sets (no flattened copy)
+    drawn = sample_positions([len(entries) for entries in selected_sets], count)
+    
+    question_field, answer_field = _vocab_direction_fields(direction)
+    questions = []
+    for set_index, position in drawn:
+        word_entry = selected_sets[set_index][position]
+        question = getattr(word_entry, question_field)
+        answer = getattr(word_entry, answer_field)
+        
+        question_data = {
+            'question': question,
+            'answer': answer,
+            'direction': direction
+        }
+        if mode == 'multiple_choice':
+            # Neighbors are precomputed per set, so this is O(choices); a
+            # custom set uses the neighbors of the entry's own set
+            set_key, entries = selected_keys[set_index], selected_sets[set_index]
+            if isinstance(entries, CustomSetView):
+                set_key, entries, position = entries.origin(position)
+            question_data['mode'] = mode
+            question_data['choices'] = content.distractors.choices(set_key, entries, position, answer_field)
+        questions.append(question_data)
+    return questions
+
+
+def _assign_contestants(questions: list, contestant_names: list) -> None:
+    """Give every contestant an equal share of `questions` (the remainder at random), in random order."""
+    num_contestants = len(contestant_names)
+    questions_per_contestant = len(questions) // num_contestants
+    remaining_questions = len(questions) % num_contestants
+    
+    # Create assignment list: each contestant gets equal share, then remaining are random
+    assignment_list = []
+    for name in contestant_names:
+        assignment_list.extend([name] * questions_per_contestant)
+    
+    # Randomly assign remaining questions
+    for _ in range(remaining_questions):
+        assignment_list.append(random.choice(contestant_names))
+    
+    # Shuffle the assignment list
+    random.shuffle(assignment_list)
+    
+    for question, name in zip(questions, assignment_list):
+        question['contestant'] = name
+
+
+def _mixed_sources() -> dict:
+    """
+    What each quiz type contributes to a mixed quiz: its options as last
+    saved (this session first, then the settings file), limited to the
+    loaded content, with the same defaults as its options page.
+    """
+    persisted = _load_persisted()
+    views = _content().option_views
+
+    def saved(section, key, session_key):
+        if session_key in session:
+            return session[session_key]
+        return (persisted.get(section) or {}).get(key)
+
+    direction = saved('vocab', 'direction', 'vocab_saved_direction')
+    return {
+        'conjugations': {
+            'verbs': _filter_list(saved('conjugations', 'selected_verbs', 'saved_verbs'),
+                                  views.conjugations.verb_set) or list(views.conjugations.verbs),
+            'tenses': _filter_list(saved('conjugations', 'selected_tenses', 'saved_tenses'),
+                                   views.conjugations.tense_set) or list(views.conjugations.tenses),
+            'mode': _conjugation_mode(saved('conjugations', 'mode', 'saved_mode')),
+        },
+        'porpara': {
+            'por_categories': _filter_list(saved('porpara', 'selected_por_categories', 'porpara_saved_por_categories'),
+                                           views.porpara.por_set) or list(views.porpara.por_keys),
+            'para_categories': _filter_list(saved('porpara', 'selected_para_categories', 'porpara_saved_para_categories'),
+                                            views.porpara.para_set) or list(views.porpara.para_keys),
+            'por_share': _por_share(saved('porpara', 'por_share', 'porpara_saved_por_share')),
+        },
+        'vocab': {
+            'vocab_sets': _filter_list(saved('vocab', 'selected_vocab_sets', 'vocab_saved_vocab_sets'),
+                                       views.vocab.set_key_set | _custom_sets().keys()) or list(views.vocab.set_keys),
+            'direction': direction if direction in VOCAB_DIRECTION_FIELDS else 'spanish_to_german',
+            'mode': _vocab_mode(saved('vocab', 'mode', 'vocab_saved_mode')),
+        },
+    }
+
+
+def _mixed_questions(sources: dict, shares: dict, count: int) -> list:
+    """
+    One generation pass over all three engines: `count` is split by `shares`
+    (types with nothing selected give their share to the others), each
+    engine draws its part, and the parts are interleaved.
+    """
+    conjugations, porpara, vocab = (sources[quiz_type] for quiz_type in MIXED_QUIZ_TYPES)
+    available = {
+        'conjugations': bool(conjugations['verbs'] and conjugations['tenses']),
+        'porpara': bool(porpara['por_categories'] or porpara['para_categories']),
+        'vocab': bool(vocab['vocab_sets']),
+    }
+    counts = allocate(count, [shares[quiz_type] if available[quiz_type] else 0 for quiz_type in MIXED_QUIZ_TYPES])
+    parts = [
+        _conjugation_questions(conjugations['verbs'], conjugations['tenses'], conjugations['mode'], counts[0])
+        if counts[0] else [],
+        _por_para_questions(porpara['por_categories'], porpara['para_categories'], porpara['por_share'], counts[1]),
+        _vocab_questions(vocab['vocab_sets'], vocab['direction'], vocab['mode'], counts[2]),
+    ]
+    for quiz_type, questions in zip(MIXED_QUIZ_TYPES, parts):
+        for question in questions:
+            question['type'] = quiz_type
+    return interleave(parts)
+
+
 def _persist_section(section_name: str, section_payload: dict) -> None:
     settings = _load_persisted()
     if not isinstance(settings, dict):
@@ -38,70 +380,234 @@ def _persist_section(section_name: str, section_payload: dict) -> None:
     settings[section_name] = section_payload
     _save_persisted(validate_settings(settings))
 
-# Person sets
-DEFAULT_PERSONS = ['yo', 'tu', 'el/ella/usted', 'nosotros', 'vosotros', 'ellos/ellas/ustedes']
-IMPERATIVE_TENSES = {'imperativo_afirmativo', 'imperativo_negativo'}
-IMPERATIVE_PERSONS = ['tu', 'el/ella/usted', 'nosotros', 'vosotros', 'ellos/ellas/ustedes']
-
-# Load and validate data on startup
-DATA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'conjugations.json')
-conjugations_data = load_and_validate_data(DATA_FILE)
-
-POR_PARA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'por_para.json')
-por_para_data = load_and_validate_por_para_data(POR_PARA_FILE)
-
-VOCABULARY_FILE = os.path.join(os.path.dirname(__file__), 'data', 'vocabulary.json')
-vocabulary_data = load_and_validate_vocabulary_data(VOCABULARY_FILE)
-
-# Vocab set display names mapping
-VOCAB_SET_NAMES = {
-    'dele_b1_info': 'DELE B1 — Info Page',
-    'por_para': 'Por/Para Vocabulary',
-    'dialog_01_saludo_presentacion': 'Dialog 01 — Saludo y Presentación',
-    'dialog_05_hablar_del_tiempo': 'Dialog 05 — Hablar del Tiempo',
-    'dialog_09_decir_la_hora': 'Dialog 09 — Decir la Hora',
-    'dialog_13_describir_objetos': 'Dialog 13 — Describir Objetos',
-    'dialog_18_en_el_transporte_publico': 'Dialog 18 — En el Transporte Público',
-    'dialog_23_describir_el_lugar_donde_vives': 'Dialog 23 — Describir el Lugar donde Vives',
-    'dialog_33_hablar_de_salud_y_ejercicio': 'Dialog 33 — Hablar de Salud y Ejercicio',
-    'dialog_45_hablar_de_medio_ambiente': 'Dialog 45 — Hablar de Medio Ambiente',
-}
+# Conjugations quiz modes: 'conjugate' shows person + verb + tense and asks for
+# the form; 'identify' shows a form and asks for every verb/tense/person it can be
+CONJUGATION_MODES = ('conjugate', 'identify')
+
+# Default percentage of por questions in a por/para quiz
+DEFAULT_POR_SHARE = 50
 
-# Category display names mapping
-POR_CATEGORY_NAMES = {
-    'motivation_reason': 'Motivation/Reason',
-    'duration': 'Duration',
-    'cost_price': 'Cost/Price',
-    'location_movement': 'Location/Movement',
-    'means_of_travel': 'Means of Travel',
-    'means_of_communication': 'Means of Communication',
-    'passive_voice_action': 'Passive Voice Action'
+# Vocab quiz direction -> (question field, answer field) of a VocabEntry
+VOCAB_DIRECTION_FIELDS = {
+    'spanish_to_german': ('spanish', 'german'),
+    'spanish_to_english': ('spanish', 'english'),
+    'german_to_spanish': ('german', 'spanish'),
+    'english_to_spanish': ('english', 'spanish'),
 }
 
-PARA_CATEGORY_NAMES = {
-    'destination': 'Destination',
-    'goal': 'Goal',
-    'recipients': 'Recipients',
-    'deadlines': 'Deadlines',
-    'expression_of_opinion': 'Expression of Opinion',
-    'disparate_idea': 'Disparate Idea'
+# Vocab quiz modes: 'flashcard' reveals the answer after the timer;
+# 'multiple_choice' also offers the answer among precomputed distractors
+VOCAB_MODES = ('flashcard', 'multiple_choice')
+
+# Mixed quiz: the quiz types it draws from and their default shares (%)
+MIXED_QUIZ_TYPES = ('conjugations', 'porpara', 'vocab')
+DEFAULT_MIXED_SHARES = {'conjugations': 40, 'porpara': 30, 'vocab': 30}
+
+# Quiz type (as in /quiz/<type>/...) -> session key of its generated questions
+QUIZ_SESSION_KEYS = {
+    'conjugations': 'questions',
+    'porpara': 'porpara_questions',
+    'vocab': 'vocab_questions',
+    'mixed': 'mixed_questions',
 }
 
-@app.route('/')
+
+@bp.route('/')
 def index():
     """Main page with quiz selection"""
     return render_template('index.html')
 
-@app.route("/info/dele-b1")
+@bp.route("/info/dele-b1")
 def dele_b1_information():
     """Information page about DELE B1 competencies."""
     return render_template("dele_b1_info.html")
 
-@app.route('/quiz/conjugations/save-settings', methods=['POST'])
+@bp.route('/class/<tenant>')
+def select_class(tenant):
+    """Use the content of one class (its overlay in TENANTS_DIR) for this session."""
+    try:
+        overlay = current_app.extensions["tenants"].overlay(_content_store().get(), tenant)
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 409
+    if overlay is None:
+        return jsonify({'error': f'unknown class {tenant!r}'}), 404
+    session['tenant'] = overlay.key
+    session['tenant_name'] = overlay.name
+    return redirect(url_for('main.index'))
+
+@bp.route('/class')
+def leave_class():
+    """Back to the shared content."""
+    session.pop('tenant', None)
+    session.pop('tenant_name', None)
+    return redirect(url_for('main.index'))
+
+@bp.route('/healthz/live')
+def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return jsonify({'status': 'alive'})
+
+@bp.route('/healthz/ready')
+def readiness():
+    """Readiness probe: reports ready once the content snapshot and its indexes are built."""
+    store = _content_store()
+    try:
+        snapshot = store.get()
+    except Exception as exc:
+        return jsonify({'status': 'unavailable', 'error': str(exc)}), 503
+    return jsonify({
+        'status': 'ready',
+        'loaded_at': snapshot.loaded_at,
+        'load_seconds': round(snapshot.load_seconds, 4),
+    })
+
+@bp.route('/api/vocab/search')
+def vocab_search():
+    """Accent-insensitive vocabulary search; the last word of `q` is matched as a prefix."""
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', VOCAB_SEARCH_LIMIT, type=int)
+    index = _content().vocab_search
+    return jsonify({
+        'query': query,
+        'results': [result.as_json(index.set_names) for result in index.search(query, limit)],
+    })
+
+@bp.route('/api/vocab/custom-sets')
+def custom_vocab_sets():
+    """Saved custom vocab sets with their current sizes."""
+    return jsonify({
+        'custom_sets': [
+            {'key': set_key, **custom_set.to_json(), 'count': len(entries)}
+            for set_key, (custom_set, entries) in _custom_sets().items()
+        ],
+    })
+
+@bp.route('/api/vocab/custom-sets', methods=['POST'])
+def save_custom_vocab_set():
+    """Create or replace a custom set: {name, ids?: ['set_key:position'], query?, sets?}."""
+    try:
+        custom_set = CustomSet.from_json(request.get_json(silent=True))
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    current_app.extensions["custom_sets"].put(custom_set)
+    entries = _custom_sets()[custom_set.key][1]
+    return jsonify({'key': custom_set.key, **custom_set.to_json(), 'count': len(entries)}), 201
+
+@bp.route('/api/vocab/custom-sets/<path:set_key>', methods=['DELETE'])
+def delete_custom_vocab_set(set_key):
+    """Delete a custom set."""
+    if not current_app.extensions["custom_sets"].delete(set_key):
+        return jsonify({'error': f'unknown custom set {set_key!r}'}), 404
+    return '', 204
+
+@bp.route('/api/vocab/import', methods=['POST'])
+def import_vocab():
+    """
+    Import an uploaded CSV/TSV/Anki text export as a vocab set.
+
+    Form fields: file, set_key, format (optional, detected otherwise) and
+    replace ('on' to overwrite an existing set). The upload is parsed row by
+    row and the content snapshot is rebuilt once the set is written.
+    """
+    config = current_app.config
+    if config["VOCABULARY_BLOB_FILE"] or config["VOCABULARY_SHARD_DIR"] or config["CONTENT_DB_FILE"]:
+        return jsonify({'error': 'imports write VOCABULARY_FILE, which is not the active vocabulary source'}), 409
+    upload = request.files.get('file')
+    if upload is None:
+        return jsonify({'error': 'no file uploaded'}), 400
+    try:
+        report = import_vocab_set(
+            Path(config["VOCABULARY_FILE"]),
+            request.form.get('set_key', ''),
+            io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline=''),
+            fmt=request.form.get('format') or None,
+            filename=upload.filename or '',
+            replace=request.form.get('replace') == 'on',
+        )
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    if report.written:
+        _content_store().reload()
+    return jsonify(report.to_dict()), 201 if report.written else 200
+
+@bp.route('/export/conjugations', methods=['GET', 'POST'])
+def export_conjugations():
+    """Every form of the selected verbs and tenses (same fields as the conjugations options form)."""
+    verbs, tenses = _selected_conjugations(request.values)
+    quiz_data = _content().conjugations_data.get('conjugations_quiz', {})
+    cards = conjugation_cards(quiz_data, verbs, tenses, persons_for)
+    return _export_response(cards, request.values.get('format', 'csv'), 'conjugations', 'Conjugations')
+
+@bp.route('/export/vocab', methods=['GET', 'POST'])
+def export_vocab():
+    """Every entry of the selected vocab sets (same fields as the vocabulary options form)."""
+    _, selected_sets = _selected_vocab_sets(request.values.getlist('vocab_sets'))
+    question_field, answer_field = _vocab_direction_fields(request.values.get('direction', 'spanish_to_german'))
+    cards = vocab_cards(selected_sets, question_field, answer_field)
+    return _export_response(cards, request.values.get('format', 'csv'), 'vocabulary', 'Vocabulary')
+
+@bp.route('/export/quiz/<quiz_type>')
+def export_quiz(quiz_type):
+    """The questions of the quiz currently running in this session."""
+    if quiz_type not in QUIZ_SESSION_KEYS:
+        return jsonify({'error': f'unknown quiz type {quiz_type!r}'}), 404
+    questions = session.get(QUIZ_SESSION_KEYS[quiz_type], [])
+    return _export_response(quiz_cards(questions), request.args.get('format', 'csv'), f'{quiz_type}_quiz', 'Quiz')
+
+@bp.route('/worksheet/<quiz_type>', methods=['GET', 'POST'])
+def worksheet(quiz_type):
+    """
+    A printable drill sheet of `count` items (default: the form's
+    num_questions) with the answer key on its last pages. The same `seed`
+    always gives the same sheet; without one a random seed is printed on it.
+    """
+    values = request.values
+    try:
+        count = min(WORKSHEET_MAX_ITEMS, max(1, int(values.get('count') or values.get('num_questions') or 100)))
+        seed = int(values['seed']) if values.get('seed') else random.randrange(2**31)
+    except ValueError:
+        return jsonify({'error': 'count and seed must be integers'}), 400
+
+    if quiz_type == 'conjugations':
+        verbs, tenses = _selected_conjugations(values)
+        quiz_data = _content().conjugations_data.get('conjugations_quiz', {})
+        slots = conjugation_slots(quiz_data, verbs, tenses, persons_for)
+        if not slots:
+            return jsonify({'error': 'select at least one verb and tense'}), 400
+        title = 'Conjugations'
+
+        def batches():
+            return conjugation_batches(slots, count, seed)
+    elif quiz_type == 'porpara':
+        por_para_index = _content().por_para_index
+        strata = _por_para_strata(por_para_index, values.getlist('por_categories'), values.getlist('para_categories'))
+        if not any(por_para_index.lengths[i] for stratum in strata for i in stratum):
+            return jsonify({'error': 'select at least one por or para category'}), 400
+        por_share = _por_share(values.get('por_share', DEFAULT_POR_SHARE))
+        title = 'Por o para'
+
+        def batches():
+            return por_para_batches(por_para_index, strata, count, (por_share, 100 - por_share), seed)
+    else:
+        return jsonify({'error': f'unknown quiz type {quiz_type!r}'}), 404
+
+    fmt = WORKSHEET_FORMATS.get(values.get('format', 'html'), WORKSHEET_FORMATS['html'])
+    headers = {}
+    if fmt.attachment:
+        headers['Content-Disposition'] = f'attachment; filename="{quiz_type}_worksheet_{seed}.{fmt.extension}"'
+    return Response(
+        stream_with_context(fmt.write(batches, title, count, seed)),
+        mimetype=fmt.mimetype,
+        headers=headers,
+    )
+
+@bp.route('/quiz/conjugations/save-settings', methods=['POST'])
 def save_settings():
     """Save user settings without starting quiz"""
     selected_verbs = request.form.getlist('verbs')
     selected_tenses = request.form.getlist('tenses')
+    mode = _conjugation_mode(request.form.get('mode'))
+    typed_answers = request.form.get('typed_answers') == 'on'
     seconds_per_question = int(request.form.get('seconds_per_question', 3))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -112,6 +618,8 @@ def save_settings():
     # Save preferences to session
     session['saved_verbs'] = selected_verbs
     session['saved_tenses'] = selected_tenses
+    session['saved_mode'] = mode
+    session['saved_typed_answers'] = typed_answers
     session['saved_seconds_per_question'] = seconds_per_question
     session['saved_seconds_per_answer'] = seconds_per_answer
     session['saved_num_questions'] = num_questions
@@ -122,6 +630,8 @@ def save_settings():
         {
             "selected_verbs": selected_verbs,
             "selected_tenses": selected_tenses,
+            "mode": mode,
+            "typed_answers": typed_answers,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -129,27 +639,24 @@ def save_settings():
         },
     )
     
-    return redirect(url_for('index'))
+    return redirect(url_for('.index'))
 
-@app.route('/quiz/conjugations/options')
+@bp.route('/quiz/conjugations/options')
 def conjugations_options():
     """Options page for conjugations quiz"""
-    quiz_data = conjugations_data.get('conjugations_quiz', {})
-    verbs = sorted(quiz_data.keys())
-    
-    # Get all unique tenses from the data
-    tenses = set()
-    for verb_data in quiz_data.values():
-        tenses.update(verb_data.keys())
-    tenses = sorted(list(tenses))
+    view = _content().option_views.conjugations
+    verbs = view.verbs
+    tenses = view.tenses
+    verbs_set = view.verb_set
+    tenses_set = view.tense_set
 
     persisted = _load_persisted().get("conjugations", {}) or {}
-    verbs_set = set(verbs)
-    tenses_set = set(tenses)
 
     # Defaults from current data
     selected_verbs = verbs
     selected_tenses = tenses
+    mode = CONJUGATION_MODES[0]
+    typed_answers = False
     seconds_per_question = 3
     seconds_per_answer = 4
     num_questions = 10
@@ -161,6 +668,8 @@ def conjugations_options():
         persisted_tenses = _filter_list(persisted.get("selected_tenses"), tenses_set)
         selected_verbs = persisted_verbs or selected_verbs
         selected_tenses = persisted_tenses or selected_tenses
+        mode = _conjugation_mode(persisted.get("mode"))
+        typed_answers = persisted.get("typed_answers") is True
         if isinstance(persisted.get("seconds_per_question"), int):
             seconds_per_question = persisted["seconds_per_question"]
         if isinstance(persisted.get("seconds_per_answer"), int):
@@ -173,14 +682,18 @@ def conjugations_options():
     # Session overrides (current behavior)
     selected_verbs = _filter_list(session.get("saved_verbs", selected_verbs), verbs_set) or selected_verbs
     selected_tenses = _filter_list(session.get("saved_tenses", selected_tenses), tenses_set) or selected_tenses
+    mode = _conjugation_mode(session.get("saved_mode", mode))
+    typed_answers = session.get("saved_typed_answers", typed_answers)
     seconds_per_question = session.get("saved_seconds_per_question", seconds_per_question)
     seconds_per_answer = session.get("saved_seconds_per_answer", seconds_per_answer)
     num_questions = session.get("saved_num_questions", num_questions)
     contestants = session.get("saved_contestants", contestants)
 
     saved_prefs = {
-        "selected_verbs": selected_verbs,
-        "selected_tenses": selected_tenses,
+        "selected_verbs": frozenset(selected_verbs),
+        "selected_tenses": frozenset(selected_tenses),
+        "mode": mode,
+        "typed_answers": typed_answers,
         "seconds_per_question": seconds_per_question,
         "seconds_per_answer": seconds_per_answer,
         "num_questions": num_questions,
@@ -192,11 +705,12 @@ def conjugations_options():
                          tenses=tenses,
                          saved_prefs=saved_prefs)
 
-@app.route('/quiz/conjugations/start', methods=['POST'])
+@bp.route('/quiz/conjugations/start', methods=['POST'])
 def start_quiz():
     """Start quiz with selected options"""
-    selected_verbs = request.form.getlist('verbs')
-    selected_tenses = request.form.getlist('tenses')
+    selected_verbs, selected_tenses = _selected_conjugations(request.form)
+    mode = _conjugation_mode(request.form.get('mode'))
+    typed_answers = request.form.get('typed_answers') == 'on'
     seconds_per_question = int(request.form.get('seconds_per_question', 3))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -207,53 +721,11 @@ def start_quiz():
     
     # Validate selections
     if not selected_verbs or not selected_tenses:
-        return redirect(url_for('conjugations_options'))
-    
-    # Generate questions
-    questions = []
-    quiz_data = conjugations_data.get('conjugations_quiz', {})
-    
-    # Generate base questions
-    base_questions = []
-    for _ in range(num_questions):
-        verb = random.choice(selected_verbs)
-        tense = random.choice(selected_tenses)
-        persons = IMPERATIVE_PERSONS if tense in IMPERATIVE_TENSES else DEFAULT_PERSONS
-        person = random.choice(persons)
-        
-        answer = quiz_data[verb][tense][person]
-        base_questions.append({
-            'verb': verb,
-            'tense': tense,
-            'person': person,
-            'answer': answer
-        })
+        return redirect(url_for('.conjugations_options'))
     
-    # Assign questions to contestants if contest mode is enabled
+    questions = _conjugation_questions(selected_verbs, selected_tenses, mode, num_questions)
     if contest_mode:
-        num_contestants = len(contestant_names)
-        questions_per_contestant = num_questions // num_contestants
-        remaining_questions = num_questions % num_contestants
-        
-        # Create assignment list: each contestant gets equal share, then remaining are random
-        assignment_list = []
-        for name in contestant_names:
-            assignment_list.extend([name] * questions_per_contestant)
-        
-        # Randomly assign remaining questions
-        for _ in range(remaining_questions):
-            assignment_list.append(random.choice(contestant_names))
-        
-        # Shuffle the assignment list
-        random.shuffle(assignment_list)
-        
-        # Assign questions to contestants
-        for i, question in enumerate(base_questions):
-            question['contestant'] = assignment_list[i]
-            questions.append(question)
-    else:
-        # No contest mode, just add questions without contestant assignment
-        questions = base_questions
+        _assign_contestants(questions, contestant_names)
     
     # Store quiz data in session
     session['questions'] = questions
@@ -262,10 +734,13 @@ def start_quiz():
     session['seconds_per_answer'] = seconds_per_answer
     session['num_questions'] = num_questions
     session['contest_mode'] = contest_mode
+    session['typed_answers'] = typed_answers
     
     # Save user preferences for next time
     session['saved_verbs'] = selected_verbs
     session['saved_tenses'] = selected_tenses
+    session['saved_mode'] = mode
+    session['saved_typed_answers'] = typed_answers
     session['saved_seconds_per_question'] = seconds_per_question
     session['saved_seconds_per_answer'] = seconds_per_answer
     session['saved_num_questions'] = num_questions
@@ -276,6 +751,8 @@ def start_quiz():
         {
             "selected_verbs": selected_verbs,
             "selected_tenses": selected_tenses,
+            "mode": mode,
+            "typed_answers": typed_answers,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -283,13 +760,13 @@ def start_quiz():
         },
     )
     
-    return redirect(url_for('run_quiz'))
+    return redirect(url_for('.run_quiz'))
 
-@app.route('/quiz/conjugations/run')
+@bp.route('/quiz/conjugations/run')
 def run_quiz():
     """Quiz execution page"""
     if 'questions' not in session:
-        return redirect(url_for('conjugations_options'))
+        return redirect(url_for('.conjugations_options'))
     
     questions = session.get('questions', [])
     current_question = session.get('current_question', 0)
@@ -300,12 +777,13 @@ def run_quiz():
         session.pop('questions', None)
         session.pop('current_question', None)
         session.pop('contest_mode', None)
-        return redirect(url_for('conjugations_options'))
+        return redirect(url_for('.conjugations_options'))
     
     question = questions[current_question]
     seconds_per_question = session.get('seconds_per_question', 4)
     seconds_per_answer = session.get('seconds_per_answer', 4)
     contest_mode = session.get('contest_mode', False)
+    typed_answers = session.get('typed_answers', False) and question.get('mode') != 'identify'
     
     return render_template('quiz.html', 
                          question=question,
@@ -313,9 +791,10 @@ def run_quiz():
                          total_questions=len(questions),
                          seconds_per_question=seconds_per_question,
                          seconds_per_answer=seconds_per_answer,
-                         contest_mode=contest_mode)
+                         contest_mode=contest_mode,
+                         typed_answers=typed_answers)
 
-@app.route('/quiz/conjugations/next', methods=['POST'])
+@bp.route('/quiz/conjugations/next', methods=['POST'])
 def next_question():
     """Move to next question"""
     current_question = session.get('current_question', 0)
@@ -331,30 +810,29 @@ def next_question():
     
     return jsonify({'complete': False})
 
+@bp.route('/quiz/conjugations/check', methods=['POST'])
+def check_answer():
+    """Grade the typed answer to the current question"""
+    return _grade_current_question('questions', 'current_question')
+
 # Por vs Para Quiz Routes
-@app.route('/quiz/porpara/options')
+@bp.route('/quiz/porpara/options')
 def porpara_options():
     """Options page for por/para quiz"""
-    por_data = por_para_data.get('por', {})
-    para_data = por_para_data.get('para', {})
-    
-    # Get all por categories
-    por_categories = {key: POR_CATEGORY_NAMES.get(key, key.replace('_', ' ').title()) 
-                     for key in por_data.keys()}
-    
-    # Get all para categories
-    para_categories = {key: PARA_CATEGORY_NAMES.get(key, key.replace('_', ' ').title()) 
-                      for key in para_data.keys()}
+    view = _content().option_views.porpara
+    por_categories = view.por_categories
+    para_categories = view.para_categories
+    por_keys = view.por_keys
+    para_keys = view.para_keys
+    por_set = view.por_set
+    para_set = view.para_set
 
     persisted = _load_persisted().get("porpara", {}) or {}
-    por_keys = list(por_categories.keys())
-    para_keys = list(para_categories.keys())
-    por_set = set(por_keys)
-    para_set = set(para_keys)
 
     # Defaults from current data
     selected_por_categories = por_keys
     selected_para_categories = para_keys
+    por_share = DEFAULT_POR_SHARE
     seconds_per_question = 7
     seconds_per_answer = 4
     num_questions = 10
@@ -366,6 +844,8 @@ def porpara_options():
         persisted_para = _filter_list(persisted.get("selected_para_categories"), para_set)
         selected_por_categories = persisted_por or selected_por_categories
         selected_para_categories = persisted_para or selected_para_categories
+        if isinstance(persisted.get("por_share"), int):
+            por_share = _por_share(persisted["por_share"])
         if isinstance(persisted.get("seconds_per_question"), int):
             seconds_per_question = persisted["seconds_per_question"]
         if isinstance(persisted.get("seconds_per_answer"), int):
@@ -384,14 +864,16 @@ def porpara_options():
         session.get("porpara_saved_para_categories", selected_para_categories),
         para_set,
     ) or selected_para_categories
+    por_share = session.get("porpara_saved_por_share", por_share)
     seconds_per_question = session.get("porpara_saved_seconds_per_question", seconds_per_question)
     seconds_per_answer = session.get("porpara_saved_seconds_per_answer", seconds_per_answer)
     num_questions = session.get("porpara_saved_num_questions", num_questions)
     contestants = session.get("porpara_saved_contestants", contestants)
 
     saved_prefs = {
-        "selected_por_categories": selected_por_categories,
-        "selected_para_categories": selected_para_categories,
+        "selected_por_categories": frozenset(selected_por_categories),
+        "selected_para_categories": frozenset(selected_para_categories),
+        "por_share": por_share,
         "seconds_per_question": seconds_per_question,
         "seconds_per_answer": seconds_per_answer,
         "num_questions": num_questions,
@@ -403,11 +885,12 @@ def porpara_options():
                          para_categories=para_categories,
                          saved_prefs=saved_prefs)
 
-@app.route('/quiz/porpara/save-settings', methods=['POST'])
+@bp.route('/quiz/porpara/save-settings', methods=['POST'])
 def porpara_save_settings():
     """Save por/para quiz settings without starting quiz"""
     selected_por_categories = request.form.getlist('por_categories')
     selected_para_categories = request.form.getlist('para_categories')
+    por_share = _por_share(request.form.get('por_share', DEFAULT_POR_SHARE))
     seconds_per_question = int(request.form.get('seconds_per_question', 7))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -418,6 +901,7 @@ def porpara_save_settings():
     # Save preferences to session
     session['porpara_saved_por_categories'] = selected_por_categories
     session['porpara_saved_para_categories'] = selected_para_categories
+    session['porpara_saved_por_share'] = por_share
     session['porpara_saved_seconds_per_question'] = seconds_per_question
     session['porpara_saved_seconds_per_answer'] = seconds_per_answer
     session['porpara_saved_num_questions'] = num_questions
@@ -428,6 +912,7 @@ def porpara_save_settings():
         {
             "selected_por_categories": selected_por_categories,
             "selected_para_categories": selected_para_categories,
+            "por_share": por_share,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -435,13 +920,14 @@ def porpara_save_settings():
         },
     )
     
-    return redirect(url_for('index'))
+    return redirect(url_for('.index'))
 
-@app.route('/quiz/porpara/start', methods=['POST'])
+@bp.route('/quiz/porpara/start', methods=['POST'])
 def porpara_start_quiz():
     """Start por/para quiz with selected options"""
     selected_por_categories = request.form.getlist('por_categories')
     selected_para_categories = request.form.getlist('para_categories')
+    por_share = _por_share(request.form.get('por_share', DEFAULT_POR_SHARE))
     seconds_per_question = int(request.form.get('seconds_per_question', 7))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -452,67 +938,13 @@ def porpara_start_quiz():
     
     # Validate selections
     if not selected_por_categories and not selected_para_categories:
-        return redirect(url_for('porpara_options'))
+        return redirect(url_for('.porpara_options'))
     
-    # Generate questions
-    questions = []
-    por_data = por_para_data.get('por', {})
-    para_data = por_para_data.get('para', {})
-    
-    # Collect all available sentences from selected categories
-    available_sentences = []
-    for category in selected_por_categories:
-        if category in por_data:
-            for sentence in por_data[category]:
-                available_sentences.append({
-                    'sentence': sentence,
-                    'answer': 'por',
-                    'category': category
-                })
-    
-    for category in selected_para_categories:
-        if category in para_data:
-            for sentence in para_data[category]:
-                available_sentences.append({
-                    'sentence': sentence,
-                    'answer': 'para',
-                    'category': category
-                })
-    
-    if not available_sentences:
-        return redirect(url_for('porpara_options'))
-    
-    # Generate base questions
-    base_questions = []
-    for _ in range(num_questions):
-        question = random.choice(available_sentences).copy()
-        base_questions.append(question)
-    
-    # Assign questions to contestants if contest mode is enabled
+    questions = _por_para_questions(selected_por_categories, selected_para_categories, por_share, num_questions)
+    if not questions:
+        return redirect(url_for('.porpara_options'))
     if contest_mode:
-        num_contestants = len(contestant_names)
-        questions_per_contestant = num_questions // num_contestants
-        remaining_questions = num_questions % num_contestants
-        
-        # Create assignment list: each contestant gets equal share, then remaining are random
-        assignment_list = []
-        for name in contestant_names:
-            assignment_list.extend([name] * questions_per_contestant)
-        
-        # Randomly assign remaining questions
-        for _ in range(remaining_questions):
-            assignment_list.append(random.choice(contestant_names))
-        
-        # Shuffle the assignment list
-        random.shuffle(assignment_list)
-        
-        # Assign questions to contestants
-        for i, question in enumerate(base_questions):
-            question['contestant'] = assignment_list[i]
-            questions.append(question)
-    else:
-        # No contest mode, just add questions without contestant assignment
-        questions = base_questions
+        _assign_contestants(questions, contestant_names)
     
     # Store quiz data in session
     session['porpara_questions'] = questions
@@ -525,6 +957,7 @@ def porpara_start_quiz():
     # Save user preferences for next time
     session['porpara_saved_por_categories'] = selected_por_categories
     session['porpara_saved_para_categories'] = selected_para_categories
+    session['porpara_saved_por_share'] = por_share
     session['porpara_saved_seconds_per_question'] = seconds_per_question
     session['porpara_saved_seconds_per_answer'] = seconds_per_answer
     session['porpara_saved_num_questions'] = num_questions
@@ -535,6 +968,7 @@ def porpara_start_quiz():
         {
             "selected_por_categories": selected_por_categories,
             "selected_para_categories": selected_para_categories,
+            "por_share": por_share,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -542,13 +976,13 @@ def porpara_start_quiz():
         },
     )
     
-    return redirect(url_for('porpara_run_quiz'))
+    return redirect(url_for('.porpara_run_quiz'))
 
-@app.route('/quiz/porpara/run')
+@bp.route('/quiz/porpara/run')
 def porpara_run_quiz():
     """Por/para quiz execution page"""
     if 'porpara_questions' not in session:
-        return redirect(url_for('porpara_options'))
+        return redirect(url_for('.porpara_options'))
     
     questions = session.get('porpara_questions', [])
     current_question = session.get('porpara_current_question', 0)
@@ -559,7 +993,7 @@ def porpara_run_quiz():
         session.pop('porpara_questions', None)
         session.pop('porpara_current_question', None)
         session.pop('porpara_contest_mode', None)
-        return redirect(url_for('porpara_options'))
+        return redirect(url_for('.porpara_options'))
     
     question = questions[current_question]
     seconds_per_question = session.get('porpara_seconds_per_question', 7)
@@ -574,7 +1008,7 @@ def porpara_run_quiz():
                          seconds_per_answer=seconds_per_answer,
                          contest_mode=contest_mode)
 
-@app.route('/quiz/porpara/next', methods=['POST'])
+@bp.route('/quiz/porpara/next', methods=['POST'])
 def porpara_next_question():
     """Move to next por/para question"""
     current_question = session.get('porpara_current_question', 0)
@@ -591,25 +1025,25 @@ def porpara_next_question():
     return jsonify({'complete': False})
 
 # Vocabulary Quiz Routes
-@app.route('/quiz/vocab/options')
+@bp.route('/quiz/vocab/options')
 def vocab_options():
     """Options page for vocabulary quiz"""
-    vocab_sets = vocabulary_data.get('vocab_sets', {})
-    
-    # Get vocab set names with display names and word counts
-    vocab_set_list = []
-    for set_key in sorted(vocab_sets.keys()):
-        display_name = VOCAB_SET_NAMES.get(set_key, set_key.replace('_', ' ').title())
-        word_count = len(vocab_sets[set_key]) if isinstance(vocab_sets[set_key], list) else 0
-        vocab_set_list.append((set_key, display_name, word_count))
+    view = _content().option_views.vocab
+    custom_sets = _custom_sets()
+    # Custom sets are listed after the built-in ones; only built-ins are selected by default
+    vocab_set_list = view.vocab_sets + tuple(
+        (set_key, custom_set.name, len(entries)) for set_key, (custom_set, entries) in custom_sets.items()
+    )
+    available_set_keys = view.set_keys
+    available_set_set = view.set_key_set | custom_sets.keys()
 
     persisted = _load_persisted().get("vocab", {}) or {}
-    available_set_keys = [set_key for set_key, _, _ in vocab_set_list]
-    available_set_set = set(available_set_keys)
 
     # Defaults from current data
     selected_vocab_sets = available_set_keys
     direction = "spanish_to_german"
+    mode = VOCAB_MODES[0]
+    typed_answers = False
     seconds_per_question = 5
     seconds_per_answer = 4
     num_questions = 10
@@ -621,6 +1055,8 @@ def vocab_options():
         selected_vocab_sets = persisted_sets or selected_vocab_sets
         if isinstance(persisted.get("direction"), str):
             direction = persisted["direction"]
+        mode = _vocab_mode(persisted.get("mode"))
+        typed_answers = persisted.get("typed_answers") is True
         if isinstance(persisted.get("seconds_per_question"), int):
             seconds_per_question = persisted["seconds_per_question"]
         if isinstance(persisted.get("seconds_per_answer"), int):
@@ -636,14 +1072,18 @@ def vocab_options():
         available_set_set,
     ) or selected_vocab_sets
     direction = session.get("vocab_saved_direction", direction)
+    mode = session.get("vocab_saved_mode", mode)
+    typed_answers = session.get("vocab_saved_typed_answers", typed_answers)
     seconds_per_question = session.get("vocab_saved_seconds_per_question", seconds_per_question)
     seconds_per_answer = session.get("vocab_saved_seconds_per_answer", seconds_per_answer)
     num_questions = session.get("vocab_saved_num_questions", num_questions)
     contestants = session.get("vocab_saved_contestants", contestants)
 
     saved_prefs = {
-        "selected_vocab_sets": selected_vocab_sets,
+        "selected_vocab_sets": frozenset(selected_vocab_sets),
         "direction": direction,
+        "mode": mode,
+        "typed_answers": typed_answers,
         "seconds_per_question": seconds_per_question,
         "seconds_per_answer": seconds_per_answer,
         "num_questions": num_questions,
@@ -654,11 +1094,13 @@ def vocab_options():
                          vocab_sets=vocab_set_list,
                          saved_prefs=saved_prefs)
 
-@app.route('/quiz/vocab/save-settings', methods=['POST'])
+@bp.route('/quiz/vocab/save-settings', methods=['POST'])
 def vocab_save_settings():
     """Save vocabulary quiz settings without starting quiz"""
     selected_vocab_sets = request.form.getlist('vocab_sets')
     direction = request.form.get('direction', 'spanish_to_german')
+    mode = _vocab_mode(request.form.get('mode'))
+    typed_answers = request.form.get('typed_answers') == 'on'
     seconds_per_question = int(request.form.get('seconds_per_question', 5))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -669,6 +1111,8 @@ def vocab_save_settings():
     # Save preferences to session
     session['vocab_saved_vocab_sets'] = selected_vocab_sets
     session['vocab_saved_direction'] = direction
+    session['vocab_saved_mode'] = mode
+    session['vocab_saved_typed_answers'] = typed_answers
     session['vocab_saved_seconds_per_question'] = seconds_per_question
     session['vocab_saved_seconds_per_answer'] = seconds_per_answer
     session['vocab_saved_num_questions'] = num_questions
@@ -679,6 +1123,8 @@ def vocab_save_settings():
         {
             "selected_vocab_sets": selected_vocab_sets,
             "direction": direction,
+            "mode": mode,
+            "typed_answers": typed_answers,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -686,13 +1132,15 @@ def vocab_save_settings():
         },
     )
     
-    return redirect(url_for('index'))
+    return redirect(url_for('.index'))
 
-@app.route('/quiz/vocab/start', methods=['POST'])
+@bp.route('/quiz/vocab/start', methods=['POST'])
 def vocab_start_quiz():
     """Start vocabulary quiz with selected options"""
     selected_vocab_sets = request.form.getlist('vocab_sets')
     direction = request.form.get('direction', 'spanish_to_german')
+    mode = _vocab_mode(request.form.get('mode'))
+    typed_answers = request.form.get('typed_answers') == 'on'
     seconds_per_question = int(request.form.get('seconds_per_question', 5))
     seconds_per_answer = int(request.form.get('seconds_per_answer', 4))
     num_questions = int(request.form.get('num_questions', 10))
@@ -703,86 +1151,29 @@ def vocab_start_quiz():
     
     # Validate selections
     if not selected_vocab_sets:
-        return redirect(url_for('vocab_options'))
-    
-    # Collect words from selected vocab sets
-    vocab_sets = vocabulary_data.get('vocab_sets', {})
-    available_words = []
-    
-    for set_key in selected_vocab_sets:
-        if set_key in vocab_sets:
-            for word_entry in vocab_sets[set_key]:
-                available_words.append(word_entry.copy())
-    
-    if not available_words:
-        return redirect(url_for('vocab_options'))
+        return redirect(url_for('.vocab_options'))
     
-    # Generate base questions
-    base_questions = []
-    for _ in range(num_questions):
-        word_entry = random.choice(available_words).copy()
-        
-        # Determine question and answer based on direction
-        if direction == 'spanish_to_german':
-            question = word_entry['spanish']
-            answer = word_entry['german']
-        elif direction == 'spanish_to_english':
-            question = word_entry['spanish']
-            answer = word_entry['english']
-        elif direction == 'german_to_spanish':
-            question = word_entry['german']
-            answer = word_entry['spanish']
-        elif direction == 'english_to_spanish':
-            question = word_entry['english']
-            answer = word_entry['spanish']
-        else:
-            # Default to spanish_to_german
-            question = word_entry['spanish']
-            answer = word_entry['german']
-        
-        base_questions.append({
-            'question': question,
-            'answer': answer,
-            'direction': direction
-        })
-    
-    # Assign questions to contestants if contest mode is enabled
+    questions = _vocab_questions(selected_vocab_sets, direction, mode, num_questions)
+    if not questions:
+        return redirect(url_for('.vocab_options'))
     if contest_mode:
-        num_contestants = len(contestant_names)
-        questions_per_contestant = num_questions // num_contestants
-        remaining_questions = num_questions % num_contestants
-        
-        # Create assignment list: each contestant gets equal share, then remaining are random
-        assignment_list = []
-        for name in contestant_names:
-            assignment_list.extend([name] * questions_per_contestant)
-        
-        # Randomly assign remaining questions
-        for _ in range(remaining_questions):
-            assignment_list.append(random.choice(contestant_names))
-        
-        # Shuffle the assignment list
-        random.shuffle(assignment_list)
-        
-        # Assign questions to contestants
-        for i, question in enumerate(base_questions):
-            question['contestant'] = assignment_list[i]
-            base_questions[i] = question
-    
-    questions = base_questions
+        _assign_contestants(questions, contestant_names)
     
     # Store quiz data in session
-    session['vocab_questions'] = base_questions
+    session['vocab_questions'] = questions
     session['vocab_current_question'] = 0
     session['vocab_seconds_per_question'] = seconds_per_question
     session['vocab_seconds_per_answer'] = seconds_per_answer
     session['vocab_num_questions'] = num_questions
     session['vocab_contest_mode'] = contest_mode
     session['vocab_direction'] = direction
+    session['vocab_typed_answers'] = typed_answers
     
     # Save user preferences for next time
     session['vocab_saved_vocab_sets'] = selected_vocab_sets
     session['vocab_saved_direction'] = direction
+    session['vocab_saved_mode'] = mode
+    session['vocab_saved_typed_answers'] = typed_answers
     session['vocab_saved_seconds_per_question'] = seconds_per_question
     session['vocab_saved_seconds_per_answer'] = seconds_per_answer
     session['vocab_saved_num_questions'] = num_questions
@@ -793,6 +1184,8 @@ def vocab_start_quiz():
         {
             "selected_vocab_sets": selected_vocab_sets,
             "direction": direction,
+            "mode": mode,
+            "typed_answers": typed_answers,
             "seconds_per_question": seconds_per_question,
             "seconds_per_answer": seconds_per_answer,
             "num_questions": num_questions,
@@ -800,13 +1193,13 @@ def vocab_start_quiz():
         },
     )
     
-    return redirect(url_for('vocab_run_quiz'))
+    return redirect(url_for('.vocab_run_quiz'))
 
-@app.route('/quiz/vocab/run')
+@bp.route('/quiz/vocab/run')
 def vocab_run_quiz():
     """Vocabulary quiz execution page"""
     if 'vocab_questions' not in session:
-        return redirect(url_for('vocab_options'))
+        return redirect(url_for('.vocab_options'))
     
     questions = session.get('vocab_questions', [])
     current_question = session.get('vocab_current_question', 0)
@@ -818,12 +1211,13 @@ def vocab_run_quiz():
         session.pop('vocab_current_question', None)
         session.pop('vocab_contest_mode', None)
         session.pop('vocab_direction', None)
-        return redirect(url_for('vocab_options'))
+        return redirect(url_for('.vocab_options'))
     
     question = questions[current_question]
     seconds_per_question = session.get('vocab_seconds_per_question', 5)
     seconds_per_answer = session.get('vocab_seconds_per_answer', 4)
     contest_mode = session.get('vocab_contest_mode', False)
+    typed_answers = session.get('vocab_typed_answers', False)
     
     return render_template('vocab_quiz.html',
                          question=question,
@@ -831,9 +1225,10 @@ def vocab_run_quiz():
                          total_questions=len(questions),
                          seconds_per_question=seconds_per_question,
                          seconds_per_answer=seconds_per_answer,
-                         contest_mode=contest_mode)
+                         contest_mode=contest_mode,
+                         typed_answers=typed_answers)
 
-@app.route('/quiz/vocab/next', methods=['POST'])
+@bp.route('/quiz/vocab/next', methods=['POST'])
 def vocab_next_question():
     """Move to next vocabulary question"""
     current_question = session.get('vocab_current_question', 0)
@@ -850,5 +1245,157 @@ def vocab_next_question():
     
     return jsonify({'complete': False})
 
+@bp.route('/quiz/vocab/check', methods=['POST'])
+def vocab_check_answer():
+    """Grade the typed answer to the current vocabulary question"""
+    return _grade_current_question('vocab_questions', 'vocab_current_question')
+
+# Mixed Quiz Routes
+@bp.route('/quiz/mixed/options')
+def mixed_options():
+    """Options page for the mixed quiz"""
+    persisted = _load_persisted().get("mixed", {}) or {}
+
+    # Defaults
+    shares = dict(DEFAULT_MIXED_SHARES)
+    typed_answers = False
+    seconds_per_question = 6
+    seconds_per_answer = 4
+    num_questions = 15
+    contestants = []
+
+    # Apply persisted
+    if isinstance(persisted, dict) and persisted:
+        for quiz_type in MIXED_QUIZ_TYPES:
+            if isinstance(persisted.get(f"{quiz_type}_share"), int):
+                shares[quiz_type] = _mixed_share(persisted[f"{quiz_type}_share"], quiz_type)
+        typed_answers = persisted.get("typed_answers") is True
+        if isinstance(persisted.get("seconds_per_question"), int):
+            seconds_per_question = persisted["seconds_per_question"]
+        if isinstance(persisted.get("seconds_per_answer"), int):
+            seconds_per_answer = persisted["seconds_per_answer"]
+        if isinstance(persisted.get("num_questions"), int):
+            num_questions = persisted["num_questions"]
+        if isinstance(persisted.get("contestants"), list):
+            contestants = [c for c in persisted.get("contestants", []) if isinstance(c, str) and c.strip()]
+
+    # Session overrides
+    shares = session.get("mixed_saved_shares", shares)
+    typed_answers = session.get("mixed_saved_typed_answers", typed_answers)
+    seconds_per_question = session.get("mixed_saved_seconds_per_question", seconds_per_question)
+    seconds_per_answer = session.get("mixed_saved_seconds_per_answer", seconds_per_answer)
+    num_questions = session.get("mixed_saved_num_questions", num_questions)
+    contestants = session.get("mixed_saved_contestants", contestants)
+
+    saved_prefs = {
+        "shares": shares,
+        "typed_answers": typed_answers,
+        "seconds_per_question": seconds_per_question,
+        "seconds_per_answer": seconds_per_answer,
+        "num_questions": num_questions,
+        "contestants": contestants,
+    }
+
+    return render_template('mixed_options.html',
+                         sources=_mixed_sources(),
+                         saved_prefs=saved_prefs)
+
+def _mixed_form() -> dict:
+    """The mixed options form, parsed; also the payload persisted as the "mixed" settings section."""
+    return {
+        **{f"{quiz_type}_share": _mixed_share(request.form.get(f"{quiz_type}_share"), quiz_type)
+           for quiz_type in MIXED_QUIZ_TYPES},
+        "typed_answers": request.form.get('typed_answers') == 'on',
+        "seconds_per_question": int(request.form.get('seconds_per_question', 6)),
+        "seconds_per_answer": int(request.form.get('seconds_per_answer', 4)),
+        "num_questions": int(request.form.get('num_questions', 15)),
+        "contestants": [name.strip() for name in request.form.getlist('contestants') if name.strip()],
+    }
+
+def _save_mixed_preferences(form: dict) -> None:
+    session['mixed_saved_shares'] = {quiz_type: form[f"{quiz_type}_share"] for quiz_type in MIXED_QUIZ_TYPES}
+    session['mixed_saved_typed_answers'] = form['typed_answers']
+    session['mixed_saved_seconds_per_question'] = form['seconds_per_question']
+    session['mixed_saved_seconds_per_answer'] = form['seconds_per_answer']
+    session['mixed_saved_num_questions'] = form['num_questions']
+    session['mixed_saved_contestants'] = form['contestants']
+    _persist_section("mixed", form)
+
+@bp.route('/quiz/mixed/save-settings', methods=['POST'])
+def mixed_save_settings():
+    """Save mixed quiz settings without starting quiz"""
+    _save_mixed_preferences(_mixed_form())
+    return redirect(url_for('.index'))
+
+@bp.route('/quiz/mixed/start', methods=['POST'])
+def mixed_start_quiz():
+    """Start a quiz drawing from all three quiz types, each with its saved selection"""
+    form = _mixed_form()
+    shares = {quiz_type: form[f"{quiz_type}_share"] for quiz_type in MIXED_QUIZ_TYPES}
+    questions = _mixed_questions(_mixed_sources(), shares, form['num_questions'])
+    _save_mixed_preferences(form)
+    if not questions:
+        return redirect(url_for('.mixed_options'))
+    if form['contestants']:
+        _assign_contestants(questions, form['contestants'])
+
+    # One quiz state for the whole session, whatever the question types
+    session['mixed_questions'] = questions
+    session['mixed_current_question'] = 0
+    session['mixed_seconds_per_question'] = form['seconds_per_question']
+    session['mixed_seconds_per_answer'] = form['seconds_per_answer']
+    session['mixed_contest_mode'] = bool(form['contestants'])
+    session['mixed_typed_answers'] = form['typed_answers']
+
+    return redirect(url_for('.mixed_run_quiz'))
+
+@bp.route('/quiz/mixed/run')
+def mixed_run_quiz():
+    """
+    Mixed quiz page. Every remaining card is rendered into the page once,
+    each with its quiz type's card template; quiz.js shows them in turn
+    without reloading.
+    """
+    if 'mixed_questions' not in session:
+        return redirect(url_for('.mixed_options'))
+
+    questions = session.get('mixed_questions', [])
+    current_question = session.get('mixed_current_question', 0)
+
+    if current_question >= len(questions):
+        session.pop('mixed_questions', None)
+        session.pop('mixed_current_question', None)
+        session.pop('mixed_contest_mode', None)
+        return redirect(url_for('.mixed_options'))
+
+    return render_template('mixed_quiz.html',
+                         questions=questions,
+                         current_question=current_question,
+                         total_questions=len(questions),
+                         seconds_per_question=session.get('mixed_seconds_per_question', 6),
+                         seconds_per_answer=session.get('mixed_seconds_per_answer', 4),
+                         contest_mode=session.get('mixed_contest_mode', False),
+                         mixed_typed_answers=session.get('mixed_typed_answers', False))
+
+@bp.route('/quiz/mixed/next', methods=['POST'])
+def mixed_next_question():
+    """Move to next mixed question"""
+    current_question = session.get('mixed_current_question', 0)
+    session['mixed_current_question'] = current_question + 1
+
+    if session['mixed_current_question'] >= len(session.get('mixed_questions', [])):
+        session.pop('mixed_questions', None)
+        session.pop('mixed_current_question', None)
+        session.pop('mixed_contest_mode', None)
+        return jsonify({'complete': True})
+
+    return jsonify({'complete': False})
+
+@bp.route('/quiz/mixed/check', methods=['POST'])
+def mixed_check_answer():
+    """Grade the typed answer to the current mixed question"""
+    return _grade_current_question('mixed_questions', 'mixed_current_question')
+
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    create_app({"CONTENT_PRELOAD": True}).run(debug=True)
@@ -0,0 +1,13 @@
+"""
+ASGI entry point (utils.asgi): the regular routes run unchanged on a thread
+pool, the push endpoints (/events/rooms/<room>) on the event loop.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 8000
+
+Configuration is the same as for the WSGI app (SPANISCH_FLASH_* environment
+variables); ASGI_WSGI_THREADS sizes the thread pool.
+"""
+from app import create_app
+from utils.asgi import create_asgi_app
+
+application = create_asgi_app(create_app())
@@ -0,0 +1,86 @@
+"""
+Conjugation engine: generation cost and memory for large verb lists.
+
+Builds a ConjugationTable of synthetic regular and stem-changing verbs, then
+times cold generation (cache cleared) and cached lookups, and compares the
+retained size of the table with the same forms stored as full dicts.
+
+    python benchmarks/conjugation_engine.py
+    python benchmarks/conjugation_engine.py --verbs 20000 --lookups 200000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.conjugation_engine import CACHE_SIZE, ConjugationTable, VerbSpec, conjugate  # noqa: E402
+
+STEMS = ("habl", "trabaj", "pens", "cont", "busc", "lleg", "empez", "com", "beb", "volv", "viv", "ped", "dorm")
+PATTERNS = {
+    "habl": ("ar", None), "trabaj": ("ar", None), "pens": ("ar", "e>ie"), "cont": ("ar", "o>ue"),
+    "busc": ("ar", None), "lleg": ("ar", None), "empez": ("ar", "e>ie"), "com": ("er", None),
+    "beb": ("er", None), "volv": ("er", "o>ue"), "viv": ("ir", None), "ped": ("ir", "e>i"),
+    "dorm": ("ir", "o>ue"),
+}
+
+
+def synthetic_table(count: int) -> ConjugationTable:
+    specs = {}
+    for n in range(count):
+        stem = STEMS[n % len(STEMS)]
+        ending, change = PATTERNS[stem]
+        # A numeric prefix keeps the verbs distinct without changing the pattern
+        infinitive = f"x{n}{stem}{ending}"
+        specs[infinitive] = VerbSpec(infinitive, stem_change=change)
+    return ConjugationTable(specs)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbs", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    table = synthetic_table(args.verbs)
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    conjugate.cache_clear()
+    started = time.perf_counter()
+    for verb in table:
+        table[verb]["presente"]["yo"]
+    cold = time.perf_counter() - started
+
+    rng = random.Random(1)
+    hot_verbs = list(table)[:CACHE_SIZE]
+    picks = [rng.choice(hot_verbs) for _ in range(args.lookups)]
+    for verb in hot_verbs:
+        table[verb]
+    started = time.perf_counter()
+    for verb in picks:
+        table[verb]["subjuntivo_presente"]["nosotros"]
+    hot = time.perf_counter() - started
+
+    tracemalloc.start()
+    full = {verb: {t: dict(p) for t, p in table[verb].items()} for verb in table}
+    full_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del full
+
+    print(f"{args.verbs} verbs, cache size {CACHE_SIZE}")
+    print(f"  cold generation: {cold / args.verbs * 1e6:8.1f} us/verb")
+    print(f"  cached lookup:   {hot / args.lookups * 1e6:8.2f} us/lookup")
+    print(f"  table memory:    {table_bytes / 1e6:8.2f} MB (specs only)")
+    print(f"  full paradigms:  {full_bytes / 1e6:8.2f} MB (all forms as dicts)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
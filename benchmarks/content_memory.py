@@ -0,0 +1,126 @@
+"""
+tracemalloc report: dict-based vocabulary vs compact VocabEntry records.
+
+Builds a synthetic corpus (default 200k entries spread over many sets, with
+the kind of repetition the real data has: shared English glosses, words
+reused across dialogue sets) and reports
+
+- resident content size for JSON dicts (what json.load gives) vs
+  compact_vocabulary_data (VocabEntry + StringPool)
+- bytes allocated while generating quizzes with the old flatten-and-copy
+  path vs sample_from_sequences over the compact sets
+
+    python benchmarks/content_memory.py
+    python benchmarks/content_memory.py --entries 500000 --quizzes 200
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.records import StringPool, compact_vocabulary_data  # noqa: E402
+from utils.sampling import sample_from_sequences  # noqa: E402
+
+ENGLISH_GLOSSES = ["[TODO]", "to go", "house", "time", "exam", "weather", "train", "health", "city", "to say"]
+
+
+def synthetic_vocabulary_json(entries: int, sets: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    per_set = max(1, entries // sets)
+    vocab_sets = {}
+    for s in range(sets):
+        rows = []
+        for i in range(per_set):
+            # ~30% of words recur across sets, as dialogue sets overlap
+            word_id = rng.randrange(entries // 3) if rng.random() < 0.3 else s * per_set + i
+            rows.append(
+                {
+                    "spanish": f"palabra_{word_id}",
+                    "german": f"Wort_{word_id}",
+                    "english": rng.choice(ENGLISH_GLOSSES) if rng.random() < 0.4 else f"word_{word_id}",
+                }
+            )
+        vocab_sets[f"set_{s:04d}"] = rows
+    return json.dumps({"vocab_sets": vocab_sets}, ensure_ascii=False)
+
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def old_generate(vocab_sets: dict, selected: list[str], num_questions: int) -> list[dict]:
+    # The former vocab_start_quiz: copy every selected entry, then copy each draw
+    available = []
+    for key in selected:
+        for entry in vocab_sets[key]:
+            available.append(entry.copy())
+    questions = []
+    for _ in range(num_questions):
+        entry = random.choice(available).copy()
+        questions.append({"question": entry["spanish"], "answer": entry["german"], "direction": "spanish_to_german"})
+    return questions
+
+
+def new_generate(vocab_sets: dict, selected: list[str], num_questions: int) -> list[dict]:
+    return [
+        {"question": e.spanish, "answer": e.german, "direction": "spanish_to_german"}
+        for e in sample_from_sequences([vocab_sets[k] for k in selected], num_questions)
+    ]
+
+
+def _mib(n: int) -> str:
+    return f"{n / (1024 * 1024):8.2f} MiB"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--sets", type=int, default=200)
+    parser.add_argument("--quizzes", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    raw = synthetic_vocabulary_json(args.entries, args.sets)
+    print(f"synthetic corpus: {args.entries} entries in {args.sets} sets, {len(raw) / 1e6:.1f} MB JSON\n")
+
+    dict_data, dict_bytes, _ = measure(lambda: json.loads(raw))
+    compact_data, compact_bytes, compact_peak = measure(
+        lambda: compact_vocabulary_data(json.loads(raw), StringPool())
+    )
+
+    print("content resident size")
+    print(f"  before (dict entries):      {_mib(dict_bytes)}")
+    print(f"  after  (VocabEntry + pool): {_mib(compact_bytes)}   (build peak {_mib(compact_peak).strip()})")
+    print(f"  ratio: {dict_bytes / max(compact_bytes, 1):.2f}x smaller\n")
+
+    selected = list(dict_data["vocab_sets"])[: max(1, args.sets // 4)]
+
+    def run(gen, data):
+        for _ in range(args.quizzes):
+            gen(data["vocab_sets"], selected, args.questions)
+
+    _, _, old_peak = measure(lambda: run(old_generate, dict_data))
+    _, _, new_peak = measure(lambda: run(new_generate, compact_data))
+
+    print(f"quiz generation ({args.quizzes} quizzes x {args.questions} questions over {len(selected)} sets)")
+    print(f"  before (flatten + copy) peak: {_mib(old_peak)}")
+    print(f"  after  (indexed draw)   peak: {_mib(new_peak)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""
+Content snapshot build time with a large verb list, JSON and SQLite backends.
+
+Writes a synthetic conjugations file (shipped por/para and vocabulary data),
+imports it into a SQLite content database, then times for each backend
+
+- build_content_snapshot
+- the first identify-the-form lookup (builds the reverse form index)
+- the first typed-answer grade of a conjugated form
+
+    python benchmarks/content_snapshot.py
+    python benchmarks/content_snapshot.py --verbs 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.conjugation_engine import synthetic_table  # noqa: E402
+from utils.conjugation_engine import conjugate  # noqa: E402
+from utils.content import ContentPaths, build_content_snapshot  # noqa: E402
+from utils.sqlite_content import import_content_to_sqlite  # noqa: E402
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbs", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    data_dir = REPO_ROOT / "data"
+    with tempfile.TemporaryDirectory() as tmp:
+        table = synthetic_table(args.verbs)
+        conjugations = Path(tmp) / "conjugations.json"
+        conjugations.write_text(json.dumps(table.to_json(), ensure_ascii=False), encoding="utf-8")
+        json_paths = ContentPaths(str(conjugations), str(data_dir / "por_para.json"), str(data_dir / "vocabulary.json"))
+        db_path = str(Path(tmp) / "content.db")
+        import_content_to_sqlite(json_paths.conjugations, json_paths.por_para, json_paths.vocabulary, db_path)
+        sqlite_paths = ContentPaths("", "", "", content_db=db_path)
+
+        last = list(table)[-1]
+        form = table[last]["presente"]["nosotros"]
+        print(f"{args.verbs} verbs")
+        for name, paths in (("json", json_paths), ("sqlite", sqlite_paths)):
+            conjugate.cache_clear()
+            snapshot, build = timed(lambda: build_content_snapshot(
+                paths, vocab_set_names={}, por_category_names={}, para_category_names={},
+            ))
+            analyses, identify = timed(lambda: snapshot.form_index.analyses(form))
+            _, grade = timed(lambda: snapshot.answer_keys.grade(form, form))
+            print(f"  {name:6}  snapshot build: {build * 1e3:8.1f} ms"
+                  f"  first identify: {identify * 1e3:8.1f} ms  first grade: {grade * 1e3:6.2f} ms"
+                  f"  ({len(analyses)} analyses)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
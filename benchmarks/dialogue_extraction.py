@@ -0,0 +1,74 @@
+"""
+Dialogue vocab extraction: serial vs --jobs N.
+
+Writes a synthetic course of dialogue .tex files to a temp directory and
+times generate_dialogue_vocab_sets (no cache) for each job count, checking
+that every run produces output byte-identical to the serial one.
+
+    python benchmarks/dialogue_extraction.py
+    python benchmarks/dialogue_extraction.py --files 800 --items 400 --jobs 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.dialog_vocab_generator import generate_dialogue_vocab_sets  # noqa: E402
+
+FILLER = "\\textbf{Ana:} Hola, ¿qué tal? Hoy vamos a hablar de muchas cosas.\\\\\n"
+
+
+def write_synthetic_dialogues(dialogos_dir: Path, files: int, items: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    for n in range(files):
+        lines = ["\\documentclass{article}", "\\begin{document}", "\\section*{Diálogo}", FILLER * 200]
+        lines += ["\\section*{Vocabulario}", "\\begin{itemize}[leftmargin=*]"]
+        for i in range(items):
+            w = rng.randrange(items * 20)
+            lines.append(f"    \\item \\textbf{{¿palabra {w}?}} - Wort {w}, Begriff ({i})")
+        lines += ["\\end{itemize}", "\\end{document}", ""]
+        (dialogos_dir / f"{n % 100:02d}_dialogo_{n:04d}.tex").write_text("\n".join(lines), encoding="utf-8")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--jobs", type=int, nargs="+", default=None)
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    job_counts = args.jobs or sorted({1, 2, 4, cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dialogos = Path(tmp) / "dialogos"
+        dialogos.mkdir()
+        write_synthetic_dialogues(dialogos, args.files, args.items)
+        vocab = Path(tmp) / "vocabulary.json"
+        vocab.write_text('{"vocab_sets": {}}', encoding="utf-8")
+        print(f"{args.files} dialogues x {args.items} items, {cpus} CPUs\n")
+
+        baseline = None
+        serial_seconds = None
+        for jobs in job_counts:
+            started = time.perf_counter()
+            sets = generate_dialogue_vocab_sets(dialogos, vocab, jobs=jobs)
+            seconds = time.perf_counter() - started
+            output = json.dumps(sets, ensure_ascii=False, indent=2)
+            if baseline is None:
+                baseline, serial_seconds = output, seconds
+            identical = "identical" if output == baseline else "DIFFERENT"
+            print(f"  jobs={jobs:<3} {seconds:7.3f} s   speedup {serial_seconds / seconds:5.2f}x   {identical}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
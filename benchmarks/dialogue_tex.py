@@ -0,0 +1,115 @@
+"""
+Dialogue .tex parsing: previous line-based extractor vs the streaming tokenizer.
+
+Generates one large synthetic dialogue document (long Diálogo section, a big
+Vocabulario list, trailing exercise sections) and reports throughput for
+
+- the former extract_vocabulario_items (str.find + slice + splitlines +
+  regex per line; vocabulary only)
+- parse_dialogue_tex on the string (vocabulary, turns and metadata)
+- parse_dialogue_tex on an open file, line by line
+
+plus the peak memory of each, measured with tracemalloc.
+
+    python benchmarks/dialogue_tex.py
+    python benchmarks/dialogue_tex.py --turns 200000 --items 100000
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.dialog_tex import parse_dialogue_tex  # noqa: E402
+
+_OLD_ITEM_RE = re.compile(r"\\item\s+\\textbf\{(?P<spanish>[^}]+)\}\s+-\s+(?P<german>.+?)\s*$")
+
+
+def old_extract(tex_content: str) -> list[tuple[str, str]]:
+    start_idx = tex_content.find(r"\section*{Vocabulario}")
+    if start_idx < 0:
+        return []
+    rest = tex_content[start_idx:]
+    end_candidates = []
+    next_section = rest.find(r"\section*{", len(r"\section*{Vocabulario}"))
+    if next_section >= 0:
+        end_candidates.append(next_section)
+    end_doc = rest.find(r"\end{document}")
+    if end_doc >= 0:
+        end_candidates.append(end_doc)
+    block = rest[: min(end_candidates) if end_candidates else len(rest)]
+    items = []
+    for line in block.splitlines():
+        m = _OLD_ITEM_RE.search(line)
+        if m:
+            items.append((m.group("spanish").strip(), m.group("german").strip()))
+    return items
+
+
+def synthetic_tex(turns: int, items: int) -> str:
+    parts = [
+        "\\documentclass{article}\n\\begin{document}\n\\title{\\textbf{DIALOG: Sintético}}\n\\maketitle\n\n",
+        "\\textbf{Tema:} Sintético \\\\\n\\textbf{Nivel:} A2\n\n\\section*{Diálogo}\n\n",
+    ]
+    for i in range(turns):
+        speaker = "María" if i % 2 else "Carlos"
+        parts.append(f"\\textbf{{{speaker}:}} Frase número {i}, ¿qué tal? Muy bien, \\textit{{gracias}}.\n\n")
+    parts.append("\\section*{Vocabulario}\n\\begin{itemize}[leftmargin=*]\n")
+    for i in range(items):
+        parts.append(f"    \\item \\textbf{{palabra {i}}} - Wort {i}, Begriff (z.B. \\enquote{{uso {i}}})\n")
+    parts.append("\\end{itemize}\n\n\\section*{Preguntas}\n\\begin{enumerate}\n")
+    parts.extend(f"    \\item ¿Pregunta {i}?\n" for i in range(turns // 4))
+    parts.append("\\end{enumerate}\n\\end{document}\n")
+    return "".join(parts)
+
+
+def run(label: str, fn, size: int) -> None:
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+
+    # Separate run for memory, tracemalloc slows Python-level code down a lot
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {seconds:7.3f} s  {size / seconds / 1e6:6.1f} MB/s  peak {peak / 1e6:6.1f} MB  -> {result}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50_000)
+    parser.add_argument("--items", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    text = synthetic_tex(args.turns, args.items)
+    size = len(text.encode("utf-8"))
+    print(f"synthetic document: {size / 1e6:.1f} MB, {args.turns} turns, {args.items} vocabulary items\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "01_sintetico.tex"
+        path.write_text(text, encoding="utf-8")
+
+        def from_file():
+            with path.open("r", encoding="utf-8") as f:
+                doc = parse_dialogue_tex(f)
+            return f"{len(doc.vocabulary)} items, {len(doc.turns)} turns"
+
+        def from_string():
+            doc = parse_dialogue_tex(text)
+            return f"{len(doc.vocabulary)} items, {len(doc.turns)} turns"
+
+        run("line-based extractor (vocab only)", lambda: f"{len(old_extract(text))} items", size)
+        run("tokenizer, string", from_string, size)
+        run("tokenizer, file lines", from_file, size)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""
+Vocabulary search: index build time and autocomplete latency at scale.
+
+Builds a VocabSearchIndex over synthetic sets (random syllable words in all
+three fields), then times one-word prefix queries of increasing length and
+two-word queries.
+
+    python benchmarks/vocab_search.py
+    python benchmarks/vocab_search.py --entries 200000 --queries 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.records import VocabEntry  # noqa: E402
+from utils.vocab_search import VocabSearchIndex  # noqa: E402
+
+SYLLABLES = ("ma", "pe", "ri", "so", "tu", "ca", "le", "ni", "ño", "bá", "dé", "ro", "sa", "qui", "gue", "tra")
+
+
+def synthetic_vocabulary(entries: int, sets: int, rng: random.Random) -> dict:
+    def word() -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    vocab_sets: dict[str, list[VocabEntry]] = {f"set_{n:03d}": [] for n in range(sets)}
+    keys = list(vocab_sets)
+    for _ in range(entries):
+        spanish = word() if rng.random() < 0.7 else f"{word()} {word()}"
+        vocab_sets[rng.choice(keys)].append(VocabEntry(spanish, word().capitalize(), f"to {word()}"))
+    return {"vocab_sets": {key: tuple(entries) for key, entries in vocab_sets.items()}}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--sets", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    data = synthetic_vocabulary(args.entries, args.sets, rng)
+
+    started = time.perf_counter()
+    index = VocabSearchIndex(data, {})
+    build = time.perf_counter() - started
+    print(f"{args.entries} entries in {args.sets} sets, {len(index)} distinct")
+    print(f"  build:           {build:8.2f} s")
+
+    all_entries = [entry for entries in data["vocab_sets"].values() for entry in entries]
+    for length in (1, 2, 4, 6):
+        prefixes = [rng.choice(all_entries).spanish[:length] for _ in range(args.queries)]
+        started = time.perf_counter()
+        for prefix in prefixes:
+            index.search(prefix)
+        elapsed = time.perf_counter() - started
+        print(f"  prefix len {length}:    {elapsed / args.queries * 1e6:8.1f} us/query")
+
+    two_words = []
+    for entry in rng.sample(all_entries, min(args.queries, len(all_entries))):
+        first, _, second = entry.spanish.partition(" ")
+        two_words.append(f"{first} {second[:2]}" if second else f"{first} {entry.german[:2]}")
+    started = time.perf_counter()
+    for query in two_words:
+        index.search(query)
+    elapsed = time.perf_counter() - started
+    print(f"  two-word query:  {elapsed / len(two_words) * 1e6:8.1f} us/query")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Per-worker memory report for the gunicorn deployment (Linux only).
+
+Starts gunicorn with gunicorn.conf.py, waits for /healthz/ready, warms every
+worker with quiz requests and then prints RSS / PSS / USS per process from
+/proc/<pid>/smaps_rollup. USS (private pages) is what each extra worker really
+costs; with the pre-fork GC freeze it should stay small next to the master.
+
+    python benchmarks/worker_memory.py --workers 16
+    python benchmarks/worker_memory.py --workers 16 --no-gc-freeze
+    python benchmarks/worker_memory.py --pid <gunicorn master pid>
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+WARM_PATHS = [
+    ("GET", "/quiz/conjugations/options", None),
+    ("GET", "/quiz/porpara/options", None),
+    ("GET", "/quiz/vocab/options", None),
+    ("POST", "/quiz/vocab/start", {"vocab_sets": ["dele_b1_info", "por_para"], "num_questions": "20"}),
+    ("POST", "/quiz/porpara/start", {"por_categories": ["duration"], "para_categories": ["goal"]}),
+]
+
+
+def read_smaps_rollup(pid: int) -> dict[str, int]:
+    """Return the smaps_rollup counters of `pid` in kB."""
+    values: dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return values
+
+
+def child_pids(pid: int) -> list[int]:
+    children: list[int] = []
+    task_dir = Path(f"/proc/{pid}/task")
+    for task in task_dir.iterdir():
+        try:
+            text = (task / "children").read_text(encoding="ascii")
+        except OSError:
+            continue
+        children.extend(int(x) for x in text.split())
+    return sorted(children)
+
+
+def memory_row(pid: int) -> dict[str, float]:
+    m = read_smaps_rollup(pid)
+    return {
+        "rss": m.get("Rss", 0) / 1024,
+        "pss": m.get("Pss", 0) / 1024,
+        "uss": (m.get("Private_Clean", 0) + m.get("Private_Dirty", 0)) / 1024,
+        "shared": (m.get("Shared_Clean", 0) + m.get("Shared_Dirty", 0)) / 1024,
+    }
+
+
+def print_report(master_pid: int) -> None:
+    rows = [("master", master_pid, memory_row(master_pid))]
+    rows.extend(("worker", pid, memory_row(pid)) for pid in child_pids(master_pid))
+
+    print(f"{'role':<8}{'pid':>8}{'RSS MiB':>10}{'PSS MiB':>10}{'USS MiB':>10}{'shared MiB':>12}")
+    for role, pid, row in rows:
+        print(f"{role:<8}{pid:>8}{row['rss']:>10.1f}{row['pss']:>10.1f}{row['uss']:>10.1f}{row['shared']:>12.1f}")
+
+    workers = [row for role, _, row in rows if role == "worker"]
+    total_pss = sum(row["pss"] for _, _, row in rows)
+    print(f"\nprocesses: {len(rows)}  total PSS: {total_pss:.1f} MiB")
+    if workers:
+        avg_uss = sum(w["uss"] for w in workers) / len(workers)
+        print(f"average worker USS: {avg_uss:.1f} MiB  (master RSS {rows[0][2]['rss']:.1f} MiB)")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(base_url: str, method: str, path: str, form: dict | None) -> None:
+    data = urllib.parse.urlencode(form, doseq=True).encode() if form else None
+    req = urllib.request.Request(base_url + path, data=data, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=10) as res:
+            res.read()
+    except urllib.error.HTTPError:
+        pass
+
+
+def _wait_ready(base_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/healthz/ready", timeout=2) as res:
+                if res.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready in time")
+
+
+def run_harness(workers: int, rounds: int, gc_freeze: bool) -> int:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ)
+    env["GUNICORN_GC_FREEZE"] = "1" if gc_freeze else "0"
+    env["WEB_CONCURRENCY"] = str(workers)
+    env["BIND"] = f"127.0.0.1:{port}"
+    env.setdefault("LOG_LEVEL", "warning")
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", os.devnull],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    try:
+        _wait_ready(base_url, timeout=60)
+        # Enough requests that every worker has served a few
+        for _ in range(rounds * workers):
+            for method, path, form in WARM_PATHS:
+                _request(base_url, method, path, form)
+        time.sleep(0.5)
+        print(f"workers={workers} gc_freeze={gc_freeze}\n")
+        print_report(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=5, help="warm-up request rounds per worker")
+    parser.add_argument("--no-gc-freeze", action="store_true", help="skip gc.freeze() in the master")
+    parser.add_argument("--pid", type=int, help="report on an already running gunicorn master")
+    args = parser.parse_args(argv)
+
+    if args.pid:
+        print_report(args.pid)
+        return 0
+    return run_harness(args.workers, args.rounds, gc_freeze=not args.no_gc_freeze)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
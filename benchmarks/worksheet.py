@@ -0,0 +1,78 @@
+"""
+Worksheet generation throughput (items per second).
+
+Generates conjugation and por/para worksheets from the shipped data with
+every verb, tense and category selected, and times item generation alone
+and the full HTML sheet (questions plus answer key).
+
+    python benchmarks/worksheet.py
+    python benchmarks/worksheet.py --count 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.conjugation_engine import persons_for, quiz_data_from_json  # noqa: E402
+from utils.records import PorParaIndex  # noqa: E402
+from utils.worksheet import (  # noqa: E402
+    conjugation_batches,
+    conjugation_slots,
+    por_para_batches,
+    stream_worksheet_html,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def _report(label: str, count: int, elapsed: float) -> None:
+    print(f"  {label:<22} {elapsed:7.3f} s  {count / elapsed:12,.0f} items/s")
+
+
+def _time(label: str, count: int, batches, html: bool) -> None:
+    started = time.perf_counter()
+    if html:
+        for _ in stream_worksheet_html(batches, "Benchmark", count, 1):
+            pass
+    else:
+        for _ in batches():
+            pass
+    _report(label, count, time.perf_counter() - started)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    with open(DATA_DIR / "conjugations.json", "r", encoding="utf-8") as f:
+        quiz_data = quiz_data_from_json(json.load(f))
+    verbs = list(quiz_data)
+    tenses = list(quiz_data[verbs[0]])
+    started = time.perf_counter()
+    slots = conjugation_slots(quiz_data, verbs, tenses, persons_for)
+    print(f"conjugations: {len(slots)} slots compiled in {time.perf_counter() - started:.3f} s")
+    conjugations = lambda: conjugation_batches(slots, args.count, args.seed)  # noqa: E731
+    _time("items", args.count, conjugations, html=False)
+    _time("html sheet + key", args.count, conjugations, html=True)
+
+    with open(DATA_DIR / "por_para.json", "r", encoding="utf-8") as f:
+        index = PorParaIndex(json.load(f))
+    strata = [
+        [i for i, category in enumerate(index.categories) if category.answer == answer] for answer in ("por", "para")
+    ]
+    print(f"por/para: {sum(index.lengths)} sentences in {len(index.categories)} categories")
+    por_para = lambda: por_para_batches(index, strata, args.count, (50, 50), args.seed)  # noqa: E731
+    _time("items", args.count, por_para, html=False)
+    _time("html sheet + key", args.count, por_para, html=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
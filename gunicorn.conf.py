@@ -0,0 +1,41 @@
+# Production WSGI server configuration.
+#
+#   gunicorn -c gunicorn.conf.py
+#
+# The master process imports the app and builds the content snapshot once
+# (preload_app + SPANISCH_FLASH_CONTENT_PRELOAD), then forks the workers, so
+# boot time does not grow with the worker count.
+#
+# After preloading, the master freezes the GC (utils.prefork.prepare_for_fork)
+# so forked workers keep sharing the content pages copy-on-write. Set
+# GUNICORN_GC_FREEZE=0 to compare (benchmarks/worker_memory.py).
+#
+# Set SPANISCH_FLASH_SECRET_KEY (or keep instance/secret_key) so sessions stay
+# valid across workers and restarts.
+import multiprocessing
+import os
+
+os.environ.setdefault("SPANISCH_FLASH_CONTENT_PRELOAD", "true")
+
+wsgi_app = "app:create_app()"
+preload_app = True
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app (and its content snapshot)
+    # exists and before any worker is forked.
+    if os.environ.get("GUNICORN_GC_FREEZE", "1") != "0":
+        from utils.prefork import prepare_for_fork
+
+        prepare_for_fork()
@@ -36,6 +36,78 @@ function startQuestionTimer() {
     }, 1000);
 }
 
+// Typed-answer mode: every keystroke is graded by /quiz/<type>/check
+const TYPED_FEEDBACK = {
+    correct: 'Correct!',
+    accent: 'Almost: check the accents',
+    typo: 'Almost: check the spelling',
+};
+let typedGrade = null;
+let gradeRequest = 0;
+
+function setupTypedAnswer() {
+    const input = document.getElementById('typed-answer');
+    if (!input || !window.typedAnswers) {
+        return;
+    }
+    const quizType = typeof window.quizType !== 'undefined' ? window.quizType : 'conjugations';
+    const feedback = document.getElementById('typed-feedback');
+
+    input.addEventListener('input', () => {
+        // Only the latest keystroke's grade is shown
+        const request = ++gradeRequest;
+        fetch(`/quiz/${quizType}/check`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ typed: input.value }),
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (request !== gradeRequest) {
+                return;
+            }
+            typedGrade = data.grade;
+            input.className = `typed-answer grade-${data.grade}`;
+            feedback.textContent = TYPED_FEEDBACK[data.grade] || '';
+            if (data.grade === 'correct') {
+                clearInterval(questionTimer);
+                showAnswer();
+            }
+        })
+        .catch(error => console.error('Error:', error));
+    });
+
+    input.addEventListener('keydown', (event) => {
+        // Enter accepts a near miss and reveals the answer early
+        if (event.key === 'Enter' && typedGrade && typedGrade !== 'wrong') {
+            clearInterval(questionTimer);
+            showAnswer();
+        }
+    });
+}
+
+// Multiple-choice mode: picking an option marks it and reveals the answer
+function setupChoices() {
+    const buttons = document.querySelectorAll('.choice-button');
+    buttons.forEach(button => {
+        button.addEventListener('click', () => {
+            const correct = button.dataset.choice === questionData.answer;
+            button.classList.add(correct ? 'choice-correct' : 'choice-wrong');
+            buttons.forEach(other => {
+                other.disabled = true;
+                if (other.dataset.choice === questionData.answer) {
+                    other.classList.add('choice-correct');
+                }
+            });
+            clearInterval(questionTimer);
+            // Leave the marked options visible for a moment before the answer
+            setTimeout(showAnswer, 600);
+        });
+    });
+}
+
 function showAnswer() {
     const questionDisplay = document.getElementById('question-display');
     const answerDisplay = document.getElementById('answer-display');
@@ -90,6 +162,8 @@ function moveToNextQuestion() {
         if (data.complete) {
             // Quiz complete, redirect to options page
             window.location.href = optionsUrl;
+        } else if (window.mixedQuiz) {
+            showMixedCard(mixedCard + 1);
         } else {
             // Reload page for next question
             window.location.reload();
@@ -102,7 +176,39 @@ function moveToNextQuestion() {
     });
 }
 
+// Mixed quiz: every card arrives with the page as a <template>; they are
+// shown in turn under the same timer loop, with /quiz/mixed/next only
+// advancing the session state
+let mixedCard = 0;
+
+function showMixedCard(index) {
+    const card = document.querySelectorAll('template.quiz-card')[index];
+    if (!card) {
+        window.location.href = '/quiz/mixed/options';
+        return;
+    }
+    mixedCard = index;
+    questionData = JSON.parse(card.dataset.question);
+    typedGrade = null;
+    document.getElementById('quiz-card').replaceChildren(card.content.cloneNode(true));
+    document.getElementById('question-num').textContent = index + 1;
+
+    setupTypedAnswer();
+    setupChoices();
+    const input = document.getElementById('typed-answer');
+    if (input) {
+        input.focus();
+    }
+    startQuestionTimer();
+}
+
 // Start the quiz when page loads
 document.addEventListener('DOMContentLoaded', () => {
+    if (window.mixedQuiz) {
+        showMixedCard(window.mixedQuiz.start);
+        return;
+    }
+    setupTypedAnswer();
+    setupChoices();
     startQuestionTimer();
 });
@@ -2,15 +2,20 @@ import pytest
 
 
 @pytest.fixture()
-def client(tmp_path):
-    from app import app as flask_app
+def app(tmp_path):
+    from app import create_app
 
-    flask_app.config.update(
-        TESTING=True,
-        SECRET_KEY="test-secret-key",
-        SETTINGS_FILE_PATH=str(tmp_path / "quiz_settings.json"),
+    flask_app = create_app(
+        {
+            "TESTING": True,
+            "SECRET_KEY": "test-secret-key",
+            "SETTINGS_FILE_PATH": str(tmp_path / "quiz_settings.json"),
+        }
     )
+    yield flask_app
 
-    with flask_app.test_client() as client:
-        yield client
 
+@pytest.fixture()
+def client(app):
+    with app.test_client() as client:
+        yield client
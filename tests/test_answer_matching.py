@@ -0,0 +1,74 @@
+import pytest
+
+from utils.answer_matching import (
+    ACCENT,
+    CORRECT,
+    TYPO,
+    UNGRADED,
+    WRONG,
+    AnswerKeys,
+    compile_answer,
+    edit_distance_within,
+)
+
+
+def test_acceptance_set_covers_alternatives_and_parentheticals():
+    assert compile_answer("aprobar (un examen)").exact == {"aprobar", "aprobar un examen"}
+    assert {"bescheinigen", "nachweisen"} <= compile_answer("bescheinigen, nachweisen").exact
+    assert {"certify", "to certify", "attest"} <= compile_answer("to certify, to attest").exact
+    assert "prüfung" in compile_answer("die Prüfung").exact
+
+
+@pytest.mark.parametrize(
+    "answer, typed, grade",
+    [
+        ("aprobar (un examen)", "  Aprobar un examen ", CORRECT),
+        ("¿Qué tal?", "que tal", ACCENT),
+        ("está", "esta", ACCENT),
+        ("condujeron", "condujieron", TYPO),
+        ("bescheinigen, nachweisen", "nachwiesen", TYPO),
+        ("ser", "sea", WRONG),
+        ("año", "ano", WRONG),
+        ("[TODO]", "anything", UNGRADED),
+    ],
+)
+def test_grades(answer, typed, grade):
+    assert compile_answer(answer).grade(typed) == grade
+
+
+def test_bounded_edit_distance():
+    assert edit_distance_within("kitten", "sitting", 3)
+    assert not edit_distance_within("kitten", "sitting", 2)
+    assert not edit_distance_within("a", "abcd", 2)
+
+
+def test_answer_keys_share_compiled_keys():
+    keys = AnswerKeys(["fue", "fue", "era"])
+
+    assert len(keys) == 2
+    assert keys.key("fue") is keys.key("fue")
+    assert keys.grade("nuevo", "nuevo") == CORRECT
+    assert len(keys) == 3
+
+
+def test_keys_compiled_after_build_are_bounded():
+    keys = AnswerKeys(["fue"], max_recent=2)
+    fue, era, fui = keys.key("fue"), keys.key("era"), keys.key("fui")
+
+    keys.key("era")
+    keys.key("fuiste")
+
+    assert len(keys) == 3
+    assert keys.key("fue") is fue and keys.key("era") is era
+    # Least recently used, so compiled again
+    assert keys.key("fui") is not fui
+
+
+def test_check_endpoint_grades_current_vocab_question(client):
+    with client.session_transaction() as sess:
+        sess["vocab_questions"] = [{"question": "casa", "answer": "das Haus, das Heim", "direction": "spanish_to_german"}]
+        sess["vocab_current_question"] = 0
+
+    assert client.post("/quiz/vocab/check", json={"typed": "Haus"}).get_json() == {"grade": CORRECT}
+    assert client.post("/quiz/vocab/check", json={"typed": "Hau"}).get_json() == {"grade": WRONG}
+    assert client.post("/quiz/vocab/check", json={"typed": 3}).get_json() == {"grade": UNGRADED}
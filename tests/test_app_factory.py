@@ -0,0 +1,63 @@
+import os
+
+
+def test_create_app_is_lazy_until_content_is_needed(app):
+    store = app.extensions["content_store"]
+    assert not store.ready
+
+    with app.test_client() as client:
+        res = client.get("/quiz/vocab/options")
+    assert res.status_code == 200
+    assert store.ready
+
+
+def test_create_app_preload_builds_content(tmp_path):
+    from app import create_app
+
+    app = create_app({"TESTING": True, "SECRET_KEY": "x", "CONTENT_PRELOAD": True})
+    assert app.extensions["content_store"].ready
+
+
+def test_health_endpoints(client):
+    res = client.get("/healthz/live")
+    assert res.status_code == 200
+    assert res.get_json()["status"] == "alive"
+
+    res = client.get("/healthz/ready")
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body["status"] == "ready"
+    assert body["load_seconds"] >= 0
+
+
+def test_readiness_reports_unavailable_content(tmp_path):
+    from app import create_app
+
+    app = create_app({"TESTING": True, "SECRET_KEY": "x", "VOCABULARY_FILE": str(tmp_path / "missing.json")})
+    res = app.test_client().get("/healthz/ready")
+    assert res.status_code == 503
+    assert res.get_json()["status"] == "unavailable"
+
+
+def test_secret_key_is_persisted_in_instance_dir(tmp_path):
+    from utils.content import load_or_create_secret_key
+
+    path = str(tmp_path / "secret_key")
+    first = load_or_create_secret_key(path)
+    assert first
+    assert load_or_create_secret_key(path) == first
+
+
+def test_secret_key_is_never_read_half_written(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from utils.content import load_or_create_secret_key
+
+    path = str(tmp_path / "secret_key")
+    with ThreadPoolExecutor(8) as pool:
+        keys = set(pool.map(load_or_create_secret_key, [path] * 32))
+    assert len(keys) == 1 and len(keys.pop()) == 32
+    assert sorted(os.listdir(tmp_path)) == ["secret_key"]
+
+    (tmp_path / "secret_key").write_bytes(b"")
+    assert len(load_or_create_secret_key(path)) == 32
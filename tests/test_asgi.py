@@ -0,0 +1,209 @@
+import asyncio
+import json
+import threading
+
+from utils.asgi import DEFAULT_MAX_BODY_BYTES, AsgiApp, create_asgi_app
+
+
+def _scope(method, path, query=b"", headers=()):
+    return {"type": "http", "method": method, "path": path, "root_path": "", "query_string": query,
+            "headers": list(headers), "http_version": "1.1", "scheme": "http",
+            "server": ("testserver", 80), "client": ("127.0.0.1", 5000)}
+
+
+async def _request(app, method, path, body=b"", query=b"", headers=()):
+    messages = []
+    inbox = [{"type": "http.request", "body": body, "more_body": False}]
+    done = asyncio.Event()
+
+    async def receive():
+        if inbox:
+            return inbox.pop(0)
+        # Like a server: the connection stays open until the response is complete
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body"):
+            done.set()
+
+    await app(_scope(method, path, query, headers), receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+class _Subscriber:
+    """An open /events/rooms/<room> stream; disconnect() ends it."""
+
+    def __init__(self, app, room):
+        self.chunks = []
+        self._gone = asyncio.Event()
+        self.task = asyncio.ensure_future(app(_scope("GET", f"/events/rooms/{room}"), self._receive, self._send))
+
+    async def _receive(self):
+        await self._gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        self.chunks.append(message.get("body", b""))
+
+    async def disconnect(self):
+        self._gone.set()
+        await self.task
+
+
+def test_regular_routes_run_through_the_wsgi_app(app):
+    asgi_app = create_asgi_app(app, threads=2)
+    assert asgi_app.max_body_bytes == DEFAULT_MAX_BODY_BYTES
+    app.config["MAX_CONTENT_LENGTH"] = 1024
+    assert create_asgi_app(app, threads=1).max_body_bytes == 1024
+
+    async def scenario():
+        status, headers, body = await _request(asgi_app, "GET", "/healthz/live")
+        assert status == 200 and json.loads(body) == {"status": "alive"}
+
+        status, headers, body = await _request(
+            asgi_app, "POST", "/export/conjugations", body=b"verbs=ser&tenses=presente&format=csv",
+            headers=[(b"content-type", b"application/x-www-form-urlencoded")],
+        )
+        assert status == 200 and headers[b"content-disposition"] == b'attachment; filename="conjugations.csv"'
+        assert body.decode("utf-8").splitlines()[1] == "yo + ser (presente),soy"
+
+    asyncio.run(scenario())
+
+
+def test_rooms_broadcast_to_idle_subscribers_without_threads(app):
+    app.config["PUSH_PUBLISH_TOKEN"] = "s3cret"
+    asgi_app = create_asgi_app(app, threads=2)
+
+    async def scenario():
+        threads = threading.active_count()
+        subscribers = [_Subscriber(asgi_app, "contest-1") for _ in range(2000)]
+        other = _Subscriber(asgi_app, "contest-2")
+        await asyncio.sleep(0)
+        assert asgi_app.broadcaster.subscribers() == 2001
+        assert threading.active_count() <= threads
+
+        status, _, body = await _request(asgi_app, "POST", "/events/rooms/contest-1",
+                                         body=json.dumps({"event": "score", "data": {"Ana": 3}}).encode(),
+                                         headers=[(b"authorization", b"Bearer s3cret")])
+        assert (status, json.loads(body)) == (202, {"delivered": 2000})
+        await asyncio.sleep(0.05)
+        assert subscribers[-1].chunks[-1] == b'event: score\ndata: {"Ana": 3}\n\n'
+        assert b"score" not in b"".join(other.chunks)
+
+        for subscriber in subscribers + [other]:
+            await subscriber.disconnect()
+        assert asgi_app.broadcaster.subscribers() == 0
+
+    asyncio.run(scenario())
+
+
+def test_publish_validation_and_shutdown_closes_streams():
+    asgi_app = AsgiApp(wsgi_app=None, publish_token="s3cret")
+    auth = [(b"authorization", b"Bearer s3cret")]
+
+    async def scenario():
+        assert (await _request(asgi_app, "POST", "/events/rooms/r", body=b"{nope", headers=auth))[0] == 400
+        assert (await _request(asgi_app, "POST", "/events/rooms/r", body=b'{"event": "a\\nb"}', headers=auth))[0] == 400
+        assert (await _request(asgi_app, "POST", "/events/rooms/r", body=b"x" * 20000, headers=auth))[0] == 413
+        assert (await _request(asgi_app, "POST", "/events/rooms/r", body=b"{}"))[0] == 401
+        wrong = [(b"authorization", b"Bearer guess")]
+        assert (await _request(asgi_app, "POST", "/events/rooms/r", body=b"{}", headers=wrong))[0] == 401
+        assert (await _request(AsgiApp(wsgi_app=None), "POST", "/events/rooms/r", body=b"{}"))[0] == 403
+        assert (await _request(asgi_app, "GET", "/events/rooms/bad room"))[0] == 404
+
+        subscriber = _Subscriber(asgi_app, "r")
+        await asyncio.sleep(0)
+        lifespan = iter([{"type": "lifespan.shutdown"}])
+        sent = []
+
+        async def receive():
+            return next(lifespan)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        await asgi_app({"type": "lifespan"}, receive, send)
+        await asyncio.wait_for(subscriber.task, 1)
+        assert sent == ["lifespan.shutdown.complete"] and subscriber.chunks[-1] == b""
+
+    asyncio.run(scenario())
+
+
+def test_truncated_and_oversized_bodies_never_reach_the_app():
+    calls = []
+
+    def wsgi_app(environ, start_response):
+        calls.append(environ["wsgi.input"].read())
+        start_response("200 OK", [])
+        return [b"ok"]
+
+    asgi_app = AsgiApp(wsgi_app, threads=1, max_body_bytes=10)
+
+    async def scenario():
+        inbox = [{"type": "http.request", "body": b"verbs=", "more_body": True}, {"type": "http.disconnect"}]
+        sent = []
+
+        async def receive():
+            return inbox.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await asgi_app(_scope("POST", "/export/conjugations"), receive, send)
+        assert sent == []
+
+        assert (await _request(asgi_app, "POST", "/x", body=b"x" * 11))[0] == 413
+        assert (await _request(asgi_app, "POST", "/x", body=b"x" * 10))[0] == 200
+
+    asyncio.run(scenario())
+    assert calls == [b"x" * 10]
+
+
+def test_disconnect_while_streaming_closes_the_response():
+    produced = []
+    closed = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+
+        def chunks():
+            try:
+                for n in range(1000):
+                    produced.append(n)
+                    yield b"x" * 1024
+            finally:
+                closed.set()
+
+        return chunks()
+
+    asgi_app = AsgiApp(wsgi_app, threads=1)
+
+    async def scenario():
+        sent = []
+        gone = asyncio.Event()
+        inbox = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if inbox:
+                return inbox.pop(0)
+            await gone.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if len(sent) == 3:
+                gone.set()
+                for _ in range(3):
+                    await asyncio.sleep(0)
+
+        await asgi_app(_scope("GET", "/worksheet"), receive, send)
+        return sent
+
+    sent = asyncio.run(scenario())
+
+    assert closed.is_set()
+    assert len(produced) < 10
+    assert sent[-1]["more_body"] is True
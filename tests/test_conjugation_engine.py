@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from utils.conjugation_engine import ConjugationTable, VerbSpec, compact_verb, conjugate
+from utils.data_validator import load_and_validate_data
+
+
+def test_regular_paradigm_with_spelling_changes():
+    forms = conjugate(VerbSpec("buscar"))
+
+    assert list(forms["presente"].values()) == ["busco", "buscas", "busca", "buscamos", "buscáis", "buscan"]
+    assert forms["pretérito_indefinido"]["yo"] == "busqué"
+    assert forms["subjuntivo_presente"]["nosotros"] == "busquemos"
+    assert forms["imperativo_afirmativo"]["vosotros"] == "buscad"
+    assert forms["imperativo_negativo"]["tu"] == "no busques"
+    assert forms["pluscuamperfecto"]["nosotros"] == "habíamos buscado"
+
+
+@pytest.mark.parametrize(
+    "spec, tense, expected",
+    [
+        (VerbSpec("dormir", stem_change="o>ue"), "subjuntivo_presente", ["duerma", "duermas", "duerma", "durmamos", "durmáis", "duerman"]),
+        (VerbSpec("pedir", stem_change="e>i"), "pretérito_indefinido", ["pedí", "pediste", "pidió", "pedimos", "pedisteis", "pidieron"]),
+        (VerbSpec("jugar", stem_change="u>ue"), "subjuntivo_presente", ["juegue", "juegues", "juegue", "juguemos", "juguéis", "jueguen"]),
+        (VerbSpec("conocer"), "presente", ["conozco", "conoces", "conoce", "conocemos", "conocéis", "conocen"]),
+        (VerbSpec("construir"), "pretérito_indefinido", ["construí", "construiste", "construyó", "construimos", "construisteis", "construyeron"]),
+        (VerbSpec("leer"), "pretérito_indefinido", ["leí", "leíste", "leyó", "leímos", "leísteis", "leyeron"]),
+        (VerbSpec("conducir", preterite_stem="conduj"), "pretérito_indefinido", ["conduje", "condujiste", "condujo", "condujimos", "condujisteis", "condujeron"]),
+    ],
+)
+def test_stem_and_spelling_patterns(spec, tense, expected):
+    assert list(conjugate(spec)[tense].values()) == expected
+
+
+def test_overrides_feed_derived_tenses():
+    spec = VerbSpec.from_json("tener", {
+        "stem_change": "e>ie",
+        "future_stem": "tendr",
+        "preterite_stem": "tuv",
+        "overrides": {"presente": {"yo": "tengo"}, "imperativo_afirmativo": {"tu": "ten"}},
+    })
+    forms = conjugate(spec)
+
+    assert forms["presente"]["tu"] == "tienes"
+    assert forms["subjuntivo_presente"]["nosotros"] == "tengamos"
+    assert forms["imperativo_negativo"]["vosotros"] == "no tengáis"
+    assert forms["imperativo_afirmativo"]["tu"] == "ten"
+    assert forms["condicional"]["yo"] == "tendría"
+    assert forms["pretérito_perfecto_compuesto"]["yo"] == "he tenido"
+
+
+@pytest.mark.parametrize("infinitive, expected", [("reír", "reíd"), ("sonreír", "sonreíd"), ("hablar", "hablad")])
+def test_vosotros_imperative_keeps_the_infinitive_accent(infinitive, expected):
+    assert conjugate(VerbSpec(infinitive))["imperativo_afirmativo"]["vosotros"] == expected
+
+
+def test_accented_verb_in_shipped_data():
+    table = load_and_validate_data("data/conjugations.json")["conjugations_quiz"]
+
+    assert "oír" in table and "oir" not in table
+    assert table["oír"]["imperativo_afirmativo"]["vosotros"] == "oíd"
+    assert table["oír"]["presente"]["vosotros"] == "oís"
+    assert table["oír"]["pretérito_indefinido"]["ellos/ellas/ustedes"] == "oyeron"
+
+
+def test_shipped_data_round_trips_through_compaction():
+    table = load_and_validate_data("data/conjugations.json")["conjugations_quiz"]
+
+    assert isinstance(table, ConjugationTable)
+    assert table["ser"]["presente"]["yo"] == "soy"
+    for verb in table:
+        assert compact_verb(verb, table[verb]) == table.spec(verb)
+
+
+def test_invalid_spec_is_rejected(tmp_path):
+    path = tmp_path / "conjugations.json"
+    path.write_text(json.dumps({"verbs": {"hablar": {"overrides": {"presente": {"usted": "habla"}}}}}))
+
+    with pytest.raises(ValueError, match="unknown person 'usted'"):
+        load_and_validate_data(str(path))
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from utils.content_blob import BlobFormatError, VocabularyBlob, compile_vocabulary_blob
+from utils.records import VocabEntry
+from utils.sampling import sample_from_sequences
+
+
+def _vocab(n):
+    return {
+        "vocab_sets": {
+            "big": [{"spanish": f"palabra {i}", "german": f"Wort {i}", "english": "word"} for i in range(n)],
+            "tiny": [{"spanish": "el examen", "german": "die Prüfung", "english": "exam"}],
+        }
+    }
+
+
+def test_blob_round_trip(tmp_path):
+    path = str(tmp_path / "vocab.blob")
+    compile_vocabulary_blob(_vocab(500), path)
+
+    blob = VocabularyBlob(path)
+    sets = blob.vocab_sets
+    assert list(sets) == ["big", "tiny"]
+    assert len(sets["big"]) == 500
+    assert sets["big"][123] == VocabEntry("palabra 123", "Wort 123", "word")
+    assert sets["big"][-1].spanish == "palabra 499"
+    assert sets["tiny"][0].german == "die Prüfung"
+    with pytest.raises(IndexError):
+        sets["tiny"][1]
+
+
+def test_blob_rejects_other_files(tmp_path):
+    path = tmp_path / "not.blob"
+    path.write_bytes(b"{}" * 20)
+    with pytest.raises(BlobFormatError):
+        VocabularyBlob(str(path))
+
+
+def test_sample_from_sequences_covers_all_sequences():
+    rng = random.Random(7)
+    drawn = sample_from_sequences([["a"], [], ("b", "c")], 300, rng=rng)
+    assert len(drawn) == 300
+    assert set(drawn) == {"a", "b", "c"}
+    assert sample_from_sequences([[], ()], 5) == []
+
+
+def test_vocab_quiz_runs_from_blob(tmp_path):
+    from app import create_app
+    from utils.data_validator import load_and_validate_vocabulary_data
+
+    blob_path = str(tmp_path / "vocabulary.blob")
+    app = create_app({"TESTING": True, "SECRET_KEY": "x", "SETTINGS_FILE_PATH": str(tmp_path / "s.json")})
+    compile_vocabulary_blob(load_and_validate_vocabulary_data(app.config["VOCABULARY_FILE"]), blob_path)
+
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "x",
+        "SETTINGS_FILE_PATH": str(tmp_path / "s.json"),
+        "VOCABULARY_BLOB_FILE": blob_path,
+    })
+    client = app.test_client()
+    html = client.get("/quiz/vocab/options").get_data(as_text=True)
+    assert "DELE B1" in html
+
+    res = client.post("/quiz/vocab/start", data={"vocab_sets": ["dele_b1_info"], "num_questions": "5"})
+    assert res.status_code == 302
+    with client.session_transaction() as sess:
+        assert len(sess["vocab_questions"]) == 5
@@ -0,0 +1,55 @@
+import io
+import json
+
+from utils.content_validator import format_issue, iter_vocabulary_issues, main, write_report
+
+
+def _entry(spanish, german):
+    return {"spanish": spanish, "german": german, "english": "[TODO]"}
+
+
+def test_cross_set_duplicates_and_conflicting_translations():
+    vocab_sets = {
+        "a": [_entry("el examen", "die Prüfung"), _entry("clima", "Klima")],
+        "b": [_entry("  El examen.", "die Prüfung"), _entry("Clima", "Wetter")],
+    }
+    issues = [i for i in iter_vocabulary_issues(vocab_sets) if i.code != "too_few_entries"]
+
+    assert [(i.code, i.location["set"], i.detail["term"]) for i in issues] == [
+        ("duplicate_across_sets", "b", "el examen"),
+        ("duplicate_across_sets", "b", "clima"),
+        ("conflicting_translation", "b", "clima"),
+    ]
+    assert format_issue(issues[2]) == (
+        "Vocab set 'b', entry 2: 'clima' translated as 'Wetter', differs from set 'a' entry 2"
+    )
+    assert not [i for i in iter_vocabulary_issues(vocab_sets, cross_set=False) if i.code != "too_few_entries"]
+
+
+def test_report_is_streamed_json_with_summary():
+    vocab_sets = {"a": [_entry("casa", "Haus"), _entry("casa", "")]}
+    out = io.StringIO()
+
+    counts = write_report(iter_vocabulary_issues(vocab_sets), out)
+    report = json.loads(out.getvalue())
+
+    assert counts == {"too_few_entries": 1, "empty_value": 1, "duplicate_in_set": 1}
+    assert report["summary"]["total"] == 3
+    assert report["summary"]["by_severity"] == {"warning": 2, "error": 1}
+    assert report["issues"][1] == {
+        "severity": "error",
+        "code": "empty_value",
+        "file": "vocabulary",
+        "location": {"set": "a", "entry": 2},
+        "detail": {"key": "german"},
+    }
+
+
+def test_main_exits_non_zero_on_errors(tmp_path):
+    clean = tmp_path / "clean.json"
+    clean.write_text(json.dumps({"vocab_sets": {"a": [_entry(str(n), str(n)) for n in range(10)]}}), encoding="utf-8")
+    broken = tmp_path / "broken.json"
+    broken.write_text(json.dumps({"vocab_sets": {"a": [_entry("casa", "")]}}), encoding="utf-8")
+
+    assert main(["--conjugations", "", "--por-para", "", "--vocabulary", str(clean)]) == 0
+    assert main(["--conjugations", "", "--por-para", "", "--vocabulary", str(broken), "--report", "-"]) == 1
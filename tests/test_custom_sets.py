@@ -0,0 +1,92 @@
+import gc
+
+import pytest
+
+from utils.custom_sets import CustomSet, CustomSetStore, CustomSetView, resolve_custom_set
+from utils.records import VocabEntry
+from utils.vocab_search import VocabSearchIndex
+
+_SETS = {
+    "dele": (
+        VocabEntry("aprobar (un examen)", "eine Prüfung bestehen", "to pass (an exam)"),
+        VocabEntry("examen", "Prüfung", "exam"),
+        VocabEntry("opinión", "Meinung", "opinion"),
+    ),
+    "por_para": (VocabEntry("examen", "Prüfung", "exam"), VocabEntry("libertad", "Freiheit", "freedom")),
+}
+
+
+def test_definition_validation():
+    custom_set = CustomSet.from_json({"name": "Examen (DELE)", "query": "examen", "sets": ["dele"]})
+    assert custom_set.key == "custom:examen_dele"
+
+    with pytest.raises(ValueError, match="ids or a query"):
+        CustomSet.from_json({"name": "Empty"})
+    with pytest.raises(ValueError, match="set_key:position"):
+        CustomSet.from_json({"name": "Bad", "ids": ["dele"]})
+
+
+def test_views_reference_shared_entries():
+    search = VocabSearchIndex({"vocab_sets": _SETS}, {})
+    custom_set = CustomSet.from_json({"name": "Mixed", "ids": ["dele:2", "dele:9", "por_para:1"], "query": "exa",
+                                      "sets": ["dele"]})
+
+    view = resolve_custom_set(custom_set, _SETS, search)
+
+    assert isinstance(view, CustomSetView)
+    assert view.refs == (("dele", 2), ("por_para", 1), ("dele", 0), ("dele", 1))
+    assert view[1] is _SETS["por_para"][1]
+    assert [e.spanish for e in view[2:]] == ["aprobar (un examen)", "examen"]
+
+
+def test_store_round_trip_and_cache(tmp_path):
+    class Snapshot:
+        vocabulary_data = {"vocab_sets": _SETS}
+        vocab_search = VocabSearchIndex(vocabulary_data, {})
+
+    store = CustomSetStore(str(tmp_path / "custom.json"))
+    snapshot = Snapshot()
+    assert store.views(snapshot) == {}
+
+    store.put(CustomSet.from_json({"name": "Freedom", "ids": ["por_para:1"]}))
+    views = store.views(snapshot)
+    assert list(views) == ["custom:freedom"]
+    assert store.views(snapshot) is views
+
+    assert store.delete("custom:freedom")
+    assert not store.delete("custom:freedom")
+    assert store.views(snapshot) == {}
+
+
+def test_views_of_replaced_snapshots_are_dropped(app, tmp_path):
+    content_store = app.extensions["content_store"]
+    store = CustomSetStore(str(tmp_path / "custom.json"))
+    store.put(CustomSet.from_json({"name": "Exam", "query": "examen"}))
+
+    for _ in range(5):
+        store.views(content_store.reload())
+    gc.collect()
+    current = store.views(content_store.get())
+
+    assert store.views(content_store.get()) is current
+    assert len(store._cache) == 1
+
+
+def test_custom_set_is_offered_and_quizzed(client):
+    res = client.post("/api/vocab/custom-sets", json={"name": "Exam words", "query": "examen"})
+    assert res.status_code == 201
+    assert res.get_json()["count"] >= 2
+
+    html = client.get("/quiz/vocab/options").get_data(as_text=True)
+    assert 'value="custom:exam_words"' in html
+
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["custom:exam_words"], "mode": "multiple_choice",
+                                           "num_questions": "4"})
+    with client.session_transaction() as sess:
+        questions = sess["vocab_questions"]
+    assert len(questions) == 4
+    assert all("examen" in q["question"].lower() and q["answer"] in q["choices"] for q in questions)
+
+    assert client.post("/api/vocab/custom-sets", json={"name": ""}).status_code == 400
+    assert client.delete("/api/vocab/custom-sets/custom:exam_words").status_code == 204
+    assert client.get("/api/vocab/custom-sets").get_json() == {"custom_sets": []}
@@ -0,0 +1,77 @@
+import io
+
+from utils.dialog_tex import DialogueTurn, VocabItem, parse_dialogue_tex
+
+DOC = r"""\documentclass{article}
+\begin{document}
+\title{\textbf{DIALOG: En el mercado}}
+\maketitle
+
+\textbf{Tema:} En el mercado \\
+\textbf{Nivel:} A2
+
+\section*{Diálogo}
+
+\textbf{Ana:} ¡Hola! ¿Cuánto
+cuesta el \textit{queso}?
+
+\textbf{Luis:} Cinco euros.
+% \textbf{Luis:} commented out
+
+\section*{Vocabulario}
+\begin{itemize}
+    \item \textbf{el queso} - Käse
+    % \item \textbf{comentado} - nicht da
+    \item sin negrita - ignoriert
+    \item \textbf{costar {algo}} - etwas kosten,
+          (o-ue) \enquote{cuesta}
+\end{itemize}
+
+\section*{Preguntas}
+\begin{itemize}
+    \item \textbf{no} - keine Vokabel
+\end{itemize}
+\end{document}
+\textbf{Nach:} dem Ende
+"""
+
+
+def test_one_pass_extracts_metadata_turns_and_vocabulary():
+    doc = parse_dialogue_tex(DOC)
+
+    assert doc.title == "DIALOG: En el mercado"
+    assert doc.metadata == {"Tema": "En el mercado", "Nivel": "A2"}
+    assert doc.turns == (
+        DialogueTurn("Ana", "¡Hola! ¿Cuánto cuesta el queso?"),
+        DialogueTurn("Luis", "Cinco euros."),
+    )
+    assert doc.vocabulary == (
+        VocabItem("el queso", "Käse"),
+        VocabItem("costar {algo}", r"etwas kosten, (o-ue) \enquote{cuesta}"),
+    )
+
+
+def test_line_iterable_gives_same_result_as_string():
+    assert parse_dialogue_tex(io.StringIO(DOC)) == parse_dialogue_tex(DOC)
+
+
+def test_headings_and_environments_close_an_open_item():
+    doc = parse_dialogue_tex(r"""\section*{Vocabulario}
+\begin{itemize}
+    \item \textbf{el tiempo} - das Wetter
+\subsection*{Verbos}
+Texto suelto
+    \item \textbf{llover} - regnen
+\begin{multicols}{2}
+    \item \textbf{nevar} - schneien
+\subsubsection*{M{\'a}s}
+    \item \textbf{helar} - frieren
+\end{itemize}
+""")
+
+    assert doc.vocabulary == (
+        VocabItem("el tiempo", "das Wetter"),
+        VocabItem("llover", "regnen"),
+        VocabItem("nevar", "schneien"),
+        VocabItem("helar", "frieren"),
+    )
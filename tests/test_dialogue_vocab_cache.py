@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+
+import utils.dialog_vocab_generator as gen
+
+
+def _tex(*items: str) -> str:
+    body = "\n".join(f"    \\item \\textbf{{{es}}} - {de}" for es, de in (i.split("=") for i in items))
+    return "\\section*{Vocabulario}\n\\begin{itemize}\n" + body + "\n\\end{itemize}\n\\end{document}\n"
+
+
+def _setup(tmp_path):
+    dialogos = tmp_path / "dialogos"
+    dialogos.mkdir()
+    (dialogos / "01_uno.tex").write_text(_tex("casa=Haus", "perro=Hund"), encoding="utf-8")
+    (dialogos / "02_dos.tex").write_text(_tex("gato=Katze"), encoding="utf-8")
+    vocab = tmp_path / "vocabulary.json"
+    vocab.write_text(
+        json.dumps({"vocab_sets": {"basic": [{"spanish": "casa", "german": "Haus", "english": "house"}]}}),
+        encoding="utf-8",
+    )
+    return dialogos, vocab, tmp_path / "cache.json"
+
+
+def test_unchanged_run_skips_loading_and_extraction(tmp_path, monkeypatch):
+    dialogos, vocab, cache = _setup(tmp_path)
+
+    changes = gen.update_dialogue_vocab_sets(dialogos, vocab, cache_path=cache)
+    assert [c.set_key for c in changes] == ["dialog_01_uno", "dialog_02_dos"]
+    sets = json.loads(vocab.read_text(encoding="utf-8"))["vocab_sets"]
+    assert sets["dialog_01_uno"][0] == {"spanish": "casa", "german": "Haus", "english": "house"}
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("should not be called")
+
+    monkeypatch.setattr(gen, "generate_dialogue_vocab_sets", fail)
+    monkeypatch.setattr(gen, "extract_vocabulario_items", fail)
+    mtime = os.stat(vocab).st_mtime_ns
+    assert gen.update_dialogue_vocab_sets(dialogos, vocab, cache_path=cache) == []
+    assert os.stat(vocab).st_mtime_ns == mtime
+
+
+def test_only_edited_dialogue_is_re_extracted(tmp_path, monkeypatch):
+    dialogos, vocab, cache = _setup(tmp_path)
+    gen.update_dialogue_vocab_sets(dialogos, vocab, cache_path=cache)
+
+    (dialogos / "02_dos.tex").write_text(_tex("gato=Katze", "ratón=Maus"), encoding="utf-8")
+    extracted = []
+    real_extract = gen.extract_vocabulario_items
+    monkeypatch.setattr(gen, "extract_vocabulario_items", lambda tex: extracted.append(tex) or real_extract(tex))
+
+    changes = gen.update_dialogue_vocab_sets(dialogos, vocab, cache_path=cache)
+    assert [c.summary() for c in changes] == ["dialog_02_dos: +1 -0 ~0 (2 entries)"]
+    assert len(extracted) == 1
+    sets = json.loads(vocab.read_text(encoding="utf-8"))["vocab_sets"]
+    assert [e["spanish"] for e in sets["dialog_02_dos"]] == ["gato", "ratón"]
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    dialogos, vocab, _cache = _setup(tmp_path)
+    for n in range(3, 9):
+        (dialogos / f"{n:02d}_extra.tex").write_text(_tex(f"palabra{n}=Wort{n}", "casa=Haus"), encoding="utf-8")
+
+    serial = gen.generate_dialogue_vocab_sets(dialogos, vocab)
+    parallel = gen.generate_dialogue_vocab_sets(dialogos, vocab, jobs=3)
+
+    assert json.dumps(parallel, ensure_ascii=False) == json.dumps(serial, ensure_ascii=False)
@@ -0,0 +1,90 @@
+import random
+from collections.abc import Sequence
+
+from utils.distractors import CHOICES, DistractorColumn, DistractorIndex, word_class
+from utils.records import VocabEntry
+
+_SET = (
+    VocabEntry("comer", "essen", "to eat"),
+    VocabEntry("beber", "trinken", "to drink"),
+    VocabEntry("correr", "laufen", "to run"),
+    VocabEntry("comprar", "kaufen", "to buy"),
+    VocabEntry("la casa", "das Haus", "[TODO]"),
+    VocabEntry("¿Qué tal?", "Wie geht's?", "[TODO]"),
+    VocabEntry("compartir", "teilen", "to share"),
+)
+
+
+def test_word_class_is_field_aware():
+    assert word_class("to pass (an exam)", "english") == "verb"
+    assert word_class("aprobar (un examen)", "spanish") == "verb"
+    assert word_class("Prüfung", "german") == "noun"
+    assert word_class("¿Qué tal?", "spanish") == "phrase"
+
+
+def test_neighbors_prefer_similar_values_and_skip_placeholders():
+    column = DistractorColumn([e.spanish for e in _SET], "spanish")
+
+    nearest = [column.values[j] for j in column.neighbors[0][:3]]
+    assert {"correr", "comprar"} <= set(nearest)
+    assert "¿Qué tal?" not in nearest
+
+    english = DistractorColumn([e.english for e in _SET], "english")
+    assert english.neighbors[4] == ()
+    assert all(english.values[j] != "[TODO]" for j in english.neighbors[0])
+
+
+def test_choices_contain_answer_once():
+    index = DistractorIndex({"vocab_sets": {"food": _SET}})
+
+    choices = index.choices("food", _SET, 0, "german", random.Random(2))
+
+    assert len(choices) == CHOICES
+    assert choices.count("essen") == 1
+    assert len(set(choices)) == CHOICES
+
+
+def test_reload_reuses_unchanged_columns():
+    previous = DistractorIndex({"vocab_sets": {"food": _SET, "other": _SET[:3]}})
+    changed = (*_SET[:3], VocabEntry("vivir", "leben", "to live"))
+
+    index = DistractorIndex({"vocab_sets": {"food": _SET, "other": changed}}, previous)
+
+    assert index.column("food", _SET, "spanish") is previous.column("food", _SET, "spanish")
+    assert index.column("other", changed, "spanish") is not previous.column("other", _SET[:3], "spanish")
+
+
+def test_multiple_choice_start_adds_choices(client):
+    res = client.post(
+        "/quiz/vocab/start",
+        data={"vocab_sets": ["dele_b1_info"], "direction": "spanish_to_german", "mode": "multiple_choice",
+              "num_questions": "3"},
+    )
+    assert res.status_code == 302
+
+    with client.session_transaction() as sess:
+        questions = sess["vocab_questions"]
+        assert sess["vocab_saved_mode"] == "multiple_choice"
+    assert all(q["answer"] in q["choices"] and len(q["choices"]) == CHOICES for q in questions)
+
+    html = client.get("/quiz/vocab/run").get_data(as_text=True)
+    assert "choice-button" in html
+
+
+def test_lazy_sets_are_indexed_on_first_use():
+    class Rows(Sequence):
+        reads = 0
+
+        def __len__(self):
+            return len(_SET)
+
+        def __getitem__(self, index):
+            Rows.reads += 1
+            return _SET[index]
+
+    rows = Rows()
+    index = DistractorIndex({"vocab_sets": {"food": rows, "memory": _SET}})
+
+    assert len(index) == 3 and Rows.reads == 0
+    assert index.column("food", rows, "german").values == tuple(e.german for e in _SET)
+    assert len(index) == 4
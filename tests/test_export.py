@@ -0,0 +1,61 @@
+import csv
+import io
+
+from utils import export
+from utils.export import Card, quiz_cards, stream_anki, stream_csv, stream_html
+
+
+def test_writers_yield_chunks(monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_CARDS", 2)
+    cards = [Card(f"front {n}", f"back, {n}") for n in range(5)]
+
+    chunks = list(stream_csv(iter(cards)))
+
+    assert len(chunks) == 3
+    assert list(csv.reader(io.StringIO("".join(chunks))))[:2] == [["front", "back"], ["front 0", "back, 0"]]
+
+
+def test_anki_and_html_escape_their_fields():
+    cards = [Card("a\tb", "line\nbreak"), Card("<b>x</b>", "y & z")]
+
+    assert "".join(stream_anki(cards)) == "#separator:tab\n#html:false\na b\tline break\n<b>x</b>\ty & z\n"
+    html = "".join(stream_html(cards, "Sheet"))
+    assert "<title>Sheet</title>" in html
+    assert "&lt;b&gt;x&lt;/b&gt;" in html and "y &amp; z" in html
+
+
+def test_quiz_cards_cover_every_quiz_type():
+    questions = [
+        {"sentence": "Lo hice _____ ti.", "answer": "por", "category": "motivation_reason"},
+        {"verb": "ser", "tense": "presente", "person": "yo", "answer": "soy"},
+        {"verb": "ser", "tense": "presente", "person": "yo", "answer": "soy", "mode": "identify",
+         "analyses": ["ser · presente · yo"]},
+        {"question": "casa", "answer": "Haus", "direction": "spanish_to_german"},
+    ]
+
+    assert list(quiz_cards(questions)) == [
+        Card("Lo hice _____ ti.", "por"),
+        Card("yo + ser (presente)", "soy"),
+        Card("soy", "ser · presente · yo"),
+        Card("casa", "Haus"),
+    ]
+
+
+def test_export_routes_use_the_options_selection(client):
+    res = client.post("/export/conjugations", data={"verbs": ["ser", "unknown"], "tenses": ["presente"],
+                                                    "format": "csv"})
+    assert res.headers["Content-Disposition"] == 'attachment; filename="conjugations.csv"'
+    rows = list(csv.reader(io.StringIO(res.get_data(as_text=True))))
+    assert rows[1] == ["yo + ser (presente)", "soy"]
+    assert len(rows) == 7
+
+    res = client.get("/export/vocab?vocab_sets=dele_b1_info&direction=german_to_spanish&format=anki")
+    lines = res.get_data(as_text=True).splitlines()
+    assert res.mimetype == "text/tab-separated-values"
+    assert "bescheinigen, nachweisen\tacreditar" in lines
+
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["dele_b1_info"], "num_questions": "3"})
+    res = client.get("/export/quiz/vocab?format=html")
+    assert res.mimetype == "text/html"
+    assert res.get_data(as_text=True).count('class="card"') == 3
+    assert client.get("/export/quiz/unknown").status_code == 404
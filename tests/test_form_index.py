@@ -0,0 +1,84 @@
+from utils.conjugation_engine import ConjugationTable, VerbSpec
+from utils.form_index import FormAnalysis, FormIndex, fold_accents
+
+
+def _index():
+    table = ConjugationTable.from_json({
+        "verbs": {
+            "ser": {"overrides": {"pretérito_indefinido": {
+                "yo": "fui", "tu": "fuiste", "el/ella/usted": "fue",
+                "nosotros": "fuimos", "vosotros": "fuisteis", "ellos/ellas/ustedes": "fueron",
+            }}},
+            "ir": {"overrides": {"pretérito_indefinido": {
+                "yo": "fui", "tu": "fuiste", "el/ella/usted": "fue",
+                "nosotros": "fuimos", "vosotros": "fuisteis", "ellos/ellas/ustedes": "fueron",
+            }}},
+            "estar": {"overrides": {"presente": {"el/ella/usted": "está"}}},
+        }
+    })
+    return FormIndex(table)
+
+
+def test_ambiguous_form_lists_every_analysis():
+    index = _index()
+
+    assert index.analyses("fue") == (
+        FormAnalysis("ser", "pretérito_indefinido", "el/ella/usted"),
+        FormAnalysis("ir", "pretérito_indefinido", "el/ella/usted"),
+    )
+    assert index.verbs("Fueron") == ("ser", "ir")
+    assert index.analyses("fue")[0].label() == "ser · pretérito indefinido · el/ella/usted"
+
+
+def test_accent_folded_lookup_is_a_fallback():
+    index = _index()
+
+    assert index.exact("esta") == ()
+    assert index.analyses("esta") == (
+        FormAnalysis("estar", "presente", "el/ella/usted"),
+        FormAnalysis("estar", "imperativo_afirmativo", "tu"),
+    )
+    assert fold_accents(" Año ") == "año"
+
+
+def test_scan_prefers_compound_forms():
+    haber = VerbSpec.from_json("haber", {"overrides": {"presente": {"yo": "he"}}})
+    index = FormIndex(ConjugationTable({"comer": VerbSpec("comer"), "haber": haber}))
+
+    found = index.scan("Siempre he comido bien. ¡No comas así! Que coma, he dicho.")
+
+    assert found["he comido"] == 1
+    assert found["no comas"] == 1
+    assert found["coma"] == 1
+    assert found["he"] == 1
+
+
+def test_index_is_built_on_first_lookup(app):
+    snapshot = app.extensions["content_store"].get()
+
+    assert not snapshot.form_index.built
+    assert snapshot.form_index.verbs("fui") == ("ser", "ir")
+    assert snapshot.form_index.built
+
+
+def test_identify_mode_shows_all_analyses(client, monkeypatch):
+    # First verb, tense and person: ser, pretérito indefinido, yo -> "fui"
+    monkeypatch.setattr("random.choice", lambda seq: seq[0])
+    res = client.post(
+        "/quiz/conjugations/start",
+        data={"verbs": ["ser"], "tenses": ["pretérito_indefinido"], "mode": "identify", "num_questions": "1"},
+    )
+    assert res.status_code == 302
+
+    with client.session_transaction() as sess:
+        question = sess["questions"][0]
+    assert question["mode"] == "identify" and question["answer"] == "fui"
+    # Readings of verbs that were not selected are listed too
+    assert question["analyses"] == [
+        "ser · pretérito indefinido · yo",
+        "ir · pretérito indefinido · yo",
+    ]
+
+    html = client.get("/quiz/conjugations/run").get_data(as_text=True)
+    assert "Infinitive, tense and person?" in html
+    assert "ir · pretérito indefinido · yo" in html
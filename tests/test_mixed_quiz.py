@@ -0,0 +1,50 @@
+import json
+from collections import Counter
+
+
+def _start(client, **form):
+    data = {"conjugations_share": "50", "porpara_share": "25", "vocab_share": "25", "num_questions": "12",
+            "seconds_per_question": "5", "seconds_per_answer": "3"}
+    data.update(form)
+    return client.post("/quiz/mixed/start", data=data)
+
+
+def test_mixed_quiz_draws_each_type_in_proportion(client):
+    res = _start(client)
+    assert res.status_code == 302 and res.location.endswith("/quiz/mixed/run")
+
+    with client.session_transaction() as sess:
+        questions = sess["mixed_questions"]
+    assert Counter(question["type"] for question in questions) == {"conjugations": 6, "porpara": 3, "vocab": 3}
+
+    html = client.get("/quiz/mixed/run").get_data(as_text=True)
+    assert html.count('<template class="quiz-card"') == 12
+    assert html.count('class="sentence-text"') == 3 and html.count('class="vocab-word"') == 3
+
+
+def test_mixed_quiz_uses_each_types_saved_selection(client):
+    client.post("/quiz/conjugations/save-settings", data={"verbs": ["ser"], "tenses": ["presente"]})
+    client.post("/quiz/porpara/save-settings", data={"por_categories": ["duration"], "por_share": "100"})
+
+    _start(client, conjugations_share="50", porpara_share="50", vocab_share="0", typed_answers="on")
+
+    with client.session_transaction() as sess:
+        questions = sess["mixed_questions"]
+    assert {q["verb"] for q in questions if q["type"] == "conjugations"} == {"ser"}
+    assert {q["category"] for q in questions if q["type"] == "porpara"} == {"duration"}
+    html = client.get("/quiz/mixed/run").get_data(as_text=True)
+    assert html.count('id="typed-answer"') == 6
+
+
+def test_one_quiz_state_advances_to_completion(client, app):
+    _start(client, num_questions="2", contestants=["Ana", "Luis"])
+
+    assert client.post("/quiz/mixed/check", json={"typed": "x"}).status_code == 200
+    assert client.post("/quiz/mixed/next").get_json() == {"complete": False}
+    assert client.post("/quiz/mixed/next").get_json() == {"complete": True}
+    assert client.get("/quiz/mixed/run").status_code == 302
+
+    with open(app.config["SETTINGS_FILE_PATH"], "r", encoding="utf-8") as f:
+        mixed = json.load(f)["mixed"]
+    assert mixed["conjugations_share"] == 50 and mixed["contestants"] == ["Ana", "Luis"]
+    assert 'value="Ana"' in client.get("/quiz/mixed/options").get_data(as_text=True)
@@ -0,0 +1,35 @@
+import re
+
+from utils.view_models import build_option_view_models
+
+
+def test_view_models_are_sorted_and_counted():
+    views = build_option_view_models(
+        {"conjugations_quiz": {"ser": {"presente": {}, "imperfecto": {}}, "estar": {"presente": {}}}},
+        {"por": {"duration": ["_____"]}, "para": {"goal": ["_____"], "custom_thing": ["_____"]}},
+        {"vocab_sets": {"b_set": [{}, {}], "a_set": [{}]}},
+        vocab_set_names={"a_set": "Set A"},
+        por_category_names={"duration": "Duration"},
+        para_category_names={},
+    )
+
+    assert views.conjugations.verbs == ("estar", "ser")
+    assert views.conjugations.tenses == ("imperfecto", "presente")
+    assert "ser" in views.conjugations.verb_set
+
+    assert dict(views.porpara.para_categories) == {"goal": "Goal", "custom_thing": "Custom Thing"}
+    assert views.porpara.por_keys == ("duration",)
+
+    assert views.vocab.vocab_sets == (("a_set", "Set A", 1), ("b_set", "B Set", 2))
+    assert views.vocab.set_key_set == frozenset({"a_set", "b_set"})
+
+
+def test_options_pages_check_all_items_by_default(client):
+    html = client.get("/quiz/conjugations/options").get_data(as_text=True)
+    assert re.search(r'<input[^>]*name="verbs"[^>]*value="ser"[^>]*checked', html) is not None
+
+    html = client.get("/quiz/porpara/options").get_data(as_text=True)
+    assert re.search(r'<input[^>]*name="para_categories"[^>]*value="goal"[^>]*checked', html) is not None
+
+    html = client.get("/quiz/vocab/options").get_data(as_text=True)
+    assert re.search(r'<input[^>]*name="vocab_sets"[^>]*value="dele_b1_info"[^>]*checked', html) is not None
@@ -0,0 +1,26 @@
+import gc
+import sys
+
+from utils.prefork import freeze_content
+
+
+def test_freeze_content_converts_lists_and_interns_strings():
+    spanish = "".join(["ca", "sa"])
+    raw = {"vocab_sets": {"a": [{"spanish": spanish, "german": "Haus"}]}, "por": {"x": ["s1", "s2"]}}
+    frozen = freeze_content(raw)
+
+    assert isinstance(frozen["vocab_sets"]["a"], tuple)
+    assert frozen["vocab_sets"]["a"][0] == {"spanish": "casa", "german": "Haus"}
+    assert frozen["por"]["x"] == ("s1", "s2")
+    assert spanish is not sys.intern("casa")
+    assert frozen["vocab_sets"]["a"][0]["spanish"] is sys.intern("casa")
+    # Tuples of strings are not tracked by the cyclic GC after freezing
+    gc.collect()
+    assert not gc.is_tracked(frozen["por"]["x"])
+
+
+def test_snapshot_content_is_frozen(app):
+    with app.app_context():
+        snapshot = app.extensions["content_store"].get()
+    sets = snapshot.vocabulary_data["vocab_sets"]
+    assert all(isinstance(entries, tuple) for entries in sets.values())
@@ -0,0 +1,22 @@
+from utils.records import PorParaIndex, StringPool, VocabEntry, compact_vocabulary_data
+
+
+def test_compact_vocabulary_uses_shared_strings():
+    data = {"vocab_sets": {"a": [{"spanish": "casa", "german": "Haus", "english": "[TODO]"}],
+                           "b": [{"spanish": "perro", "german": "Hund", "english": "".join(["[TO", "DO]"])}]}}
+    compact = compact_vocabulary_data(data, StringPool())
+
+    a, b = compact["vocab_sets"]["a"][0], compact["vocab_sets"]["b"][0]
+    assert a == VocabEntry("casa", "Haus", "[TODO]")
+    # Built at runtime, so only the pool can make the two values one object
+    assert data["vocab_sets"]["a"][0]["english"] is not data["vocab_sets"]["b"][0]["english"]
+    assert a.english is b.english
+
+
+def test_por_para_index_uses_small_int_categories():
+    index = PorParaIndex({"por": {"duration": ("Estudié _____ tres horas",)}, "para": {"goal": ("A _____ B",)}})
+
+    para_id = index.category_id("para", "goal")
+    assert para_id == 1
+    assert index.category_id("por", "goal") is None
+    assert index.question(para_id, 0) == {"sentence": "A _____ B", "answer": "para", "category": "goal"}
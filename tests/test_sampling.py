@@ -0,0 +1,57 @@
+import random
+from collections import Counter
+
+from utils.sampling import allocate, interleave, stratified_positions
+
+
+def test_allocate_uses_largest_remainder():
+    assert allocate(10, (50, 50)) == [5, 5]
+    assert allocate(10, (70, 30)) == [7, 3]
+    assert sorted(allocate(5, (50, 50))) == [2, 3]
+    assert allocate(3, (0, 0)) == [0, 0]
+
+
+def test_stratified_draw_balances_answers_and_covers_categories():
+    # ids 0-2 are por categories, 3-4 para categories
+    lengths = (40, 30, 2, 25, 10)
+    drawn = stratified_positions([[0, 1, 2], [3, 4]], lengths, 10, (50, 50), random.Random(3))
+
+    per_category = Counter(category for category, _ in drawn)
+    assert sum(per_category[i] for i in (0, 1, 2)) == 5
+    assert sum(per_category[i] for i in (3, 4)) == 5
+    assert set(per_category) == {0, 1, 2, 3, 4}
+    assert len(set(drawn)) == 10
+    assert all(0 <= position < lengths[category] for category, position in drawn)
+
+
+def test_empty_stratum_gives_its_share_to_the_other():
+    drawn = stratified_positions([[0], []], (5, 8), 4, (0, 100), random.Random(1))
+
+    assert len(drawn) == 4
+    assert {category for category, _ in drawn} == {0}
+
+
+def test_start_route_honours_por_share(client):
+    res = client.post(
+        "/quiz/porpara/start",
+        data={
+            "por_categories": ["duration", "cost_price"],
+            "para_categories": ["goal"],
+            "por_share": "80",
+            "num_questions": "10",
+        },
+    )
+    assert res.status_code == 302
+
+    with client.session_transaction() as sess:
+        answers = Counter(q["answer"] for q in sess["porpara_questions"])
+        assert sess["porpara_saved_por_share"] == 80
+    assert answers == {"por": 8, "para": 2}
+
+
+def test_interleave_spreads_each_sequence():
+    merged = interleave([["c"] * 4, ["p"] * 2, ["v"] * 4], random.Random(2))
+
+    assert Counter(merged) == {"c": 4, "p": 2, "v": 4}
+    assert all(merged[i] != merged[i + 1] or merged[i] != merged[i + 2] for i in range(len(merged) - 2))
+    assert interleave([[], [1, 2]]) == [1, 2]
@@ -7,8 +7,8 @@ def _read_settings_file(path: str) -> dict:
         return json.load(f)
 
 
-def test_writes_file_on_conjugations_save_settings(client):
-    from app import app as flask_app
+def test_writes_file_on_conjugations_save_settings(client, app):
+    flask_app = app
 
     settings_path = flask_app.config["SETTINGS_FILE_PATH"]
 
@@ -37,8 +37,8 @@ def test_writes_file_on_conjugations_save_settings(client):
     assert conj["contestants"] == ["A", "B"]
 
 
-def test_restores_after_session_cleared_conjugations_options(client):
-    from app import app as flask_app
+def test_restores_after_session_cleared_conjugations_options(client, app):
+    flask_app = app
 
     settings_path = flask_app.config["SETTINGS_FILE_PATH"]
 
@@ -77,8 +77,8 @@ def test_restores_after_session_cleared_conjugations_options(client):
     assert persisted["conjugations"]["selected_verbs"] == ["traer"]
 
 
-def test_corrupt_file_is_ignored_and_quarantined(client, tmp_path):
-    from app import app as flask_app
+def test_corrupt_file_is_ignored_and_quarantined(client, app, tmp_path):
+    flask_app = app
 
     settings_path = flask_app.config["SETTINGS_FILE_PATH"]
 
@@ -0,0 +1,123 @@
+import pytest
+
+from utils.sqlite_content import RowRange, SqliteContent, import_content_to_sqlite, replace_vocab_set
+
+
+@pytest.fixture()
+def db_path(tmp_path):
+    from app import DEFAULT_CONFIG
+
+    path = str(tmp_path / "content.sqlite3")
+    import_content_to_sqlite(
+        DEFAULT_CONFIG["CONJUGATIONS_FILE"],
+        DEFAULT_CONFIG["POR_PARA_FILE"],
+        DEFAULT_CONFIG["VOCABULARY_FILE"],
+        path,
+    )
+    return path
+
+
+def test_sqlite_views_match_json_shapes(db_path):
+    content = SqliteContent(db_path)
+
+    quiz = content.conjugations_data["conjugations_quiz"]
+    assert "ser" in quiz
+    assert quiz["ser"]["presente"]["yo"] == "soy"
+    assert list(quiz["ser"]["presente"])[0] == "yo"
+
+    por = content.por_para_data["por"]
+    assert por["duration"][0] == "Estudié _____ tres horas"
+    assert len(por["duration"]) == len(list(por["duration"]))
+
+    sets = content.vocabulary_data["vocab_sets"]
+    assert len(sets["dele_b1_info"]) == 121
+    assert sets["dele_b1_info"][-1].spanish
+
+
+def test_replace_vocab_set_rewrites_only_that_set(db_path):
+    replace_vocab_set(db_path, "por_para", [{"spanish": "por", "german": "für", "english": "for"}])
+    replace_vocab_set(db_path, "brand_new", [{"spanish": "nuevo", "german": "neu", "english": "new"}] * 3)
+
+    sets = SqliteContent(db_path).vocabulary_data["vocab_sets"]
+    assert [e.spanish for e in sets["por_para"]] == ["por"]
+    assert len(sets["brand_new"]) == 3
+    assert len(sets["dele_b1_info"]) == 121
+
+
+def test_quizzes_run_from_sqlite(db_path, tmp_path):
+    from app import create_app
+
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "x",
+        "SETTINGS_FILE_PATH": str(tmp_path / "s.json"),
+        "CONTENT_DB_FILE": db_path,
+    })
+    client = app.test_client()
+    assert "traer" in client.get("/quiz/conjugations/options").get_data(as_text=True)
+
+    client.post("/quiz/conjugations/start", data={"verbs": ["ser"], "tenses": ["presente"], "num_questions": "4"})
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["dele_b1_info"], "num_questions": "4"})
+    client.post("/quiz/porpara/start", data={"por_categories": ["duration"], "num_questions": "4"})
+    with client.session_transaction() as sess:
+        assert len(sess["questions"]) == 4
+        assert len(sess["vocab_questions"]) == 4
+        assert all(q["answer"] == "por" for q in sess["porpara_questions"])
+
+
+
+def test_snapshot_reads_vocab_rows_on_first_use(db_path, monkeypatch):
+    from app import PARA_CATEGORY_NAMES, POR_CATEGORY_NAMES, VOCAB_SET_NAMES
+    from utils.content import ContentPaths, build_content_snapshot
+
+    reads = []
+    iterate, getitem = RowRange.__iter__, RowRange.__getitem__
+    monkeypatch.setattr(RowRange, "__iter__", lambda self: reads.append("iter") or iterate(self))
+    monkeypatch.setattr(RowRange, "__getitem__", lambda self, i: reads.append("get") or getitem(self, i))
+
+    snapshot = build_content_snapshot(
+        ContentPaths("", "", "", content_db=db_path),
+        vocab_set_names=VOCAB_SET_NAMES,
+        por_category_names=POR_CATEGORY_NAMES,
+        para_category_names=PARA_CATEGORY_NAMES,
+    )
+
+    sets = snapshot.vocabulary_data["vocab_sets"]
+    assert not isinstance(sets, dict)
+    with pytest.raises(TypeError):
+        sets["x"] = ()
+    assert reads == [] and len(snapshot.distractors) == 0
+
+    entries = sets["dele_b1_info"]
+    assert snapshot.distractors.column("dele_b1_info", entries, "german").values[0] == entries[0].german
+    assert len(snapshot.distractors) == 1
+    reads.clear()
+    assert snapshot.vocab_search.search("examen")
+    assert "iter" in reads
+
+
+def test_running_app_survives_a_set_replacement(db_path, tmp_path):
+    from app import create_app
+
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "x",
+        "SETTINGS_FILE_PATH": str(tmp_path / "s.json"),
+        "CONTENT_DB_FILE": db_path,
+    })
+    store = app.extensions["content_store"]
+    old_entries = store.get().vocabulary_data["vocab_sets"]["por_para"]
+    last = old_entries[len(old_entries) - 1]
+
+    replace_vocab_set(db_path, "por_para", [{"spanish": "por", "german": "für", "english": "for"}] * 12)
+    # Snapshots opened before the write keep reading their rows
+    assert old_entries[len(old_entries) - 1] == last
+    client = app.test_client()
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["por_para"], "num_questions": "5"})
+    with client.session_transaction() as sess:
+        assert {q["question"] for q in sess["vocab_questions"]} == {"por"}
+
+    replace_vocab_set(db_path, "por_para", [{"spanish": "para", "german": "für", "english": "for"}] * 12)
+    with pytest.raises(IndexError):
+        old_entries[0]
+    assert store.get().vocabulary_data["vocab_sets"]["por_para"][0].spanish == "para"
@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+
+from utils.tenants import TenantOverlay, TenantStore, build_tenant_snapshot
+
+EXTRA = [
+    {"spanish": "la pizarra", "german": "die Tafel", "english": "the blackboard"},
+    {"spanish": "el recreo", "german": "die Pause", "english": "the break"},
+    {"spanish": "la tiza", "german": "die Kreide", "english": "the chalk"},
+    {"spanish": "el pupitre", "german": "das Pult", "english": "the desk"},
+]
+OVERLAY = {
+    "name": "Klasse 7b",
+    "vocab_sets": {"klasse_7b": EXTRA},
+    "vocab_set_names": {"klasse_7b": "Unser Klassenzimmer", "dele_b1_info": "DELE B1"},
+    "hidden_vocab_sets": ["por_para"],
+    "hidden_verbs": ["ser"],
+}
+
+
+@pytest.fixture()
+def base(app):
+    return app.extensions["content_store"].get()
+
+
+def test_layered_lookup_shares_the_base(base):
+    view = build_tenant_snapshot(base, TenantOverlay.from_json(OVERLAY, "7b"))
+    vocab_sets = view.vocabulary_data["vocab_sets"]
+    base_sets = base.vocabulary_data["vocab_sets"]
+
+    assert "klasse_7b" in vocab_sets and "por_para" not in vocab_sets
+    assert len(vocab_sets) == len(base_sets)
+    assert vocab_sets["dele_b1_info"] is base_sets["dele_b1_info"]
+    assert view.conjugations_data is base.conjugations_data and view.answer_keys is base.answer_keys
+    assert view.distractors.column("dele_b1_info", (), "german") is base.distractors.column("dele_b1_info", (), "german")
+    assert len(view.distractors) == 3
+
+    assert "ser" not in view.option_views.conjugations.verb_set
+    assert view.option_views.porpara is base.option_views.porpara
+    rows = {key: (name, count) for key, name, count in view.option_views.vocab.vocab_sets}
+    assert rows["klasse_7b"] == ("Unser Klassenzimmer", 4) and rows["dele_b1_info"][0] == "DELE B1"
+    assert "por_para" not in rows
+
+
+def test_layered_search(base):
+    view = build_tenant_snapshot(base, TenantOverlay.from_json(OVERLAY, "7b"))
+
+    assert [r.refs for r in view.vocab_search.search("pizarr")] == [(("klasse_7b", 0),)]
+    assert base.vocab_search.search("pizarr") == []
+    assert all(
+        set_key != "por_para" for result in view.vocab_search.search("por", 25) for set_key, _ in result.refs
+    )
+    assert view.vocab_search.refs("tiza") == (("klasse_7b", 2),)
+
+
+def test_overlay_replaces_a_base_set(base):
+    view = build_tenant_snapshot(base, TenantOverlay.from_json({"vocab_sets": {"dele_b1_info": EXTRA}}, "x"))
+
+    assert view.vocabulary_data["vocab_sets"]["dele_b1_info"][0].spanish == "la pizarra"
+    assert view.distractors.column("dele_b1_info", EXTRA, "german").values[0] == "die Tafel"
+    assert all(ref[0] != "dele_b1_info" for ref in view.vocab_search.refs("examen"))
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    {"name": ""},
+    {"hidden_verbs": "ser"},
+    {"vocab_sets": {"x": [{"spanish": "uno"}]}},
+])
+def test_invalid_overlays(data):
+    with pytest.raises(ValueError):
+        TenantOverlay.from_json(data, "7b")
+
+
+def test_store_caches_per_base_and_file_version(base, tmp_path):
+    path = tmp_path / "7b.json"
+    path.write_text(json.dumps(OVERLAY), encoding="utf-8")
+    store = TenantStore(str(tmp_path))
+
+    first = store.get(base, "7b")
+    assert store.get(base, "7b") is first
+    assert store.get(base, "unknown") is None and store.get(base, "../7b") is None
+    assert store.keys() == ["7b"]
+
+    path.write_text(json.dumps({**OVERLAY, "hidden_verbs": []}), encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    second = store.get(base, "7b")
+    assert second is not first and "ser" in second.option_views.conjugations.verb_set
+
+
+def test_class_routes(tmp_path):
+    from app import create_app
+
+    tenants = tmp_path / "classes"
+    tenants.mkdir()
+    (tenants / "7b.json").write_text(json.dumps(OVERLAY), encoding="utf-8")
+    (tenants / "broken.json").write_text("{", encoding="utf-8")
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "test",
+        "SETTINGS_FILE_PATH": str(tmp_path / "quiz_settings.json"),
+        "TENANTS_DIR": str(tenants),
+    })
+    client = app.test_client()
+
+    assert client.get("/class/unknown").status_code == 404
+    assert client.get("/class/broken").status_code == 409
+    assert client.get("/class/7b").status_code == 302
+    assert "Klasse 7b" in client.get("/").get_data(as_text=True)
+
+    page = client.get("/quiz/conjugations/options").get_data(as_text=True)
+    assert 'value="ser"' not in page and 'value="estar"' in page
+    assert "Unser Klassenzimmer" in client.get("/quiz/vocab/options").get_data(as_text=True)
+    assert client.get("/api/vocab/search?q=tiza").get_json()["results"][0]["sets"][0]["name"] == "Unser Klassenzimmer"
+
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["klasse_7b"], "num_questions": "4"})
+    with client.session_transaction() as sess:
+        assert {q["question"] for q in sess["vocab_questions"]} <= {e["spanish"] for e in EXTRA}
+
+    client.get("/class")
+    assert 'value="ser"' in client.get("/quiz/conjugations/options").get_data(as_text=True)
+
+
+def test_custom_sets_follow_the_class(tmp_path):
+    from app import create_app
+
+    tenants = tmp_path / "classes"
+    tenants.mkdir()
+    overlay = {"hidden_vocab_sets": ["por_para"], "vocab_sets": {"dele_b1_info": EXTRA[:1], "klasse_7b": EXTRA}}
+    (tenants / "7b.json").write_text(json.dumps(overlay), encoding="utf-8")
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "test",
+        "SETTINGS_FILE_PATH": str(tmp_path / "quiz_settings.json"),
+        "TENANTS_DIR": str(tenants),
+    })
+    client = app.test_client()
+    client.post("/api/vocab/custom-sets", json={"name": "Shared", "ids": ["dele_b1_info:100", "por_para:5"]})
+    client.post("/api/vocab/custom-sets", json={"name": "Chalk", "query": "tiza"})
+    assert {c["key"]: c["count"] for c in client.get("/api/vocab/custom-sets").get_json()["custom_sets"]} == {
+        "custom:chalk": 0, "custom:shared": 2,
+    }
+
+    client.get("/class/7b")
+    sets = {c["key"]: c["count"] for c in client.get("/api/vocab/custom-sets").get_json()["custom_sets"]}
+    assert sets == {"custom:chalk": 1}
+
+    form = {"vocab_sets": ["custom:chalk", "custom:shared"], "mode": "multiple_choice", "num_questions": "3"}
+    assert client.post("/quiz/vocab/start", data=form).status_code == 302
+    with client.session_transaction() as sess:
+        questions = sess["vocab_questions"]
+    assert len(questions) == 3
+    assert all(q["question"] == "la tiza" and "die Kreide" in q["choices"] for q in questions)
@@ -0,0 +1,101 @@
+import io
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from utils.content_validator import format_issue
+from utils.vocab_import import import_vocab_set, iter_rows
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def test_anki_export_with_directives_and_html():
+    lines = [
+        "#separator:tab\n",
+        "#html:true\n",
+        "#guid column:1\n",
+        "abc\tla <b>casa</b>\tdas&nbsp;Haus<br>das Heim\n",
+        "def\tel perro\tder Hund\n",
+    ]
+
+    rows = list(iter_rows(lines))
+
+    assert rows == [
+        (4, {"spanish": "la casa", "german": "das Haus das Heim"}),
+        (5, {"spanish": "el perro", "german": "der Hund"}),
+    ]
+
+
+def test_csv_header_names_columns():
+    rows = list(iter_rows(["Deutsch,Español\n", '"Haus, Heim",casa\n'], filename="deck.csv"))
+
+    assert rows == [(2, {"german": "Haus, Heim", "spanish": "casa"})]
+
+
+def test_import_dedupes_and_reports_rows(tmp_path):
+    vocabulary = tmp_path / "vocabulary.json"
+    vocabulary.write_text(json.dumps({"vocab_sets": {"dele": [
+        {"spanish": "examen", "german": "Prüfung", "english": "exam"},
+    ]}}), encoding="utf-8")
+    source = "spanish\tgerman\tenglish\n Examen.\tPrüfung\texam\ncasa\tHaus\t\nperro\t\t\ncasa\tHeim\thome\nsolo\n"
+
+    report = import_vocab_set(vocabulary, "new_words", io.StringIO(source))
+
+    assert (report.rows, report.imported, report.skipped, report.written) == (5, 1, 4, True)
+    assert [format_issue(issue) for issue in report.issues] == [
+        "Line 2: 'examen' already in set 'dele'",
+        "Line 4: empty 'german' value",
+        "Line 5: 'casa' repeats line 3",
+        "Line 6: expected Spanish and German columns, found 1",
+    ]
+    sets = json.loads(vocabulary.read_text(encoding="utf-8"))["vocab_sets"]
+    assert sets["new_words"] == [{"spanish": "casa", "german": "Haus", "english": "[TODO]"}]
+    assert sets["dele"][0]["spanish"] == "examen"
+
+    with pytest.raises(ValueError, match="already exists"):
+        import_vocab_set(vocabulary, "new_words", io.StringIO(source))
+
+
+def test_unreadable_row_is_reported_and_skipped(tmp_path):
+    vocabulary = tmp_path / "vocabulary.json"
+    vocabulary.write_text(json.dumps({"vocab_sets": {}}), encoding="utf-8")
+    source = "gato,Katze\nratón," + "M" * (200 * 1024) + "\nperro,Hund\n"
+
+    report = import_vocab_set(vocabulary, "animals", io.StringIO(source), fmt="csv")
+
+    assert (report.rows, report.imported, report.skipped) == (3, 2, 1)
+    assert [format_issue(issue) for issue in report.issues] == [
+        "Line 2: cannot read row (field larger than field limit (131072))",
+    ]
+    assert report.issues[0].severity == "error"
+
+
+def test_upload_endpoint_adds_set(tmp_path):
+    from app import create_app
+
+    vocabulary = tmp_path / "vocabulary.json"
+    shutil.copy(DATA_DIR / "vocabulary.json", vocabulary)
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "test",
+        "SETTINGS_FILE_PATH": str(tmp_path / "settings.json"),
+        "VOCABULARY_FILE": str(vocabulary),
+    })
+    client = app.test_client()
+    upload = (io.BytesIO("gato,Katze,cat\nratón,Maus,mouse\n".encode("utf-8")), "animals.csv")
+
+    res = client.post("/api/vocab/import", data={"file": upload, "set_key": "animals"},
+                      content_type="multipart/form-data")
+
+    assert res.status_code == 201
+    assert res.get_json()["imported"] == 2
+    assert 'value="animals"' in client.get("/quiz/vocab/options").get_data(as_text=True)
+
+    oversized = (io.BytesIO(("loro," + "P" * (200 * 1024) + "\n").encode("utf-8")), "birds.csv")
+    res = client.post("/api/vocab/import", data={"file": oversized, "set_key": "birds"},
+                      content_type="multipart/form-data")
+
+    assert res.status_code == 200
+    assert [issue["code"] for issue in res.get_json()["issues"]] == ["unreadable_row"]
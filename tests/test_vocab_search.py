@@ -0,0 +1,55 @@
+from utils.records import VocabEntry
+from utils.vocab_search import VocabSearchIndex, parse_entry_id
+
+_DATA = {
+    "vocab_sets": {
+        "dele": (
+            VocabEntry("aprobar (un examen)", "eine Prüfung bestehen", "to pass (an exam)"),
+            VocabEntry("examen", "Prüfung", "exam"),
+            VocabEntry("niño", "Kind", "[TODO]"),
+        ),
+        "extra": (VocabEntry("examen", "Prüfung", "exam"),),
+    }
+}
+
+
+def test_prefix_search_is_accent_insensitive_and_ranked():
+    index = VocabSearchIndex(_DATA, {"dele": "DELE B1"})
+
+    assert [r.spanish for r in index.search("EXAM")] == ["examen", "aprobar (un examen)"]
+    assert [r.spanish for r in index.search("prufu")] == ["examen", "aprobar (un examen)"]
+    assert [r.spanish for r in index.search("nin")] == ["niño"]
+    assert index.search("todo") == []
+    assert index.search("  ") == []
+
+
+def test_multi_word_query_intersects_complete_words():
+    index = VocabSearchIndex(_DATA, {})
+
+    assert [r.spanish for r in index.search("aprobar exa")] == ["aprobar (un examen)"]
+    assert index.search("kind exa") == []
+
+
+def test_duplicate_entries_are_one_result_with_every_set():
+    index = VocabSearchIndex(_DATA, {"dele": "DELE B1"})
+
+    result = index.search("examen", limit=1)[0]
+
+    assert result.as_json(index.set_names) == {
+        "spanish": "examen",
+        "german": "Prüfung",
+        "english": "exam",
+        "ids": ["dele:1", "extra:0"],
+        "sets": [{"key": "dele", "name": "DELE B1"}, {"key": "extra", "name": "extra"}],
+    }
+    assert parse_entry_id("dele:1") == ("dele", 1)
+    assert parse_entry_id("dele") is None
+
+
+def test_search_endpoint(client):
+    data = client.get("/api/vocab/search?q=exame").get_json()
+
+    assert data["query"] == "exame"
+    first = data["results"][0]
+    assert first["spanish"] == "examen"
+    assert first["sets"][0] == {"key": "dele_b1_info", "name": "DELE B1 — Info Page"}
@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from utils.vocab_shards import ShardedVocabulary, write_vocab_shards
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _vocab():
+    return {
+        "vocab_sets": {
+            f"set_{n}": [{"spanish": f"s{n}_{i}", "german": f"g{n}_{i}", "english": f"e{n}_{i}"} for i in range(20)]
+            for n in range(4)
+        }
+    }
+
+
+def test_index_only_until_a_set_is_used(tmp_path):
+    index = write_vocab_shards(_vocab(), str(tmp_path), display_names={"set_0": "Set Zero"})
+    assert [row["count"] for row in index["sets"]] == [20, 20, 20, 20]
+
+    shards = ShardedVocabulary(str(tmp_path))
+    assert list(shards) == ["set_0", "set_1", "set_2", "set_3"]
+    assert len(shards["set_2"]) == 20
+    assert shards.display_names["set_0"] == "Set Zero"
+    assert shards.loaded_keys == []
+
+    assert shards["set_2"][3].spanish == "s2_3"
+    assert shards.loaded_keys == ["set_2"]
+
+
+def test_lru_evicts_cold_shards_beyond_budget(tmp_path):
+    index = write_vocab_shards(_vocab(), str(tmp_path))
+    shard_bytes = index["sets"][0]["bytes"]
+
+    shards = ShardedVocabulary(str(tmp_path), budget_bytes=2 * shard_bytes)
+    shards["set_0"][0]
+    shards["set_1"][0]
+    shards["set_0"][1]  # set_0 becomes most recently used
+    shards["set_2"][0]
+    assert shards.loaded_keys == ["set_0", "set_2"]
+
+    # Evicted shards are transparently reloaded
+    assert shards["set_1"][19].german == "g1_19"
+
+
+def test_app_serves_vocab_from_shards(tmp_path):
+    from app import DEFAULT_CONFIG, create_app
+
+    shard_dir = tmp_path / "shards"
+    with open(DEFAULT_CONFIG["VOCABULARY_FILE"], encoding="utf-8") as f:
+        data = json.load(f)
+    write_vocab_shards(data, str(shard_dir), display_names={"dele_b1_info": "DELE From Index"})
+
+    app = create_app({
+        "TESTING": True,
+        "SECRET_KEY": "x",
+        "SETTINGS_FILE_PATH": str(tmp_path / "s.json"),
+        "VOCABULARY_SHARD_DIR": str(shard_dir),
+    })
+    client = app.test_client()
+    html = client.get("/quiz/vocab/options").get_data(as_text=True)
+    # app-level names win over the index display names
+    assert "DELE B1 — Info Page (121)" in html
+
+    shards = app.extensions["content_store"].get().vocabulary_data["vocab_sets"]
+    assert shards.loaded_keys == []
+    client.post("/quiz/vocab/start", data={"vocab_sets": ["por_para"], "num_questions": "3"})
+    assert shards.loaded_keys == ["por_para"]
+
+
+def test_cli_does_not_import_the_app():
+    code = "import sys, utils.vocab_shards; print('flask' in sys.modules or 'app' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+import os
+
+from utils.dialog_vocab_generator import SetChange, write_vocabulary_json
+
+ORIGINAL = """{
+  "vocab_sets": {
+    "basic": [
+      { "spanish": "casa", "german": "Haus", "english": "house" }
+    ],
+    "dialog_01_uno": [
+      {
+        "spanish": "perro",
+        "german": "Hund",
+        "english": "[TODO]"
+      }
+    ]
+  }
+}
+"""
+
+
+def _entry(spanish, german, english="[TODO]"):
+    return {"spanish": spanish, "german": german, "english": english}
+
+
+def test_unchanged_data_is_not_written(tmp_path):
+    path = tmp_path / "vocabulary.json"
+    path.write_text(ORIGINAL, encoding="utf-8")
+    mtime = os.stat(path).st_mtime_ns
+
+    assert write_vocabulary_json(path, json.loads(ORIGINAL)) == []
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_only_changed_sets_are_rewritten(tmp_path):
+    path = tmp_path / "vocabulary.json"
+    path.write_text(ORIGINAL, encoding="utf-8")
+    data = json.loads(ORIGINAL)
+    data["vocab_sets"]["dialog_01_uno"] = [_entry("perro", "Hund, Köter"), _entry("gato", "Katze")]
+    data["vocab_sets"]["dialog_02_dos"] = [_entry("ratón", "Maus")]
+
+    changes = write_vocabulary_json(path, data)
+
+    assert changes == [
+        SetChange("dialog_01_uno", "changed", added=1, modified=1, count=2),
+        SetChange("dialog_02_dos", "added", added=1, count=1),
+    ]
+    text = path.read_text(encoding="utf-8")
+    assert json.loads(text) == data
+    # The hand-formatted set keeps its layout; the others look like json.dump(indent=2)
+    assert '      { "spanish": "casa", "german": "Haus", "english": "house" }\n' in text
+    assert text.endswith('"english": "[TODO]"\n      }\n    ]\n  }\n}\n')
+    assert [p.name for p in tmp_path.iterdir()] == ["vocabulary.json"]
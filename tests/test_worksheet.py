@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+from utils import worksheet
+from utils.conjugation_engine import persons_for
+from utils.export import Card
+from utils.records import PorParaIndex
+from utils.worksheet import conjugation_batches, por_para_batches, stream_worksheet_csv, stream_worksheet_html
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "data"
+
+
+def test_batches_are_reproducible_from_the_seed(monkeypatch):
+    monkeypatch.setattr(worksheet, "BATCH_SIZE", 4)
+    slots = tuple(Card(f"q{n}", f"a{n}") for n in range(10))
+
+    first = list(conjugation_batches(slots, 10, seed=5))
+
+    assert [len(batch) for batch in first] == [4, 4, 2]
+    assert first == list(conjugation_batches(slots, 10, seed=5))
+    assert first != list(conjugation_batches(slots, 10, seed=6))
+    assert list(conjugation_batches((), 10, seed=5)) == []
+
+
+def test_por_para_batches_keep_the_por_share():
+    index = PorParaIndex(json.loads((DATA_DIR / "por_para.json").read_text(encoding="utf-8")))
+    strata = [[i for i, c in enumerate(index.categories) if c.answer == answer] for answer in ("por", "para")]
+
+    cards = [card for batch in por_para_batches(index, strata, 1000, (30, 70), seed=1) for card in batch]
+
+    assert len(cards) == 1000
+    assert sum(card.back == "por" for card in cards) == 300
+
+
+def test_answer_key_follows_the_questions():
+    slots = tuple(Card(f"q{n} <", f"a{n} &") for n in range(50))
+
+    def batches():
+        return conjugation_batches(slots, 20, seed=3)
+
+    html = "".join(stream_worksheet_html(batches, "Sheet", 20, 3))
+    questions, _, key = html.partition('class="answer-key"')
+    rows = list(csv.reader(io.StringIO("".join(stream_worksheet_csv(batches, "Sheet", 20, 3)))))
+
+    assert len(rows) == 21 and rows[20][0] == "20"
+    assert questions.count("<li>") == key.count("<li>") == 20
+    assert [row[1].replace("<", "&lt;") for row in rows[1:]] == [
+        line[4:line.index(" ________")] for line in questions.splitlines() if line.startswith("<li>")
+    ]
+    assert [row[2].replace("&", "&amp;") for row in rows[1:]] == [
+        line[4:-5] for line in key.splitlines() if line.startswith("<li>")
+    ]
+
+
+def test_persons_follow_the_quiz_rule():
+    assert "yo" not in persons_for("imperativo_negativo")
+    assert persons_for("presente")[0] == "yo"
+
+
+def test_worksheet_route(client):
+    form = {"verbs": ["ser"], "tenses": ["presente"], "count": "250", "seed": "42", "format": "csv"}
+    res = client.post("/worksheet/conjugations", data=form)
+    assert res.headers["Content-Disposition"] == 'attachment; filename="conjugations_worksheet_42.csv"'
+    rows = list(csv.reader(io.StringIO(res.get_data(as_text=True))))
+    assert len(rows) == 251
+    assert rows == list(csv.reader(io.StringIO(client.post("/worksheet/conjugations", data=form).get_data(as_text=True))))
+
+    res = client.get("/worksheet/porpara?por_categories=duration&num_questions=12")
+    html = res.get_data(as_text=True)
+    assert res.mimetype == "text/html"
+    assert html.count("<li>") == 24 and "<li>para</li>" not in html
+
+    assert client.get("/worksheet/porpara?seed=x").status_code == 400
+    assert client.get("/worksheet/porpara?por_categories=unknown").status_code == 400
+    assert client.post("/worksheet/conjugations", data={"verbs": ["ser"], "tenses": ["unknown"]}).status_code == 400
+    assert client.get("/worksheet/unknown").status_code == 404
@@ -0,0 +1,185 @@
+"""
+Typed-answer grading against precompiled acceptance sets.
+
+Each answer is compiled once into an AnswerKey: the normalized spellings
+that count as correct (comma/semicolon/slash alternatives, with and without
+parentheticals and a leading article or 'to'), exact and accent-folded.
+Grading a typed string is then a set lookup, with a length-bounded edit
+distance as the only fallback, so it is cheap enough to run on every
+keystroke. The entries of in-memory vocab sets are compiled with the content
+snapshot; conjugated forms and lazily loaded sets on first use.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from utils.dialog_vocab_generator import normalize_spanish_term
+from utils.form_index import fold_accents
+
+# Grades, best first
+CORRECT = "correct"
+ACCENT = "accent"  # right apart from accents/diaeresis
+TYPO = "typo"  # within the edit-distance budget
+WRONG = "wrong"
+UNGRADED = "ungraded"  # placeholder answers such as '[TODO]'
+
+# Keys compiled after the snapshot was built, kept least recently used first
+MAX_RECENT_KEYS = 4096
+
+_ALTERNATIVES_RE = re.compile(r"[,;/]")
+_PARENTHETICAL_RE = re.compile(r"\([^()]*\)")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Leading words a learner may leave out: articles and the English 'to'
+OPTIONAL_LEADING_WORDS = frozenset({
+    "el", "la", "los", "las", "un", "una",
+    "der", "die", "das", "ein", "eine",
+    "to", "the", "a", "an",
+})
+
+
+def normalize_answer(text: str) -> str:
+    """normalize_spanish_term plus inner punctuation removed ('¿Qué tal?' -> 'qué tal')."""
+    t = normalize_spanish_term(_PUNCTUATION_RE.sub(" ", text))
+    return _WHITESPACE_RE.sub(" ", t).strip()
+
+
+def max_typos(length: int) -> int:
+    """Edit budget for an answer of `length` characters."""
+    if length < 4:
+        return 0
+    return 1 if length < 8 else 2
+
+
+def edit_distance_within(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance(a, b) <= limit, stopping as soon as every path exceeds it."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if limit == 0:
+        return a == b
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+def _variants(answer: str) -> set[str]:
+    variants: set[str] = set()
+    for part in [answer, *_ALTERNATIVES_RE.split(answer)]:
+        for text in (part, _PARENTHETICAL_RE.sub(" ", part), part.replace("(", " ").replace(")", " ")):
+            normalized = normalize_answer(text)
+            if not normalized:
+                continue
+            variants.add(normalized)
+            first, _, rest = normalized.partition(" ")
+            if rest and first in OPTIONAL_LEADING_WORDS:
+                variants.add(rest)
+    return variants
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    exact: frozenset[str]
+    folded: frozenset[str]
+
+    def grade(self, typed: str) -> str:
+        if not self.exact:
+            return UNGRADED
+        normalized = normalize_answer(typed)
+        if normalized in self.exact:
+            return CORRECT
+        folded = fold_accents(normalized)
+        if folded in self.folded:
+            return ACCENT
+        budget = max_typos(len(folded))
+        if budget and any(edit_distance_within(folded, accepted, budget) for accepted in self.folded):
+            return TYPO
+        return WRONG
+
+
+_EMPTY_KEY = AnswerKey(frozenset(), frozenset())
+
+
+def compile_answer(answer: str) -> AnswerKey:
+    if not answer or answer.lstrip().startswith("["):
+        return _EMPTY_KEY
+    exact = _variants(answer)
+    return AnswerKey(frozenset(exact), frozenset(fold_accents(v) for v in exact))
+
+
+class AnswerKeys:
+    """
+    answer string -> AnswerKey, compiled up front for the given answers.
+
+    Equal answer strings share one key. Answers not seen at build time
+    (conjugated forms, sets of a lazily loaded vocabulary backend) are
+    compiled on first use and kept in an LRU of `max_recent` keys, so a
+    long-running process does not end up holding a key for every answer
+    ever graded.
+    """
+
+    __slots__ = ("_keys", "_recent", "_max_recent", "_lock")
+
+    def __init__(self, answers: Iterable[str] = (), *, max_recent: int = MAX_RECENT_KEYS) -> None:
+        self._keys: dict[str, AnswerKey] = {}
+        for answer in answers:
+            if answer not in self._keys:
+                self._keys[answer] = compile_answer(answer)
+        self._recent: "OrderedDict[str, AnswerKey]" = OrderedDict()
+        self._max_recent = max_recent
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._recent)
+
+    def key(self, answer: str) -> AnswerKey:
+        key = self._keys.get(answer)
+        if key is not None:
+            return key
+        with self._lock:
+            key = self._recent.get(answer)
+            if key is not None:
+                self._recent.move_to_end(answer)
+                return key
+        key = compile_answer(answer)
+        with self._lock:
+            key = self._recent.setdefault(answer, key)
+            self._recent.move_to_end(answer)
+            while len(self._recent) > self._max_recent:
+                self._recent.popitem(last=False)
+        return key
+
+    def grade(self, answer: str, typed: str) -> str:
+        return self.key(answer).grade(typed)
+
+
+def snapshot_answers(vocabulary_data: Mapping) -> Iterable[str]:
+    """
+    Every entry field of the in-memory vocab sets.
+
+    Conjugated forms are left out: listing them would generate every
+    paradigm (or scan the whole SQLite conjugations table) at build time.
+    """
+    vocab_sets = vocabulary_data.get("vocab_sets", {})
+    # Lazy backends (blob, shards, SQLite) are not forced to load here
+    if not isinstance(vocab_sets, dict):
+        return
+    for entries in vocab_sets.values():
+        if isinstance(entries, (list, tuple)):
+            for entry in entries:
+                yield from (entry.values() if isinstance(entry, Mapping) else entry)
+
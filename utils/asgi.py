@@ -0,0 +1,291 @@
+"""
+ASGI front end for the Flask app.
+
+Push endpoints (utils.push broadcast rooms) are served natively on the event
+loop, so an idle connection costs a coroutine, not a thread. Every other
+request goes to the unchanged Flask WSGI app, which runs on a bounded thread
+pool: its blocking work (settings and custom set files, imports, content
+reloads) stays off the event loop, and streamed responses (exports,
+worksheets) are produced chunk by chunk in the pool and sent from the loop
+with backpressure.
+
+Publishing to a room needs the app's PUSH_PUBLISH_TOKEN as a bearer token
+(`Authorization: Bearer <token>`); without a configured token it is off.
+
+Only the standard library is used; any ASGI server runs it, e.g.
+
+    uvicorn asgi:application
+"""
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Optional
+
+from utils.push import MAX_EVENT_BYTES, ROOM_RE, Broadcaster, publish_to_room, stream_room
+
+EVENTS_PREFIX = "/events/rooms/"
+# Threads for WSGI requests (the push endpoints do not use them)
+DEFAULT_WSGI_THREADS = 32
+# Request bodies larger than this are spooled to a temporary file
+SPOOL_BYTES = 1024 * 1024
+# Cap on WSGI request bodies when the Flask app sets no MAX_CONTENT_LENGTH
+DEFAULT_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+
+class ClientDisconnected(Exception):
+    """The client went away before the request body was complete or the response was sent."""
+
+
+def _header_environ(headers) -> dict:
+    environ: dict = {}
+    for raw_name, raw_value in headers:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            key = name
+        else:
+            key = f"HTTP_{name}"
+        # Repeated headers are joined as one comma-separated value (PEP 3333)
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _header(scope: dict, name: bytes) -> bytes:
+    for raw_name, raw_value in scope.get("headers", ()):
+        if raw_name.lower() == name:
+            return raw_value
+    return b""
+
+
+def _app_path(scope: dict) -> str:
+    """The request path below the mount point (ASGI root_path)."""
+    root_path, path = scope.get("root_path", ""), scope["path"]
+    return path[len(root_path):] if root_path and path.startswith(root_path) else path
+
+
+def wsgi_environ(scope: dict, body) -> dict:
+    """The PEP 3333 environ of an ASGI HTTP request whose body is the file `body`."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": _app_path(scope).encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        # The body is fully buffered, so it can be read to EOF without a Content-Length
+        "wsgi.input_terminated": True,
+    }
+    environ.update(_header_environ(scope.get("headers", ())))
+    return environ
+
+
+async def _read_body(receive, limit: Optional[int] = None):
+    """
+    The request body as a file positioned at 0, or None once it exceeds
+    `limit` bytes. Raises ClientDisconnected if the client leaves before the
+    last chunk, so a truncated body never reaches the app.
+    """
+    body = SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    size = 0
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            body.close()
+            raise ClientDisconnected()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if limit is not None and size > limit:
+            body.close()
+            return None
+        body.write(chunk)
+        more_body = message.get("more_body", False)
+    body.seek(0)
+    return body
+
+
+def _run_wsgi(wsgi_app: Callable, environ: dict, send_message: Callable[[dict], None]) -> None:
+    """Call the WSGI app and hand each ASGI message to `send_message`; runs in a pool thread."""
+    response: dict = {}
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and response.get("started"):
+            raise exc_info[1].with_traceback(exc_info[2])
+        response["start"] = {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        }
+        return lambda data: None  # the legacy write() callable is not supported
+
+    iterable = wsgi_app(environ, start_response)
+    try:
+        for chunk in iterable:
+            if not chunk:
+                continue
+            if not response.get("started"):
+                send_message(response["start"])
+                response["started"] = True
+            send_message({"type": "http.response.body", "body": chunk, "more_body": True})
+    finally:
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            close()
+    if not response.get("started"):
+        send_message(response["start"])
+    send_message({"type": "http.response.body", "body": b""})
+
+
+async def _send_json(send, status: int, payload: dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AsgiApp:
+    """ASGI application: push rooms on the event loop, everything else through the WSGI app."""
+
+    def __init__(self, wsgi_app: Callable, broadcaster: Optional[Broadcaster] = None,
+                 threads: int = DEFAULT_WSGI_THREADS, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+                 publish_token: Optional[str] = None) -> None:
+        self.wsgi_app = wsgi_app
+        self.broadcaster = broadcaster or Broadcaster()
+        self.threads = threads
+        self.max_body_bytes = max_body_bytes
+        # Bearer token publishers must send; None disables publishing over HTTP
+        self.publish_token = publish_token
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix="wsgi")
+        return self._executor
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            path = _app_path(scope)
+            if path.startswith(EVENTS_PREFIX):
+                await self._events(scope, path[len(EVENTS_PREFIX):], receive, send)
+            else:
+                await self._wsgi(scope, receive, send)
+        # websocket scopes are not served
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # Open streams end so the server can finish its graceful shutdown
+                self.broadcaster.close()
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _events(self, scope, room: str, receive, send) -> None:
+        if not ROOM_RE.match(room):
+            await _send_json(send, 404, {"error": "unknown room"})
+        elif scope["method"] == "GET":
+            await stream_room(self.broadcaster, room, receive, send)
+        elif scope["method"] == "POST":
+            if not self.publish_token:
+                await _send_json(send, 403, {"error": "publishing is disabled (PUSH_PUBLISH_TOKEN is not set)"})
+                return
+            expected = f"Bearer {self.publish_token}".encode("utf-8")
+            if not hmac.compare_digest(_header(scope, b"authorization"), expected):
+                await _send_json(send, 401, {"error": "publishing needs 'Authorization: Bearer <token>'"})
+                return
+            try:
+                body = await _read_body(receive, MAX_EVENT_BYTES)
+            except ClientDisconnected:
+                return
+            if body is None:
+                await _send_json(send, 413, {"error": f"event larger than {MAX_EVENT_BYTES} bytes"})
+                return
+            with body:
+                status, payload = publish_to_room(self.broadcaster, room, body.read())
+            await _send_json(send, status, payload)
+        else:
+            await _send_json(send, 405, {"error": "use GET to subscribe or POST to publish"})
+
+    async def _wsgi(self, scope, receive, send) -> None:
+        try:
+            body = await _read_body(receive, self.max_body_bytes)
+        except ClientDisconnected:
+            return  # nobody is left to answer, and a partial body is not a request
+        if body is None:
+            await _send_json(send, 413, {"error": f"request body larger than {self.max_body_bytes} bytes"})
+            return
+        loop = asyncio.get_running_loop()
+        disconnected = threading.Event()
+
+        async def watch_disconnect() -> None:
+            # Once the body is read, the next message is http.disconnect
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        def send_message(message: dict) -> None:
+            # Raised in the pool thread, so _run_wsgi closes the response
+            # iterable instead of producing chunks nobody reads
+            if disconnected.is_set():
+                raise ClientDisconnected()
+            # Blocks the pool thread until the loop has sent the chunk
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            with body:
+                await loop.run_in_executor(
+                    self.executor, _run_wsgi, self.wsgi_app, wsgi_environ(scope, body), send_message
+                )
+        except ClientDisconnected:
+            pass
+        finally:
+            watcher.cancel()
+
+
+def create_asgi_app(flask_app, threads: Optional[int] = None) -> AsgiApp:
+    """
+    Wrap `flask_app`; `threads` defaults to $ASGI_WSGI_THREADS or
+    DEFAULT_WSGI_THREADS. Request bodies are capped at the app's
+    MAX_CONTENT_LENGTH, or DEFAULT_MAX_BODY_BYTES when it sets none, and
+    room publishers authenticate with its PUSH_PUBLISH_TOKEN.
+    """
+    if threads is None:
+        threads = int(os.environ.get("ASGI_WSGI_THREADS", DEFAULT_WSGI_THREADS))
+    max_body_bytes = flask_app.config.get("MAX_CONTENT_LENGTH") or DEFAULT_MAX_BODY_BYTES
+    return AsgiApp(
+        flask_app,
+        threads=threads,
+        max_body_bytes=max_body_bytes,
+        publish_token=flask_app.config.get("PUSH_PUBLISH_TOKEN"),
+    )
@@ -0,0 +1,424 @@
+"""
+Rule-based Spanish conjugation.
+
+A verb is stored as its infinitive plus the few facts the rules cannot guess
+(stem change, irregular future/preterite stem, participle) and the forms that
+are still irregular after that. Everything else is generated: regular
+-ar/-er/-ir paradigms, stem changes in the stressed forms, spelling changes
+(buscar -> busqué, conocer -> conozco, construir -> construyo) and the
+compound tenses from haber + participle. Derived tenses are built from the
+overridden forms, so `tengo` alone yields `tenga`, `tengamos`, ...
+
+Generated paradigms sit behind an LRU cache; the table holds only the small
+VerbSpec records, so thousands of verbs cost little memory.
+
+    python -m utils.conjugation_engine --compact old.json > data/conjugations.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import unicodedata
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
+
+PERSONS = ('yo', 'tu', 'el/ella/usted', 'nosotros', 'vosotros', 'ellos/ellas/ustedes')
+TENSES = (
+    'presente',
+    'pretérito_indefinido',
+    'imperfecto',
+    'futuro_simple',
+    'condicional',
+    'subjuntivo_presente',
+    'imperativo_afirmativo',
+    'imperativo_negativo',
+    'pretérito_perfecto_compuesto',
+    'pluscuamperfecto',
+)
+NOT_APPLICABLE = "[N/A]"
+# 'yo' has no imperative form, so these tenses are never asked for it
+IMPERATIVE_TENSES = frozenset({'imperativo_afirmativo', 'imperativo_negativo'})
+
+
+
+def persons_for(tense: str) -> tuple[str, ...]:
+    """Persons a quiz, export or worksheet asks for in `tense`."""
+    return PERSONS[1:] if tense in IMPERATIVE_TENSES else PERSONS
+
+
+# Paradigms generated per process; each is ~60 short strings
+CACHE_SIZE = 512
+
+# stem_change -> (vowel, replacement) in the stressed forms
+STEM_CHANGES = {"e>ie": ("e", "ie"), "o>ue": ("o", "ue"), "e>i": ("e", "i"), "u>ue": ("u", "ue")}
+# -ir stem-changing verbs also change in the unstressed forms of the
+# preterite (pidió, durmieron) and subjunctive (pidamos, durmamos)
+_WEAK_CHANGES = {"e>ie": ("e", "i"), "e>i": ("e", "i"), "o>ue": ("o", "u")}
+
+# Persons whose present/subjunctive forms stress the stem
+_STRESSED = (True, True, True, False, False, True)
+
+_PRESENT = {
+    "ar": ("o", "as", "a", "amos", "áis", "an"),
+    "er": ("o", "es", "e", "emos", "éis", "en"),
+    "ir": ("o", "es", "e", "imos", "ís", "en"),
+}
+_PRETERITE = {
+    "ar": ("é", "aste", "ó", "amos", "asteis", "aron"),
+    "er": ("í", "iste", "ió", "imos", "isteis", "ieron"),
+    "ir": ("í", "iste", "ió", "imos", "isteis", "ieron"),
+}
+_STRONG_PRETERITE = ("e", "iste", "o", "imos", "isteis", "ieron")
+_IMPERFECT = {
+    "ar": ("aba", "abas", "aba", "ábamos", "abais", "aban"),
+    "er": ("ía", "ías", "ía", "íamos", "íais", "ían"),
+    "ir": ("ía", "ías", "ía", "íamos", "íais", "ían"),
+}
+_FUTURE = ("é", "ás", "á", "emos", "éis", "án")
+_CONDITIONAL = ("ía", "ías", "ía", "íamos", "íais", "ían")
+_SUBJUNCTIVE = {
+    "ar": ("e", "es", "e", "emos", "éis", "en"),
+    "er": ("a", "as", "a", "amos", "áis", "an"),
+    "ir": ("a", "as", "a", "amos", "áis", "an"),
+}
+_HABER_PRESENT = ("he", "has", "ha", "hemos", "habéis", "han")
+_HABER_IMPERFECT = ("había", "habías", "había", "habíamos", "habíais", "habían")
+
+_VOWELS = "aeiou"
+
+
+def _unaccent(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFD", text) if unicodedata.category(c) != "Mn")
+
+
+@dataclass(frozen=True)
+class VerbSpec:
+    """What the rules need to know about one verb. Hashable, so it keys the cache."""
+
+    infinitive: str
+    stem_change: Optional[str] = None
+    future_stem: Optional[str] = None
+    preterite_stem: Optional[str] = None
+    participle: Optional[str] = None
+    # ((tense, person, form), ...) in TENSES/PERSONS order
+    overrides: tuple[tuple[str, str, str], ...] = ()
+
+    @classmethod
+    def from_json(cls, infinitive: str, entry: Mapping) -> "VerbSpec":
+        """Parse one `verbs` entry of conjugations.json; raises ValueError on unknown names."""
+        base = _unaccent(infinitive)
+        if base[-2:] not in _PRESENT:
+            raise ValueError(f"Verb '{infinitive}': infinitive must end in -ar, -er or -ir")
+        unknown = set(entry) - {"stem_change", "future_stem", "preterite_stem", "participle", "overrides"}
+        if unknown:
+            raise ValueError(f"Verb '{infinitive}': unknown keys {sorted(unknown)}")
+        stem_change = entry.get("stem_change")
+        if stem_change is not None and stem_change not in STEM_CHANGES:
+            raise ValueError(f"Verb '{infinitive}': unknown stem_change '{stem_change}'")
+
+        overrides = []
+        raw = entry.get("overrides", {})
+        for tense in raw:
+            if tense not in TENSES:
+                raise ValueError(f"Verb '{infinitive}': unknown tense '{tense}' in overrides")
+            for person in raw[tense]:
+                if person not in PERSONS:
+                    raise ValueError(f"Verb '{infinitive}': unknown person '{person}' in overrides")
+        for tense in TENSES:
+            for person in PERSONS:
+                form = raw.get(tense, {}).get(person)
+                if form is not None:
+                    overrides.append((tense, person, str(form)))
+        return cls(
+            infinitive=infinitive,
+            stem_change=stem_change,
+            future_stem=entry.get("future_stem"),
+            preterite_stem=entry.get("preterite_stem"),
+            participle=entry.get("participle"),
+            overrides=tuple(overrides),
+        )
+
+    def to_json(self) -> dict:
+        entry: dict = {}
+        for key in ("stem_change", "future_stem", "preterite_stem", "participle"):
+            value = getattr(self, key)
+            if value is not None:
+                entry[key] = value
+        if self.overrides:
+            overrides: dict[str, dict[str, str]] = {}
+            for tense, person, form in self.overrides:
+                overrides.setdefault(tense, {})[person] = form
+            entry["overrides"] = overrides
+        return entry
+
+
+class _Verb:
+    """Stems and spelling rules for one spec while its paradigm is generated."""
+
+    def __init__(self, spec: VerbSpec) -> None:
+        self.spec = spec
+        self.base = _unaccent(spec.infinitive)
+        self.ending = self.base[-2:]
+        self.stem = self.base[:-2]
+        change = STEM_CHANGES.get(spec.stem_change) if spec.stem_change else None
+        weak = _WEAK_CHANGES.get(spec.stem_change) if spec.stem_change and self.ending == "ir" else None
+        self.strong_stem = _change_vowel(self.stem, change) if change else self.stem
+        self.weak_stem = _change_vowel(self.stem, weak) if weak else self.stem
+        last = self.stem[-1:]
+        silent_u = self.stem.endswith(("gu", "qu"))
+        # leer, caer, oír: leyó, leyeron, leído
+        self.vowel_stem = self.ending != "ar" and last in "aeo" and last != ""
+        # construir, incluir: construyo, construyó, construido
+        self.uir = self.ending == "ir" and last == "u" and not silent_u
+
+    def join(self, stem: str, ending: str) -> str:
+        """stem + ending with the spelling changes that keep the stem's sound."""
+        first = ending[:1]
+        if self.ending == "ar":
+            if first in ("e", "é"):
+                if stem.endswith("gu"):
+                    return stem[:-2] + "gü" + ending
+                if stem.endswith("c"):
+                    return stem[:-1] + "qu" + ending
+                if stem.endswith("g"):
+                    return stem[:-1] + "gu" + ending
+                if stem.endswith("z"):
+                    return stem[:-1] + "c" + ending
+            return stem + ending
+        if first in ("a", "o", "á", "ó"):
+            if stem.endswith("gu"):
+                return stem[:-1] + ending
+            if stem.endswith("g"):
+                return stem[:-1] + "j" + ending
+            if stem.endswith("c"):
+                # conocer -> conozco, vencer -> venzo
+                if stem[-2:-1] in _VOWELS:
+                    return stem[:-1] + "zc" + ending
+                return stem[:-1] + "z" + ending
+        if self.uir and first not in ("i", "í"):
+            return stem + "y" + ending
+        return stem + ending
+
+    def present(self) -> list[str]:
+        endings = _PRESENT[self.ending]
+        return [
+            self.join(self.strong_stem if stressed else self.stem, ending)
+            for stressed, ending in zip(_STRESSED, endings)
+        ]
+
+    def preterite(self) -> list[str]:
+        if self.spec.preterite_stem:
+            stem = self.spec.preterite_stem
+            endings = list(_STRONG_PRETERITE)
+            if stem.endswith("j"):
+                endings[5] = "eron"
+            return [stem + ending for ending in endings]
+        endings = list(_PRETERITE[self.ending])
+        if self.vowel_stem or self.uir:
+            endings[2], endings[5] = "yó", "yeron"
+            if self.vowel_stem:
+                endings[1], endings[3], endings[4] = "íste", "ímos", "ísteis"
+            return [self.stem + ending for ending in endings]
+        forms = [self.join(self.stem, ending) for ending in endings]
+        if self.weak_stem != self.stem:
+            forms[2] = self.join(self.weak_stem, endings[2])
+            forms[5] = self.join(self.weak_stem, endings[5])
+        return forms
+
+    def imperfect(self) -> list[str]:
+        return [self.stem + ending for ending in _IMPERFECT[self.ending]]
+
+    def future_stem(self) -> str:
+        return self.spec.future_stem or self.base
+
+    def subjunctive(self, present_yo: str) -> list[str]:
+        endings = _SUBJUNCTIVE[self.ending]
+        regular_yo = self.join(self.strong_stem, _PRESENT[self.ending][0])
+        if present_yo != regular_yo and present_yo.endswith("o"):
+            # tengo -> tenga, tengamos; the irregular yo stem carries through
+            stem = present_yo[:-1]
+            return [stem + ending for ending in endings]
+        return [
+            self.join(self.strong_stem if stressed else self.weak_stem, ending)
+            for stressed, ending in zip(_STRESSED, endings)
+        ]
+
+    def participle(self) -> str:
+        if self.spec.participle:
+            return self.spec.participle
+        if self.ending == "ar":
+            return self.stem + "ado"
+        return self.stem + ("ído" if self.vowel_stem else "ido")
+
+
+def _change_vowel(stem: str, change: tuple[str, str]) -> str:
+    """Apply a stem change to the last matching vowel (preferir -> prefier-)."""
+    vowel, replacement = change
+    i = stem.rfind(vowel)
+    if i < 0:
+        return stem
+    return stem[:i] + replacement + stem[i + 1:]
+
+
+def _generate(spec: VerbSpec) -> dict[str, dict[str, str]]:
+    verb = _Verb(spec)
+    overrides: dict[str, dict[str, str]] = {}
+    for tense, person, form in spec.overrides:
+        overrides.setdefault(tense, {})[person] = form
+
+    paradigm: dict[str, dict[str, str]] = {}
+
+    def put(tense: str, forms: list[str]) -> list[str]:
+        fixed = overrides.get(tense, {})
+        forms = [fixed.get(person, form) for person, form in zip(PERSONS, forms)]
+        paradigm[tense] = dict(zip(PERSONS, forms))
+        return forms
+
+    present = put('presente', verb.present())
+    put('pretérito_indefinido', verb.preterite())
+    put('imperfecto', verb.imperfect())
+    future_stem = verb.future_stem()
+    put('futuro_simple', [future_stem + ending for ending in _FUTURE])
+    put('condicional', [future_stem + ending for ending in _CONDITIONAL])
+    subjunctive = put('subjuntivo_presente', verb.subjunctive(present[0]))
+    put('imperativo_afirmativo', [
+        # From the spelled infinitive, so the accent stays: oír -> oíd
+        NOT_APPLICABLE, present[2], subjunctive[2], subjunctive[3], spec.infinitive[:-1] + "d", subjunctive[5],
+    ])
+    put('imperativo_negativo', [NOT_APPLICABLE] + ["no " + form for form in subjunctive[1:]])
+    participle = verb.participle()
+    put('pretérito_perfecto_compuesto', [f"{aux} {participle}" for aux in _HABER_PRESENT])
+    put('pluscuamperfecto', [f"{aux} {participle}" for aux in _HABER_IMPERFECT])
+    return paradigm
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def conjugate(spec: VerbSpec) -> Mapping[str, Mapping[str, str]]:
+    """Read-only tense -> person -> form mapping for one verb."""
+    return MappingProxyType({
+        tense: MappingProxyType(forms) for tense, forms in _generate(spec).items()
+    })
+
+
+class ConjugationTable(Mapping):
+    """
+    verb -> tense -> person -> form, in the shape of `conjugations_quiz`.
+
+    Only the VerbSpec records are stored; a verb's paradigm is generated when
+    it is looked up and kept in the shared LRU cache.
+    """
+
+    def __init__(self, specs: Mapping[str, VerbSpec]) -> None:
+        self._specs = dict(specs)
+
+    @classmethod
+    def from_json(cls, data: Mapping) -> "ConjugationTable":
+        return cls({verb: VerbSpec.from_json(verb, entry) for verb, entry in data.get("verbs", {}).items()})
+
+    @property
+    def tenses(self) -> tuple[str, ...]:
+        return TENSES if self._specs else ()
+
+    def spec(self, verb: str) -> VerbSpec:
+        return self._specs[verb]
+
+    def __getitem__(self, verb: str) -> Mapping[str, Mapping[str, str]]:
+        return conjugate(self._specs[verb])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def to_json(self) -> dict:
+        return {"verbs": {verb: spec.to_json() for verb, spec in self._specs.items()}}
+
+
+def quiz_data_from_json(data: Mapping) -> Mapping:
+    """`conjugations_quiz` data for either file layout (rule-based `verbs` or full forms)."""
+    if "verbs" in data:
+        return ConjugationTable.from_json(data)
+    return data.get("conjugations_quiz", {})
+
+
+def _diff(generated: Mapping, forms: Mapping, tense: str) -> list[tuple[str, str, str]]:
+    return [
+        (tense, person, forms[tense][person])
+        for person in PERSONS
+        if person in forms.get(tense, {}) and generated[tense][person] != forms[tense][person]
+    ]
+
+
+def compact_verb(infinitive: str, forms: Mapping[str, Mapping[str, str]]) -> VerbSpec:
+    """
+    Smallest VerbSpec whose paradigm equals `forms` (a full conjugations_quiz entry).
+
+    The stems are read off the data, the stem change with the fewest leftover
+    overrides wins, and overrides are added tense by tense in generation order
+    so derived tenses pick up earlier ones.
+    """
+    base = _unaccent(infinitive)
+    spec = VerbSpec(infinitive)
+
+    def first(tense: str) -> str:
+        return forms.get(tense, {}).get('yo', '')
+
+    participle = first('pretérito_perfecto_compuesto').partition(" ")[2]
+    if participle and participle != _Verb(spec).participle():
+        spec = replace(spec, participle=participle)
+    future = first('futuro_simple')
+    if future.endswith("é") and future[:-1] != base:
+        spec = replace(spec, future_stem=future[:-1])
+    preterite = first('pretérito_indefinido')
+    if preterite.endswith("e") and preterite != _Verb(spec).preterite()[0]:
+        spec = replace(spec, preterite_stem=preterite[:-1])
+
+    best = None
+    for change in (None, *STEM_CHANGES):
+        candidate = replace(spec, stem_change=change)
+        overrides: list[tuple[str, str, str]] = []
+        for tense in TENSES:
+            generated = _generate(replace(candidate, overrides=tuple(overrides)))
+            overrides.extend(_diff(generated, forms, tense))
+        candidate = replace(candidate, overrides=tuple(overrides))
+        if best is None or len(candidate.overrides) < len(best.overrides):
+            best = candidate
+    return best
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Conjugation engine tools.")
+    parser.add_argument("--compact", metavar="JSON", help="convert a full conjugations_quiz file to rule-based verbs")
+    parser.add_argument("--show", metavar="JSON", help="print the generated paradigms of a conjugations file")
+    parser.add_argument("verbs", nargs="*", help="limit --show to these verbs")
+    args = parser.parse_args(argv)
+
+    if args.compact:
+        with open(args.compact, "r", encoding="utf-8") as f:
+            quiz_data = quiz_data_from_json(json.load(f))
+        table = ConjugationTable({verb: compact_verb(verb, quiz_data[verb]) for verb in quiz_data})
+        for verb in quiz_data:
+            if {t: dict(p) for t, p in table[verb].items()} != {t: dict(p) for t, p in quiz_data[verb].items()}:
+                print(f"Verb '{verb}' does not round-trip", file=sys.stderr)
+                return 1
+        json.dump(table.to_json(), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+    if args.show:
+        with open(args.show, "r", encoding="utf-8") as f:
+            quiz_data = quiz_data_from_json(json.load(f))
+        for verb in args.verbs or quiz_data:
+            print(verb)
+            for tense, persons in quiz_data[verb].items():
+                print(f"  {tense}: " + ", ".join(persons.values()))
+        return 0
+    parser.print_help()
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
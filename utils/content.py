@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+from utils.answer_matching import AnswerKeys, snapshot_answers
+from utils.content_blob import VocabularyBlob
+from utils.data_validator import (
+    load_and_validate_data,
+    load_and_validate_por_para_data,
+    load_and_validate_vocabulary_data,
+)
+from utils.distractors import DistractorIndex
+from utils.form_index import FormIndex
+from utils.prefork import freeze_content
+from utils.records import PorParaIndex, StringPool, compact_vocabulary_data
+from utils.sqlite_content import SqliteContent, database_version
+from utils.vocab_search import VocabSearchIndex
+from utils.vocab_shards import DEFAULT_BUDGET_BYTES, ShardedVocabulary
+from utils.view_models import OptionViewModels, build_option_view_models
+
+
+@dataclass(frozen=True)
+class ContentPaths:
+    conjugations: str
+    por_para: str
+    vocabulary: str
+    # Optional compiled vocabulary (utils.content_blob); replaces `vocabulary`
+    vocabulary_blob: Optional[str] = None
+    # Optional per-set shard directory (utils.vocab_shards); replaces `vocabulary`
+    vocabulary_shards: Optional[str] = None
+    # Optional SQLite content database (utils.sqlite_content); replaces all three files
+    content_db: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+    """
+    Everything the request path reads, built once from the data files.
+
+    A snapshot is never mutated after construction; reloading builds a new one
+    and swaps it in. Content containers are frozen (lists become tuples,
+    strings are interned, vocab entries become VocabEntry records) so a
+    snapshot built in a pre-fork master stays shared between workers.
+    """
+
+    conjugations_data: dict
+    por_para_data: dict
+    vocabulary_data: dict
+    por_para_index: PorParaIndex
+    # Built on first lookup; see utils.form_index
+    form_index: FormIndex
+    # Typed-answer acceptance sets, compiled up front for in-memory vocab sets
+    answer_keys: AnswerKeys
+    # Multiple-choice distractor neighbors per vocab set and field
+    distractors: DistractorIndex
+    # Accent-insensitive search and autocomplete over every vocab set
+    vocab_search: VocabSearchIndex
+    option_views: OptionViewModels
+    loaded_at: float
+    load_seconds: float
+
+
+def _load_vocabulary(paths: ContentPaths, *, shard_budget_bytes: int) -> tuple[dict, Mapping[str, str]]:
+    """Return (vocabulary_data, display names known to the storage backend)."""
+    if paths.vocabulary_shards:
+        # Only the shard index is read here; sets load on first use
+        shards = ShardedVocabulary(paths.vocabulary_shards, budget_bytes=shard_budget_bytes)
+        return shards.as_vocabulary_data(), shards.display_names
+    if paths.vocabulary_blob:
+        # Entries stay in the read-only mapping and are decoded on access
+        return VocabularyBlob(paths.vocabulary_blob).as_vocabulary_data(), {}
+    return compact_vocabulary_data(load_and_validate_vocabulary_data(paths.vocabulary), StringPool()), {}
+
+
+def build_content_snapshot(
+    paths: ContentPaths,
+    *,
+    vocab_set_names: Mapping[str, str],
+    por_category_names: Mapping[str, str],
+    para_category_names: Mapping[str, str],
+    shard_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+    previous: Optional[ContentSnapshot] = None,
+) -> ContentSnapshot:
+    """Build a snapshot; indexes of `previous` are reused where the content is unchanged."""
+    started = time.perf_counter()
+    if paths.content_db:
+        # Rows are fetched by indexed lookups on demand; nothing is copied here
+        db = SqliteContent(paths.content_db)
+        conjugations_data, por_para_data, vocabulary_data = db.conjugations_data, db.por_para_data, db.vocabulary_data
+        storage_set_names: Mapping[str, str] = {}
+    else:
+        conjugations_data = freeze_content(load_and_validate_data(paths.conjugations))
+        por_para_data = freeze_content(load_and_validate_por_para_data(paths.por_para))
+        vocabulary_data, storage_set_names = _load_vocabulary(paths, shard_budget_bytes=shard_budget_bytes)
+    if storage_set_names:
+        vocab_set_names = {**storage_set_names, **vocab_set_names}
+
+    quiz_data = conjugations_data.get("conjugations_quiz", {})
+    option_views = build_option_view_models(
+        conjugations_data,
+        por_para_data,
+        vocabulary_data,
+        vocab_set_names=vocab_set_names,
+        por_category_names=por_category_names,
+        para_category_names=para_category_names,
+    )
+    return ContentSnapshot(
+        conjugations_data=conjugations_data,
+        por_para_data=por_para_data,
+        vocabulary_data=vocabulary_data,
+        por_para_index=PorParaIndex(por_para_data),
+        form_index=FormIndex(quiz_data),
+        answer_keys=AnswerKeys(snapshot_answers(vocabulary_data)),
+        distractors=DistractorIndex(vocabulary_data, previous.distractors if previous is not None else None),
+        vocab_search=VocabSearchIndex(
+            vocabulary_data, {set_key: name for set_key, name, _ in option_views.vocab.vocab_sets}
+        ),
+        option_views=option_views,
+        loaded_at=time.time(),
+        load_seconds=time.perf_counter() - started,
+    )
+
+
+class ContentStore:
+    """
+    Holds the current ContentSnapshot for one app.
+
+    The snapshot is built lazily on first access (or eagerly via get() from the
+    app factory). Loading is serialized so concurrent first requests build it
+    only once. With a content database, get() rebuilds the snapshot once the
+    database has been written to (database_version changed).
+    """
+
+    def __init__(
+        self,
+        paths: ContentPaths,
+        *,
+        vocab_set_names: Mapping[str, str],
+        por_category_names: Mapping[str, str],
+        para_category_names: Mapping[str, str],
+        shard_budget_bytes: int = DEFAULT_BUDGET_BYTES,
+    ) -> None:
+        self.paths = paths
+        self._options = {
+            "vocab_set_names": vocab_set_names,
+            "por_category_names": por_category_names,
+            "para_category_names": para_category_names,
+            "shard_budget_bytes": shard_budget_bytes,
+        }
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._built_from: Optional[tuple[int, int]] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._snapshot is not None
+
+    def _source_version(self) -> Optional[tuple[int, int]]:
+        # Only the content database changes under a running app (replace_vocab_set);
+        # JSON data files are reloaded explicitly
+        return database_version(self.paths.content_db) if self.paths.content_db else None
+
+    def get(self) -> ContentSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and self._built_from == self._source_version():
+            return snapshot
+        with self._lock:
+            version = self._source_version()
+            if self._snapshot is None or self._built_from != version:
+                self._snapshot = build_content_snapshot(self.paths, previous=self._snapshot, **self._options)
+                self._built_from = version
+            return self._snapshot
+
+    def reload(self) -> ContentSnapshot:
+        """Rebuild the snapshot from disk and swap it in."""
+        version = self._source_version()
+        snapshot = build_content_snapshot(self.paths, previous=self._snapshot, **self._options)
+        with self._lock:
+            self._snapshot = snapshot
+            self._built_from = version
+        return snapshot
+
+
+def load_or_create_secret_key(path: str) -> bytes:
+    """
+    Return the secret key stored at `path`, generating it on first use.
+
+    The key is written to a temporary file and hard-linked into place, so
+    `path` never exists half-written and concurrently starting processes
+    agree on the first key linked.
+    """
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{secrets.token_hex(8)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secrets.token_bytes(32))
+    try:
+        os.link(tmp_path, path)
+    except FileExistsError:
+        # An empty key file can only be left over from a crash; replace it
+        if os.path.getsize(path) == 0:
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    with open(path, "rb") as f:
+        return f.read()
@@ -0,0 +1,190 @@
+"""
+Compiled, memory-mapped vocabulary format.
+
+Layout (little-endian):
+
+    header     magic b"SFVB", version u32, set_count u32,
+               set_table_offset u64, heap_offset u64
+    set table  per set: key_offset u64, key_len u32, entry_count u32,
+               entries_offset u64
+    entries    per entry: (offset u64, length u32) for spanish, german, english
+    heap       UTF-8 strings, each distinct string stored once
+
+Opening a blob only reads the header and the set table, so it costs
+O(number of sets) regardless of how many entries the file holds. Entries are
+decoded one at a time when indexed.
+
+    python -m utils.content_blob data/vocabulary.json data/vocabulary.blob
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+from utils.records import VOCAB_FIELDS, VocabEntry, entry_as_dict
+
+MAGIC = b"SFVB"
+VERSION = 1
+FIELDS = VOCAB_FIELDS
+
+_HEADER = struct.Struct("<4sIIQQ")
+_SET_ROW = struct.Struct("<QIIQ")
+_ENTRY_ROW = struct.Struct("<" + "QI" * len(FIELDS))
+
+
+class BlobFormatError(ValueError):
+    pass
+
+
+class BlobVocabSet(Sequence):
+    """Read-only sequence of VocabEntry records backed by the mapped blob."""
+
+    __slots__ = ("_buf", "_entries_offset", "_count")
+
+    def __init__(self, buf, entries_offset: int, count: int) -> None:
+        self._buf = buf
+        self._entries_offset = entries_offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("vocab set index out of range")
+        row = _ENTRY_ROW.unpack_from(self._buf, self._entries_offset + index * _ENTRY_ROW.size)
+        buf = self._buf
+        return VocabEntry(
+            str(buf[row[0]:row[0] + row[1]], "utf-8"),
+            str(buf[row[2]:row[2] + row[3]], "utf-8"),
+            str(buf[row[4]:row[4] + row[5]], "utf-8"),
+        )
+
+
+class BlobVocabSets(Mapping):
+    """set_key -> BlobVocabSet, in the order the sets were compiled."""
+
+    def __init__(self, sets: dict[str, BlobVocabSet]) -> None:
+        self._sets = sets
+
+    def __getitem__(self, key: str) -> BlobVocabSet:
+        return self._sets[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sets)
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+class VocabularyBlob:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        self._buf = buf
+
+        if len(buf) < _HEADER.size:
+            raise BlobFormatError(f"Vocabulary blob too small: {path}")
+        magic, version, set_count, set_table_offset, _heap_offset = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise BlobFormatError(f"Not a vocabulary blob: {path}")
+        if version != VERSION:
+            raise BlobFormatError(f"Unsupported vocabulary blob version {version}: {path}")
+
+        sets: dict[str, BlobVocabSet] = {}
+        for i in range(set_count):
+            key_offset, key_len, count, entries_offset = _SET_ROW.unpack_from(
+                buf, set_table_offset + i * _SET_ROW.size
+            )
+            key = str(buf[key_offset:key_offset + key_len], "utf-8")
+            sets[key] = BlobVocabSet(buf, entries_offset, count)
+        self.vocab_sets = BlobVocabSets(sets)
+
+    def as_vocabulary_data(self) -> dict:
+        """Same shape as vocabulary.json: {'vocab_sets': {set_key: [entry, ...]}}."""
+        return {"vocab_sets": self.vocab_sets}
+
+
+def compile_vocabulary_blob(vocabulary_data: dict, out_path: str) -> None:
+    """Write `vocabulary_data` (vocabulary.json shape) as a blob, atomically."""
+    vocab_sets = vocabulary_data.get("vocab_sets", {})
+    sets = [
+        (set_key, [e for e in map(entry_as_dict, entries) if e is not None])
+        for set_key, entries in vocab_sets.items()
+        if isinstance(entries, (list, tuple))
+    ]
+
+    heap = bytearray()
+    heap_index: dict[str, int] = {}
+
+    def intern(text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = heap_index.get(text)
+        if offset is None:
+            offset = len(heap)
+            heap_index[text] = offset
+            heap.extend(data)
+        return offset, len(data)
+
+    # Heap-relative rows first; absolute offsets are known once the sizes are.
+    set_rows = []
+    entry_rows = []
+    for set_key, entries in sets:
+        key_ref = intern(set_key)
+        set_rows.append((key_ref, len(entries), len(entry_rows)))
+        for entry in entries:
+            entry_rows.append([intern(str(entry.get(field, ""))) for field in FIELDS])
+
+    set_table_offset = _HEADER.size
+    entries_offset = set_table_offset + len(set_rows) * _SET_ROW.size
+    heap_offset = entries_offset + len(entry_rows) * _ENTRY_ROW.size
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, len(set_rows), set_table_offset, heap_offset))
+    for (key_off, key_len), count, first_entry in set_rows:
+        out += _SET_ROW.pack(
+            heap_offset + key_off, key_len, count, entries_offset + first_entry * _ENTRY_ROW.size
+        )
+    for refs in entry_rows:
+        flat = []
+        for off, length in refs:
+            flat.extend((heap_offset + off, length))
+        out += _ENTRY_ROW.pack(*flat)
+    out += heap
+
+    directory = os.path.dirname(out_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(out_path)}.{uuid4().hex}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(out)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, out_path)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from utils.data_validator import load_and_validate_vocabulary_data
+
+    args = sys.argv[1:] if argv is None else argv
+    repo_root = Path(__file__).resolve().parents[1]
+    src = args[0] if len(args) > 0 else str(repo_root / "data" / "vocabulary.json")
+    dst = args[1] if len(args) > 1 else str(repo_root / "data" / "vocabulary.blob")
+
+    compile_vocabulary_blob(load_and_validate_vocabulary_data(src), dst)
+    print(f"Wrote {dst} ({os.path.getsize(dst)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+"""
+Single-pass content validation with structured issues.
+
+Each checker is a generator over one data file and yields Issue records as it
+walks the data once; nothing is formatted unless a caller asks for it. The
+vocabulary checker keeps one global index of normalized Spanish terms
+(normalize_spanish_term, as used by the dialogue generator), so duplicates
+across sets and conflicting translations are found in O(n).
+
+    python -m utils.content_validator                 # summary on stdout
+    python -m utils.content_validator --report out.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Mapping, Optional
+
+from utils.conjugation_engine import PERSONS, quiz_data_from_json
+from utils.dialog_vocab_generator import normalize_spanish_term
+
+POR_CATEGORIES = ['motivation_reason', 'duration', 'cost_price', 'location_movement',
+                  'means_of_travel', 'means_of_communication', 'passive_voice_action']
+PARA_CATEGORIES = ['destination', 'goal', 'recipients', 'deadlines',
+                   'expression_of_opinion', 'disparate_idea']
+VOCAB_FIELDS = ('spanish', 'german', 'english')
+
+MIN_SENTENCES_PER_CATEGORY = 10
+MIN_ENTRIES_PER_SET = 10
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+
+@dataclass(frozen=True)
+class Issue:
+    severity: str
+    code: str
+    file: str
+    # Where the issue is, e.g. {"set": "dele_b1_info", "entry": 3}
+    location: Mapping[str, object] = field(default_factory=dict)
+    # Code-specific details, e.g. {"key": "german"} or {"term": "el examen"}
+    detail: Mapping[str, object] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "severity": self.severity,
+            "code": self.code,
+            "file": self.file,
+            "location": dict(self.location),
+            "detail": dict(self.detail),
+        }
+
+
+def iter_conjugation_issues(quiz_data: dict, *, fix: bool = False) -> Iterator[Issue]:
+    """
+    Every verb must have every tense seen in the data, each with all 6 persons.
+
+    With fix=True, missing tenses/persons are filled in ('[MISSING]') as they
+    are found.
+    """
+    all_tenses: set[str] = set()
+    for verb_data in quiz_data.values():
+        all_tenses.update(verb_data.keys())
+
+    for verb_name, verb_data in quiz_data.items():
+        for tense in all_tenses:
+            if tense not in verb_data:
+                if fix:
+                    verb_data[tense] = {}
+                yield Issue(ERROR, "missing_tense", "conjugations", {"verb": verb_name, "tense": tense})
+            persons = verb_data.get(tense, {})
+            for person in PERSONS:
+                if person not in persons:
+                    if fix:
+                        persons[person] = "[MISSING]"
+                    yield Issue(
+                        ERROR, "missing_person", "conjugations",
+                        {"verb": verb_name, "tense": tense, "person": person},
+                    )
+
+
+def iter_por_para_issues(data: dict, *, fix: bool = False) -> Iterator[Issue]:
+    """
+    Expected categories exist, have enough sentences, and every sentence has a
+    '_____' blank. With fix=True, missing categories are added as empty lists.
+    """
+    for answer, expected in (("por", POR_CATEGORIES), ("para", PARA_CATEGORIES)):
+        categories = data.get(answer, {})
+        for category in expected:
+            if category not in categories:
+                if fix:
+                    categories[category] = []
+                yield Issue(ERROR, "missing_category", "por_para", {"answer": answer, "category": category})
+                continue
+            sentences = categories[category]
+            if len(sentences) < MIN_SENTENCES_PER_CATEGORY:
+                yield Issue(
+                    WARNING, "too_few_sentences", "por_para", {"answer": answer, "category": category},
+                    {"count": len(sentences), "minimum": MIN_SENTENCES_PER_CATEGORY},
+                )
+            for i, sentence in enumerate(sentences):
+                location = {"answer": answer, "category": category, "sentence": i + 1}
+                if '_____' not in sentence:
+                    yield Issue(ERROR, "missing_placeholder", "por_para", location)
+                if not sentence.strip():
+                    yield Issue(ERROR, "empty_sentence", "por_para", location)
+
+
+def _fold_translation(value: str) -> str:
+    return " ".join(str(value).lower().split())
+
+
+def iter_vocabulary_issues(vocab_sets: dict, *, cross_set: bool = True) -> Iterator[Issue]:
+    """
+    Entry shape, minimum set size and duplicate Spanish terms.
+
+    Within a set, duplicates are compared after strip().lower(). With
+    cross_set=True a global index keyed by normalize_spanish_term also reports
+    terms repeated in other sets and, among those, different German
+    translations of the same term.
+    """
+    # normalized term -> (set_key, entry number, folded german)
+    first_seen: dict[str, tuple[str, int, str]] = {}
+
+    for set_name, vocab_list in vocab_sets.items():
+        if not isinstance(vocab_list, (list, tuple)):
+            yield Issue(ERROR, "set_not_a_list", "vocabulary", {"set": set_name})
+            continue
+        if len(vocab_list) < MIN_ENTRIES_PER_SET:
+            yield Issue(
+                WARNING, "too_few_entries", "vocabulary", {"set": set_name},
+                {"count": len(vocab_list), "minimum": MIN_ENTRIES_PER_SET},
+            )
+
+        in_set: set[str] = set()
+        for i, entry in enumerate(vocab_list):
+            location = {"set": set_name, "entry": i + 1}
+            if not isinstance(entry, dict):
+                yield Issue(ERROR, "entry_not_a_dict", "vocabulary", location)
+                continue
+            for key in VOCAB_FIELDS:
+                if key not in entry:
+                    yield Issue(ERROR, "missing_key", "vocabulary", location, {"key": key})
+                elif not entry[key] or not str(entry[key]).strip():
+                    yield Issue(ERROR, "empty_value", "vocabulary", location, {"key": key})
+
+            spanish = entry.get('spanish')
+            if not isinstance(spanish, str):
+                continue
+            word = spanish.strip().lower()
+            if word in in_set:
+                yield Issue(WARNING, "duplicate_in_set", "vocabulary", location, {"spanish": spanish})
+            else:
+                in_set.add(word)
+
+            if not cross_set:
+                continue
+            term = normalize_spanish_term(spanish)
+            if not term:
+                continue
+            german = _fold_translation(entry.get('german', ''))
+            seen = first_seen.get(term)
+            if seen is None:
+                first_seen[term] = (set_name, i + 1, german)
+            elif seen[0] != set_name:
+                other = {"set": seen[0], "entry": seen[1]}
+                yield Issue(INFO, "duplicate_across_sets", "vocabulary", location, {"term": term, "first": other})
+                if german and seen[2] and german != seen[2]:
+                    yield Issue(
+                        WARNING, "conflicting_translation", "vocabulary", location,
+                        {"term": term, "first": other, "german": entry.get('german')},
+                    )
+
+
+_MESSAGES = {
+    "missing_tense": "Missing tense '{tense}' for verb '{verb}'",
+    "missing_person": "Missing person '{person}' for verb '{verb}', tense '{tense}'",
+    "missing_category": "Missing {answer} category '{category}'",
+    "too_few_sentences": "{Answer} category '{category}' has only {count} sentences (minimum {minimum})",
+    "missing_placeholder": "{Answer} category '{category}', sentence {sentence} missing '_____' placeholder",
+    "empty_sentence": "{Answer} category '{category}', sentence {sentence} is empty",
+    "set_not_a_list": "Vocab set '{set}' is not a list",
+    "too_few_entries": "Vocab set '{set}' has only {count} entries (minimum {minimum})",
+    "entry_not_a_dict": "Vocab set '{set}', entry {entry} is not a dictionary",
+    "missing_key": "Vocab set '{set}', entry {entry} missing '{key}' key",
+    "empty_value": "Vocab set '{set}', entry {entry} has empty '{key}' value",
+    "duplicate_in_set": "Vocab set '{set}', duplicate Spanish word: '{spanish}'",
+    "duplicate_across_sets": "Vocab set '{set}', entry {entry}: '{term}' also in set '{first[set]}'",
+    "conflicting_translation": (
+        "Vocab set '{set}', entry {entry}: '{term}' translated as '{german}', "
+        "differs from set '{first[set]}' entry {first[entry]}"
+    ),
+    # utils.vocab_import rows
+    "unreadable_row": "Line {line}: cannot read row ({error})",
+    "too_few_columns": "Line {line}: expected Spanish and German columns, found {count}",
+    "empty_field": "Line {line}: empty '{key}' value",
+    "duplicate_existing": "Line {line}: '{term}' already in set '{set}'",
+    "duplicate_in_import": "Line {line}: '{term}' repeats line {first}",
+}
+
+
+def format_issue(issue: Issue) -> str:
+    """One-line human-readable message, worded like the startup validators."""
+    fields = {**issue.location, **issue.detail}
+    if "answer" in fields:
+        fields["Answer"] = str(fields["answer"]).capitalize()
+    template = _MESSAGES.get(issue.code)
+    return template.format(**fields) if template else f"{issue.code}: {fields}"
+
+
+def _load_json(path: str) -> dict:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Data file not found: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def validate_content(
+    conjugations_path: Optional[str] = None,
+    por_para_path: Optional[str] = None,
+    vocabulary_path: Optional[str] = None,
+) -> Iterator[Issue]:
+    """One pass over each given data file, yielding issues as they are found."""
+    if conjugations_path:
+        yield from iter_conjugation_issues(quiz_data_from_json(_load_json(conjugations_path)))
+    if por_para_path:
+        yield from iter_por_para_issues(_load_json(por_para_path))
+    if vocabulary_path:
+        yield from iter_vocabulary_issues(_load_json(vocabulary_path).get('vocab_sets', {}))
+
+
+def write_report(issues: Iterable[Issue], fp: IO[str]) -> Counter:
+    """
+    Stream issues to `fp` as a JSON document while they are produced.
+
+    Layout: {"issues": [...], "summary": {"total": n, "by_severity": {...},
+    "by_code": {...}}}. Returns the per-code counter.
+    """
+    by_code: Counter = Counter()
+    by_severity: Counter = Counter()
+    fp.write('{"issues": [')
+    for n, issue in enumerate(issues):
+        fp.write(",\n  " if n else "\n  ")
+        json.dump(issue.to_dict(), fp, ensure_ascii=False)
+        by_code[issue.code] += 1
+        by_severity[issue.severity] += 1
+    summary = {"total": sum(by_code.values()), "by_severity": dict(by_severity), "by_code": dict(by_code)}
+    fp.write('\n],\n"summary": ')
+    json.dump(summary, fp, ensure_ascii=False, sort_keys=True)
+    fp.write("}\n")
+    return by_code
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    data_dir = Path(__file__).resolve().parents[1] / "data"
+    parser = argparse.ArgumentParser(description="Validate the content data files in one pass.")
+    parser.add_argument("--conjugations", default=str(data_dir / "conjugations.json"))
+    parser.add_argument("--por-para", default=str(data_dir / "por_para.json"))
+    parser.add_argument("--vocabulary", default=str(data_dir / "vocabulary.json"))
+    parser.add_argument("--report", help="write the JSON report here ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    severities: Counter = Counter()
+
+    def counted(issues: Iterable[Issue]) -> Iterator[Issue]:
+        for issue in issues:
+            severities[issue.severity] += 1
+            yield issue
+
+    issues = counted(validate_content(args.conjugations, args.por_para, args.vocabulary))
+    if args.report == "-":
+        counts = write_report(issues, sys.stdout)
+    elif args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            counts = write_report(issues, f)
+    else:
+        counts = Counter(issue.code for issue in issues)
+
+    if args.report != "-":
+        total = sum(counts.values())
+        print(f"{total} issues" + (":" if total else ""))
+        for code, count in counts.most_common():
+            print(f"  {code}: {count}")
+    # Non-zero so CI and pre-commit hooks fail on broken content
+    return 1 if severities[ERROR] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
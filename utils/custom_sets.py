@@ -0,0 +1,211 @@
+"""
+User-defined vocab sets as views over the loaded vocabulary.
+
+A custom set is stored as a list of entry ids (`set_key:position`, as the
+search API returns them), a search query optionally limited to some sets, or
+both. Resolved against a content snapshot it becomes a CustomSetView: a
+Sequence of (set_key, position) references into the shared vocab sets. No
+entry is copied, and the quiz samples a view exactly like a built-in set.
+
+Definitions live in a small JSON file next to the persisted settings and
+take effect without a restart. Entry ids are positional: they are checked
+against the current set sizes, not against the entries they once named.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import weakref
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+from uuid import uuid4
+
+from utils.vocab_search import VocabSearchIndex, fold_search, parse_entry_id
+
+# Custom set keys share the vocab_sets form field with built-in keys
+CUSTOM_SET_PREFIX = "custom:"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Snapshots (the shared one plus class snapshots) whose views are kept
+MAX_CACHED_SNAPSHOTS = 64
+
+
+def custom_set_key(name: str) -> str:
+    """'Examen (DELE)' -> 'custom:examen_dele'."""
+    return CUSTOM_SET_PREFIX + _SLUG_RE.sub("_", fold_search(name)).strip("_")
+
+
+@dataclass(frozen=True)
+class CustomSet:
+    key: str
+    name: str
+    ids: tuple[str, ...] = ()
+    query: str = ""
+    # Sets the query is limited to; empty means every set
+    sets: tuple[str, ...] = ()
+
+    @classmethod
+    def from_json(cls, data: Any, key: Optional[str] = None) -> "CustomSet":
+        """Validate one definition; raises ValueError with the reason."""
+        if not isinstance(data, dict):
+            raise ValueError("custom set must be an object")
+        name = data.get("name")
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("custom set needs a name")
+        ids, query, sets = data.get("ids", []), data.get("query", ""), data.get("sets", [])
+        if not isinstance(ids, list) or not all(isinstance(i, str) and parse_entry_id(i) for i in ids):
+            raise ValueError("ids must be a list of 'set_key:position' strings")
+        if not isinstance(query, str):
+            raise ValueError("query must be a string")
+        if not isinstance(sets, list) or not all(isinstance(s, str) for s in sets):
+            raise ValueError("sets must be a list of set keys")
+        if not ids and not query.strip():
+            raise ValueError("custom set needs ids or a query")
+        key = key or custom_set_key(name)
+        if key == CUSTOM_SET_PREFIX or not key.startswith(CUSTOM_SET_PREFIX):
+            raise ValueError(f"invalid custom set key {key!r}")
+        return cls(key, name.strip(), tuple(dict.fromkeys(ids)), query.strip(), tuple(sets))
+
+    def to_json(self) -> dict:
+        return {"name": self.name, "ids": list(self.ids), "query": self.query, "sets": list(self.sets)}
+
+
+class CustomSetView(Sequence):
+    """Entries of a custom set, read through (set_key, position) references."""
+
+    __slots__ = ("_vocab_sets", "refs")
+
+    def __init__(self, vocab_sets: Mapping, refs: tuple[tuple[str, int], ...]) -> None:
+        self._vocab_sets = vocab_sets
+        self.refs = refs
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.refs)))]
+        set_key, position = self.refs[index]
+        return self._vocab_sets[set_key][position]
+
+    def origin(self, index: int) -> tuple[str, Sequence, int]:
+        """(set key, that set's entries, position) of entry `index`, from the mapping it was resolved against."""
+        set_key, position = self.refs[index]
+        return set_key, self._vocab_sets[set_key], position
+
+
+def resolve_custom_set(custom_set: CustomSet, vocab_sets: Mapping, search: VocabSearchIndex) -> CustomSetView:
+    refs: list[tuple[str, int]] = []
+    for value in custom_set.ids:
+        set_key, position = parse_entry_id(value)
+        if set_key in vocab_sets and position < len(vocab_sets[set_key]):
+            refs.append((set_key, position))
+    if custom_set.query:
+        refs.extend(search.refs(custom_set.query, custom_set.sets))
+    return CustomSetView(vocab_sets, tuple(dict.fromkeys(refs)))
+
+
+def load_custom_sets(path: str) -> dict[str, CustomSet]:
+    """Definitions by key; a missing or unreadable file means none, invalid entries are skipped."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(raw, dict):
+        return {}
+    custom_sets: dict[str, CustomSet] = {}
+    for key, data in raw.items():
+        try:
+            custom_sets[key] = CustomSet.from_json(data, key)
+        except ValueError:
+            continue
+    return custom_sets
+
+
+def save_custom_sets(path: str, custom_sets: Mapping[str, CustomSet]) -> None:
+    """Atomically replace the definitions file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    payload = {key: custom_set.to_json() for key, custom_set in sorted(custom_sets.items())}
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def _usable(custom_set: CustomSet, shadowed: frozenset[str]) -> bool:
+    # Entry ids are positions in the shared sets, which a class overlay can hide or replace
+    return not any(parse_entry_id(value)[0] in shadowed for value in custom_set.ids)
+
+
+class CustomSetStore:
+    """
+    The definitions file of one app plus its resolved views.
+
+    Views are resolved once per (content snapshot, definitions file version)
+    and reused until either changes. Snapshots are held weakly, so views of a
+    snapshot that was replaced (reload, import, class overlay change) are
+    dropped once nothing else uses it. Class snapshots (utils.tenants) are
+    separate snapshots: a custom set is resolved against the class's own
+    vocab sets and search, and left out where its entry ids point into a
+    shared set the class hides or replaces.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # id(snapshot) -> (weak reference to the snapshot, definitions file version, views)
+        self._cache: dict[int, tuple[weakref.ref, Optional[int], dict[str, tuple[CustomSet, CustomSetView]]]] = {}
+
+    def _version(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def put(self, custom_set: CustomSet) -> None:
+        with self._lock:
+            custom_sets = load_custom_sets(self.path)
+            custom_sets[custom_set.key] = custom_set
+            save_custom_sets(self.path, custom_sets)
+            self._cache.clear()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            custom_sets = load_custom_sets(self.path)
+            if custom_sets.pop(key, None) is None:
+                return False
+            save_custom_sets(self.path, custom_sets)
+            self._cache.clear()
+            return True
+
+    def views(self, snapshot) -> dict[str, tuple[CustomSet, CustomSetView]]:
+        """key -> (definition, view) for `snapshot`, in name order."""
+        version = self._version()
+        with self._lock:
+            cached = self._cache.get(id(snapshot))
+            if cached is not None and cached[0]() is snapshot and cached[1] == version:
+                return cached[2]
+            vocab_sets = snapshot.vocabulary_data.get("vocab_sets", {})
+            shadowed = getattr(vocab_sets, "shadowed", frozenset())
+            definitions = sorted(load_custom_sets(self.path).values(), key=lambda c: c.name.lower())
+            views = {
+                c.key: (c, resolve_custom_set(c, vocab_sets, snapshot.vocab_search))
+                for c in definitions
+                if _usable(c, shadowed)
+            }
+            # Views of collected snapshots and older definitions are dropped
+            self._cache = {
+                key: entry for key, entry in self._cache.items()
+                if entry[1] == version and entry[0]() is not None and entry[0]() is not snapshot
+            }
+            if len(self._cache) >= MAX_CACHED_SNAPSHOTS:
+                self._cache.clear()
+            self._cache[id(snapshot)] = (weakref.ref(snapshot), version, views)
+            return views
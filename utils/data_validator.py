@@ -1,19 +1,58 @@
 import json
 import os
 
-# Standard 6 persons in Spanish conjugation
-PERSONS = ['yo', 'tu', 'el/ella/usted', 'nosotros', 'vosotros', 'ellos/ellas/ustedes']
+from utils.conjugation_engine import ConjugationTable
+from utils.content_validator import (
+    PARA_CATEGORIES,
+    PERSONS,
+    POR_CATEGORIES,
+    format_issue,
+    iter_conjugation_issues,
+    iter_por_para_issues,
+    iter_vocabulary_issues,
+)
+
+
+def _print_first_issues(issues, title, limit):
+    """
+    Print the first `limit` issues and return the total count.
+
+    Issues are consumed lazily; only the ones that are shown get formatted.
+    """
+    shown = []
+    total = 0
+    for issue in issues:
+        total += 1
+        if total <= limit:
+            shown.append(format_issue(issue))
+    if total:
+        print(f"\n{title} found {total} issues:")
+        for message in shown:
+            print(f"  - {message}")
+        if total > limit:
+            print(f"  ... and {total - limit} more issues")
+    return total
 
 def load_and_validate_data(file_path):
     """
     Load JSON data and validate consistency.
     Ensures all verbs have all tenses, and all tenses have all 6 persons.
+
+    Rule-based files (a `verbs` map, see utils.conjugation_engine) are
+    complete by construction; their specs are checked while parsing and the
+    data is returned as {'conjugations_quiz': ConjugationTable}.
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Data file not found: {file_path}")
     
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
+
+    if 'verbs' in data:
+        table = ConjugationTable.from_json(data)
+        irregular = sum(1 for verb in table if table.spec(verb).overrides)
+        print(f"Data validation passed: {len(table)} verbs generated from rules ({irregular} with irregular forms)")
+        return {'conjugations_quiz': table}
     
     quiz_data = data.get('conjugations_quiz', {})
     
@@ -21,36 +60,19 @@ def load_and_validate_data(file_path):
         print("Warning: No conjugations_quiz data found")
         return data
     
-    # Collect all tenses from all verbs
-    all_tenses = set()
-    for verb_data in quiz_data.values():
-        all_tenses.update(verb_data.keys())
-    
     # Validate and fix consistency
-    issues_found = []
+    issues = iter_conjugation_issues(quiz_data, fix=True)
     fixed_count = 0
-    
-    for verb_name, verb_data in quiz_data.items():
-        # Ensure all tenses exist for this verb
-        for tense in all_tenses:
-            if tense not in verb_data:
-                verb_data[tense] = {}
-                issues_found.append(f"Missing tense '{tense}' for verb '{verb_name}'")
-            
-            # Ensure all persons exist for this tense
-            for person in PERSONS:
-                if person not in verb_data[tense]:
-                    verb_data[tense][person] = "[MISSING]"
-                    issues_found.append(f"Missing person '{person}' for verb '{verb_name}', tense '{tense}'")
-                    fixed_count += 1
-    
+
+    def count_fixes():
+        nonlocal fixed_count
+        for issue in issues:
+            if issue.code == "missing_person":
+                fixed_count += 1
+            yield issue
+
     # Report issues
-    if issues_found:
-        print(f"\nData validation found {len(issues_found)} issues:")
-        for issue in issues_found[:10]:  # Show first 10
-            print(f"  - {issue}")
-        if len(issues_found) > 10:
-            print(f"  ... and {len(issues_found) - 10} more issues")
+    if _print_first_issues(count_fixes(), "Data validation", 10):
         print(f"\nAuto-filled {fixed_count} missing conjugations with '[MISSING]' placeholder")
     else:
         print("Data validation passed: All verbs have all tenses with all 6 persons")
@@ -63,12 +85,6 @@ def load_and_validate_data(file_path):
     
     return data
 
-# Expected por and para categories
-POR_CATEGORIES = ['motivation_reason', 'duration', 'cost_price', 'location_movement', 
-                  'means_of_travel', 'means_of_communication', 'passive_voice_action']
-PARA_CATEGORIES = ['destination', 'goal', 'recipients', 'deadlines', 
-                   'expression_of_opinion', 'disparate_idea']
-
 def load_and_validate_por_para_data(file_path):
     """
     Load por/para JSON data and validate consistency.
@@ -87,51 +103,13 @@ def load_and_validate_por_para_data(file_path):
         print("Warning: Missing 'por' or 'para' keys in data")
         return data
     
-    issues_found = []
     fixed_count = 0
     
-    # Validate por categories
-    for category in POR_CATEGORIES:
-        if category not in por_data:
-            por_data[category] = []
-            issues_found.append(f"Missing por category '{category}'")
-        else:
-            sentences = por_data[category]
-            if len(sentences) < 10:
-                issues_found.append(f"Por category '{category}' has only {len(sentences)} sentences (minimum 10)")
-            
-            # Check for placeholder
-            for i, sentence in enumerate(sentences):
-                if '_____' not in sentence:
-                    issues_found.append(f"Por category '{category}', sentence {i+1} missing '_____' placeholder")
-                if not sentence.strip():
-                    issues_found.append(f"Por category '{category}', sentence {i+1} is empty")
-    
-    # Validate para categories
-    for category in PARA_CATEGORIES:
-        if category not in para_data:
-            para_data[category] = []
-            issues_found.append(f"Missing para category '{category}'")
-        else:
-            sentences = para_data[category]
-            if len(sentences) < 10:
-                issues_found.append(f"Para category '{category}' has only {len(sentences)} sentences (minimum 10)")
-            
-            # Check for placeholder
-            for i, sentence in enumerate(sentences):
-                if '_____' not in sentence:
-                    issues_found.append(f"Para category '{category}', sentence {i+1} missing '_____' placeholder")
-                if not sentence.strip():
-                    issues_found.append(f"Para category '{category}', sentence {i+1} is empty")
+    # Missing categories are added as empty lists in memory only
+    issues = iter_por_para_issues(data, fix=True)
     
     # Report issues
-    if issues_found:
-        print(f"\nPor/Para data validation found {len(issues_found)} issues:")
-        for issue in issues_found[:15]:  # Show first 15
-            print(f"  - {issue}")
-        if len(issues_found) > 15:
-            print(f"  ... and {len(issues_found) - 15} more issues")
-    else:
+    if not _print_first_issues(issues, "Por/Para data validation", 15):
         print("Por/Para data validation passed: All categories exist with at least 10 sentences containing '_____' placeholder")
     
     # Save fixed data back if there were fixes
@@ -160,50 +138,13 @@ def load_and_validate_vocabulary_data(file_path):
         print("Warning: No vocab_sets found in data")
         return data
     
-    issues_found = []
     fixed_count = 0
     
-    # Validate each vocab set
-    for set_name, vocab_list in vocab_sets.items():
-        if not isinstance(vocab_list, list):
-            issues_found.append(f"Vocab set '{set_name}' is not a list")
-            continue
-        
-        if len(vocab_list) < 10:
-            issues_found.append(f"Vocab set '{set_name}' has only {len(vocab_list)} entries (minimum 10)")
-        
-        # Track Spanish words to check for duplicates
-        spanish_words = set()
-        
-        for i, entry in enumerate(vocab_list):
-            if not isinstance(entry, dict):
-                issues_found.append(f"Vocab set '{set_name}', entry {i+1} is not a dictionary")
-                continue
-            
-            # Check for required keys
-            required_keys = ['spanish', 'german', 'english']
-            for key in required_keys:
-                if key not in entry:
-                    issues_found.append(f"Vocab set '{set_name}', entry {i+1} missing '{key}' key")
-                elif not entry[key] or not str(entry[key]).strip():
-                    issues_found.append(f"Vocab set '{set_name}', entry {i+1} has empty '{key}' value")
-            
-            # Check for duplicate Spanish words
-            if 'spanish' in entry:
-                spanish_word = entry['spanish'].strip().lower()
-                if spanish_word in spanish_words:
-                    issues_found.append(f"Vocab set '{set_name}', duplicate Spanish word: '{entry['spanish']}'")
-                else:
-                    spanish_words.add(spanish_word)
+    # Cross-set duplicates are left to `python -m utils.content_validator`
+    issues = iter_vocabulary_issues(vocab_sets, cross_set=False)
     
     # Report issues
-    if issues_found:
-        print(f"\nVocabulary data validation found {len(issues_found)} issues:")
-        for issue in issues_found[:15]:  # Show first 15
-            print(f"  - {issue}")
-        if len(issues_found) > 15:
-            print(f"  ... and {len(issues_found) - 15} more issues")
-    else:
+    if not _print_first_issues(issues, "Vocabulary data validation", 15):
         print("Vocabulary data validation passed: All vocab sets exist with valid entries containing spanish, german, and english translations")
     
     # Save fixed data back if there were fixes
@@ -0,0 +1,397 @@
+"""
+Single-pass tokenizer for the dialogue .tex files in ressources/dialogos.
+
+The source is split into a flat stream of tokens by one regex, and a small
+state machine walks that stream once, tracking brace depth and the current
+\\section. In the same pass it collects
+
+- metadata: the \\title and the '\\textbf{Key:} value' lines before the
+  first section (Tema, Nivel, ...)
+- dialogue turns: '\\textbf{Speaker:} text' paragraphs in the Diálogo section
+- vocabulary: '\\item \\textbf{SPANISH} - GERMAN' entries in the Vocabulario
+  section; items may span several lines and the Spanish term may contain
+  nested braces
+
+Tokens are kept coarse so the Python loop sees few of them: prose, line
+breaks and formatting commands with a simple argument (\\textit{...},
+\\enquote{...}) stay inside one TEXT token, and the commands the parser
+acts on come with their argument when it has no nested braces. Anything
+else falls back to CONTROL/OPEN/CLOSE tokens.
+
+Vocabulary values are kept as LaTeX source (as the previous line-based
+extractor did); titles, metadata and turns are reduced to plain text.
+
+The input is either one string or an iterable of lines (e.g. an open file),
+so large files can be parsed without reading them into memory first.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+VOCAB_SECTION = "vocabulario"
+DIALOGUE_SECTION = "dialogo"
+
+_HEADING = r"(?:part|chapter|(?:sub)*section|(?:sub)?paragraph)"
+_STRUCTURAL = rf"(?:item|textbf|{_HEADING}|title|begin|end)(?![A-Za-z@])"
+
+_TOKEN_RE = re.compile(
+    r"(?P<COMMENT>%[^\n]*)"
+    r"|(?P<PARAGRAPH>\n(?:[ \t]*\r?\n)+)"
+    # \textbf{...}, \section*{...}, \title{...}, \begin{...} without nested braces
+    rf"|(?P<COMMAND_ARG>\\(?:textbf|{_HEADING}\*?|title|begin|end)\{{[^{{}}\\%]*\}})"
+    r"|(?P<ITEM>\\item(?![A-Za-z@])[ \t]*)"
+    r"|(?P<TEXT>(?:"
+    r"[^\\{}%\n]+"
+    rf"|\\(?!{_STRUCTURAL})[A-Za-z@]+\*?(?:\{{[^{{}}\\%\n]*\}})?"  # other commands, simple argument
+    r"|\\[^A-Za-z@\\\n]"  # escaped characters: \% \{ \&
+    r"|\n(?![ \t]*\r?\n)"
+    r")+)"
+    r"|(?P<CONTROL>\\(?:[A-Za-z@]+\*?|\\|\n))"
+    r"|(?P<OPEN>\{)"
+    r"|(?P<CLOSE>\})"
+)
+# Where skipping through a section the parser does not collect has to stop
+_SKIP_STOP_RE = re.compile(r"%|\\section(?![A-Za-z@])|\\end\{document\}")
+_ITEM_SEPARATOR_RE = re.compile(r"\s+-\s+(?P<german>.+?)\s*$", re.DOTALL)
+_LINE_JOIN_RE = re.compile(r"[ \t]*\r?\n[ \t]*")
+_PLAIN_RE = re.compile(r"\\[A-Za-z@]+\*?\s*|[{}]")
+_ESCAPED_RE = re.compile(r"\\([%&$#_])")
+# Headings below \section end the open blocks but keep the current section
+_SUBHEADINGS = frozenset(
+    f"\\{name}{star}"
+    for name in ("part", "chapter", "subsection", "subsubsection", "paragraph", "subparagraph")
+    for star in ("", "*")
+)
+
+
+@dataclass(frozen=True)
+class VocabItem:
+    spanish: str
+    german: str
+
+
+@dataclass(frozen=True)
+class DialogueTurn:
+    speaker: str
+    text: str
+
+
+@dataclass(frozen=True)
+class DialogueDocument:
+    title: str = ""
+    metadata: dict[str, str] = field(default_factory=dict)
+    turns: tuple[DialogueTurn, ...] = ()
+    vocabulary: tuple[VocabItem, ...] = ()
+
+
+def iter_tex_tokens(source: Union[str, Iterable[str]]) -> Iterator[tuple[str, str]]:
+    """
+    (kind, text) tokens; kind is one of COMMENT, PARAGRAPH, COMMAND_ARG,
+    ITEM, TEXT, CONTROL, OPEN, CLOSE.
+    """
+    if isinstance(source, str):
+        for m in _TOKEN_RE.finditer(source):
+            yield m.lastgroup, m.group()
+        return
+    for line in source:
+        # A blank line can't be matched across chunks; it is a paragraph break
+        if line.isspace():
+            yield "PARAGRAPH", line
+            continue
+        for m in _TOKEN_RE.finditer(line):
+            yield m.lastgroup, m.group()
+
+
+def plain_text(latex: str) -> str:
+    """Drops control words and braces and collapses whitespace: '\\textbf{A:} b \\\\' -> 'A: b'."""
+    if "\\" not in latex and "{" not in latex and "~" not in latex:
+        return " ".join(latex.split())
+    text = _PLAIN_RE.sub("", latex.replace("\\\\", " ").replace("~", " "))
+    if "\\" in text:
+        text = _ESCAPED_RE.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _fold(name: str) -> str:
+    decomposed = unicodedata.normalize("NFD", plain_text(name).lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+class _Capture:
+    """Tokens of one open brace group, e.g. the argument of \\textbf{...{...}}."""
+
+    __slots__ = ("command", "depth", "parts")
+
+    def __init__(self, command: str, depth: int) -> None:
+        self.command = command
+        self.depth = depth
+        self.parts: list[str] = []
+
+
+class _DialogueParser:
+    def __init__(self) -> None:
+        self.title = ""
+        self.metadata: dict[str, str] = {}
+        self.turns: list[DialogueTurn] = []
+        self.vocabulary: list[VocabItem] = []
+
+        self.depth = 0
+        self.section: Optional[str] = None
+        self.done = False
+
+        self.pending: Optional[str] = None  # command waiting for its {argument}
+        self.captures: list[_Capture] = []
+
+        # Open item / turn / metadata value and the tokens collected for it
+        self.item_spanish: Optional[str] = None
+        self.item_expect_term = False
+        self.item_depth = 0
+        self.item_parts: Optional[list[str]] = None
+        self.turn: Optional[tuple[str, list[str]]] = None
+        self.meta: Optional[tuple[str, list[str]]] = None
+        # Lengths of the open turn/meta parts when the last top-level \textbf
+        # started, so a new label does not end up in the previous block
+        self.bold_mark = (0, 0)
+
+    # Open blocks end at a blank line, a new block of the same kind or any
+    # heading; an item also ends at \begin or \end of an environment
+
+    def _end_item(self) -> None:
+        if self.item_spanish is not None and self.item_parts is not None:
+            m = _ITEM_SEPARATOR_RE.match("".join(self.item_parts))
+            spanish = self.item_spanish.strip()
+            if m and spanish:
+                german = _LINE_JOIN_RE.sub(" ", m.group("german"))
+                self.vocabulary.append(VocabItem(spanish=spanish, german=german))
+        self.item_spanish = None
+        self.item_parts = None
+        self.item_expect_term = False
+
+    def _end_turn(self) -> None:
+        if self.turn is not None:
+            speaker, parts = self.turn
+            text = plain_text("".join(parts))
+            if text:
+                self.turns.append(DialogueTurn(speaker=speaker, text=text))
+        self.turn = None
+
+    def _end_meta(self) -> None:
+        if self.meta is not None:
+            key, parts = self.meta
+            self.metadata[key] = plain_text("".join(parts))
+        self.meta = None
+
+    def _end_blocks(self) -> None:
+        self._end_item()
+        self._end_turn()
+        self._end_meta()
+
+    def _append(self, tok: str) -> None:
+        for capture in self.captures:
+            capture.parts.append(tok)
+        if self.item_parts is not None:
+            self.item_parts.append(tok)
+        if self.turn is not None:
+            self.turn[1].append(tok)
+        if self.meta is not None:
+            self.meta[1].append(tok)
+
+    def _mark_bold(self) -> None:
+        self.bold_mark = (
+            len(self.turn[1]) if self.turn is not None else 0,
+            len(self.meta[1]) if self.meta is not None else 0,
+        )
+
+    def _argument(self, command: str, raw: str, outer_depth: int) -> None:
+        if command in ("\\section", "\\section*"):
+            self._end_blocks()
+            self.section = _fold(raw)
+        elif command in _SUBHEADINGS:
+            self._end_blocks()
+        elif command == "\\title":
+            self.title = plain_text(raw)
+        elif command == "\\begin":
+            self._end_item()
+        elif command == "\\end":
+            if raw.strip() == "document":
+                self._end_blocks()
+                self.done = True
+            else:
+                self._end_item()
+        elif command == "\\textbf":
+            if self.item_expect_term and outer_depth == self.item_depth:
+                self.item_spanish = raw
+                self.item_parts = []
+                self.item_expect_term = False
+                return
+            label = plain_text(raw)
+            if outer_depth != 0 or not label.endswith(":"):
+                return
+            if self.section == DIALOGUE_SECTION:
+                if self.turn is not None:
+                    del self.turn[1][self.bold_mark[0]:]
+                self._end_turn()
+                self.turn = (label[:-1].strip(), [])
+            elif self.section is None:
+                if self.meta is not None:
+                    del self.meta[1][self.bold_mark[1]:]
+                self._end_meta()
+                self.meta = (label[:-1].strip(), [])
+
+    def feed(self, kind: str, tok: str) -> None:
+        if kind == "TEXT":
+            if not tok.isspace():
+                self.pending = None
+                if self.item_expect_term and not self.captures:
+                    self.item_expect_term = False
+            self._append(tok)
+            return
+
+        if kind == "COMMAND_ARG":
+            self.pending = None
+            brace = tok.index("{")
+            command = tok[:brace]
+            if self.item_expect_term and not self.captures and command != "\\textbf":
+                self.item_expect_term = False
+            # Headings, \begin and \end close blocks, so they are not collected
+            if command == "\\textbf":
+                if self.depth == 0:
+                    self._mark_bold()
+                self._append(tok)
+            self._argument(command, tok[brace + 1:-1], self.depth)
+            return
+
+        if kind == "ITEM":
+            self.pending = None
+            if self.section == VOCAB_SECTION and not self.captures:
+                self._end_item()
+                self.item_expect_term = True
+                self.item_depth = self.depth
+            else:
+                self._append(tok)
+            return
+
+        if kind == "PARAGRAPH":
+            self.pending = None
+            self._end_blocks()
+            for capture in self.captures:
+                capture.parts.append(" ")
+            return
+
+        if kind == "COMMENT":
+            return
+
+        if kind == "OPEN":
+            self.depth += 1
+            self._append(tok)
+            if self.pending is not None:
+                self.captures.append(_Capture(self.pending, self.depth))
+                self.pending = None
+            return
+
+        self.pending = None
+        if self.item_expect_term and not self.captures and tok != "\\textbf":
+            self.item_expect_term = False
+
+        if kind == "CLOSE":
+            if self.captures and self.captures[-1].depth == self.depth:
+                capture = self.captures.pop()
+                self.depth -= 1
+                self._append(tok)
+                self._argument(capture.command, "".join(capture.parts), self.depth)
+                return
+            self.depth = max(0, self.depth - 1)
+            self._append(tok)
+            return
+
+        # CONTROL: a command the parser acts on whose argument has nested
+        # braces, or a \\ line break
+        if tok == "\\\\" and self.meta is not None and not self.captures:
+            self._end_meta()
+            return
+        if tok in _SUBHEADINGS:
+            self._end_blocks()
+        elif tok in ("\\section", "\\section*", "\\begin", "\\end"):
+            self._end_item()
+        if tok == "\\textbf" and self.depth == 0:
+            self._mark_bold()
+        if tok in ("\\section", "\\section*", "\\title", "\\textbf", "\\end"):
+            self.pending = tok
+        self._append(tok)
+
+    def can_skip(self) -> bool:
+        """True inside a section that is not collected (exercises, verb tables...)."""
+        return (
+            self.section is not None
+            and self.section != VOCAB_SECTION
+            and self.section != DIALOGUE_SECTION
+            and self.pending is None
+            and not self.captures
+        )
+
+    def skip(self, text: str, start: int, end: int) -> None:
+        """Account for the braces in text[start:end] without tokenizing it."""
+        opened = text.count("{", start, end) - text.count("\\{", start, end)
+        closed = text.count("}", start, end) - text.count("\\}", start, end)
+        self.depth = max(0, self.depth + opened - closed)
+
+    def document(self) -> DialogueDocument:
+        self._end_blocks()
+        return DialogueDocument(
+            title=self.title,
+            metadata=self.metadata,
+            turns=tuple(self.turns),
+            vocabulary=tuple(self.vocabulary),
+        )
+
+
+def parse_dialogue_tex(source: Union[str, Iterable[str]]) -> DialogueDocument:
+    """
+    Parse a dialogue document from a string or an iterable of lines, in one pass.
+
+    Sections that are not collected are not tokenized: the scan jumps to the
+    next \\section (counting braces on the way), so they cost one C-level
+    search instead of a Python step per token.
+    """
+    parser = _DialogueParser()
+    feed = parser.feed
+
+    if isinstance(source, str):
+        match = _TOKEN_RE.match
+        pos, end = 0, len(source)
+        check_skip = False  # only sections (and comments while skipping) change it
+        while pos < end and not parser.done:
+            if check_skip and parser.can_skip():
+                stop = _SKIP_STOP_RE.search(source, pos)
+                stop_pos = stop.start() if stop else end
+                parser.skip(source, pos, stop_pos)
+                pos = stop_pos
+                if pos >= end:
+                    break
+            m = match(source, pos)
+            if m is None:  # a lone backslash at the very end
+                break
+            kind = m.lastgroup
+            feed(kind, m.group())
+            check_skip = kind == "COMMAND_ARG" or kind == "CLOSE" or kind == "COMMENT"
+            pos = m.end()
+        return parser.document()
+
+    for line in source:
+        if parser.can_skip() and not _SKIP_STOP_RE.search(line):
+            parser.skip(line, 0, len(line))
+            continue
+        for kind, tok in iter_tex_tokens((line,)):
+            feed(kind, tok)
+        if parser.done:
+            break
+    return parser.document()
+
+
+def parse_dialogue_file(path: Path) -> DialogueDocument:
+    with path.open("r", encoding="utf-8") as f:
+        return parse_dialogue_tex(f)
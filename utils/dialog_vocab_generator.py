@@ -1,21 +1,18 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
 import os
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
-
-
-@dataclass(frozen=True)
-class VocabItem:
-    spanish: str
-    german: str
+from typing import Iterable, Optional
+from uuid import uuid4
 
+from utils.dialog_tex import VocabItem, parse_dialogue_tex
 
 _DIALOGUE_TEX_RE = re.compile(r"^(?P<num>\d{2})_(?P<slug>.+)\.tex$")
-_VOCAB_ITEM_RE = re.compile(r"\\item\s+\\textbf\{(?P<spanish>[^}]+)\}\s+-\s+(?P<german>.+?)\s*$")
 
 
 def discover_dialogue_tex_files(dialogos_dir: Path) -> list[Path]:
@@ -66,34 +63,10 @@ def normalize_spanish_term(term: str) -> str:
 def extract_vocabulario_items(tex_content: str) -> list[VocabItem]:
     """
     Extract vocab items from the '\\section*{Vocabulario}' block.
-    Only considers '\\item \\textbf{SPANISH} - GERMAN' entries.
+    Only considers '\\item \\textbf{SPANISH} - GERMAN' entries, which may
+    span lines; see utils.dialog_tex for the tokenizer.
     """
-    start_idx = tex_content.find(r"\section*{Vocabulario}")
-    if start_idx < 0:
-        return []
-
-    rest = tex_content[start_idx:]
-    # Find end at next \section*{...} after Vocabulario, or \end{document}
-    end_candidates: list[int] = []
-    next_section = rest.find(r"\section*{", len(r"\section*{Vocabulario}"))
-    if next_section >= 0:
-        end_candidates.append(next_section)
-    end_doc = rest.find(r"\end{document}")
-    if end_doc >= 0:
-        end_candidates.append(end_doc)
-    end_idx = min(end_candidates) if end_candidates else len(rest)
-    block = rest[:end_idx]
-
-    items: list[VocabItem] = []
-    for line in block.splitlines():
-        m = _VOCAB_ITEM_RE.search(line)
-        if not m:
-            continue
-        spanish = m.group("spanish").strip()
-        german = m.group("german").strip()
-        if spanish and german:
-            items.append(VocabItem(spanish=spanish, german=german))
-    return items
+    return list(parse_dialogue_tex(tex_content).vocabulary)
 
 
 def load_vocabulary_json(path: Path) -> dict:
@@ -153,50 +126,206 @@ DEFAULT_BASIC_STOPLIST = {
 }
 
 
+# (spanish, german, normalized spanish) for one \item, as extracted
+ExtractedRow = tuple[str, str, str]
+
+
+def extract_dialogue_rows(tex_content: str) -> list[ExtractedRow]:
+    return [
+        (item.spanish, item.german, normalize_spanish_term(item.spanish))
+        for item in extract_vocabulario_items(tex_content)
+    ]
+
+
+def extract_dialogue_file(tex_path: Path) -> tuple[str, list[ExtractedRow]]:
+    """
+    Reads one dialogue once and returns its SHA-256 and extracted rows.
+    Module-level so it can run in a worker process.
+    """
+    raw = tex_path.read_bytes()
+    return hashlib.sha256(raw).hexdigest(), extract_dialogue_rows(raw.decode("utf-8"))
+
+
+def _extract_files(tex_paths: list[Path], jobs: int = 1) -> list[tuple[str, list[ExtractedRow]]]:
+    """extract_dialogue_file over `tex_paths`, results in input order whatever `jobs` is."""
+    if jobs <= 1 or len(tex_paths) < 2:
+        return [extract_dialogue_file(p) for p in tex_paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = min(jobs, len(tex_paths))
+    chunksize = max(1, len(tex_paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(extract_dialogue_file, tex_paths, chunksize=chunksize))
+
+
+def build_dialogue_entries(
+    rows: Iterable[ExtractedRow],
+    existing_idx: dict[str, dict],
+    basic_norm: set[str],
+    english_todo_placeholder: str = "[TODO]",
+) -> list[dict]:
+    """
+    Turns extracted rows into vocab entries: drops stoplisted and repeated
+    terms and takes the English translation from existing entries if known.
+    """
+    seen: set[str] = set()
+    entries: list[dict] = []
+    for spanish, german, norm in rows:
+        if not norm or norm in basic_norm:
+            continue
+        if norm in seen:
+            continue
+        seen.add(norm)
+
+        existing = existing_idx.get(norm)
+        english = None
+        if isinstance(existing, dict):
+            eng = existing.get("english")
+            if isinstance(eng, str) and eng.strip():
+                english = eng.strip()
+
+        entries.append(
+            {
+                "spanish": spanish.strip(),
+                "german": german.strip(),
+                "english": english or english_todo_placeholder,
+            }
+        )
+    return entries
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DialogueBuildCache:
+    """
+    On-disk cache for dialogue vocab generation.
+
+    Extracted rows are stored per .tex file and keyed by the file's SHA-256,
+    so only new or edited dialogues are parsed again. The size and mtime are
+    kept as well, which lets unchanged files skip hashing entirely.
+
+    `state` fingerprints a whole run: the hashes of all dialogues, the
+    generator options and the hash of vocabulary.json as it was last written
+    (the vocab index version). When it matches, the output would be identical
+    to what is already on disk and nothing needs to be loaded.
+    """
+
+    VERSION = 3
+
+    def __init__(self, path: Path, files: Optional[dict] = None, state: str = "") -> None:
+        self.path = path
+        self.files: dict[str, dict] = files or {}
+        self.state = state
+        self.extracted = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "DialogueBuildCache":
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return cls(path)
+        if not isinstance(raw, dict) or raw.get("version") != cls.VERSION:
+            return cls(path)
+        files = raw.get("files")
+        return cls(path, files if isinstance(files, dict) else {}, str(raw.get("state", "")))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{uuid4().hex}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "state": self.state, "files": self.files}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def file_hash(self, tex_path: Path) -> str:
+        st = tex_path.stat()
+        row = self.files.get(tex_path.name)
+        if row and row.get("size") == st.st_size and row.get("mtime_ns") == st.st_mtime_ns:
+            return row["sha256"]
+        return _sha256_file(tex_path)
+
+    def rows_for(self, tex_path: Path) -> Optional[list[ExtractedRow]]:
+        """Cached rows if the file is unchanged, else None."""
+        row = self.files.get(tex_path.name)
+        if not row or row.get("sha256") != self.file_hash(tex_path):
+            return None
+        st = tex_path.stat()
+        row["size"], row["mtime_ns"] = st.st_size, st.st_mtime_ns
+        return [tuple(r) for r in row["rows"]]
+
+    def store(self, tex_path: Path, sha256: str, rows: list[ExtractedRow]) -> None:
+        st = tex_path.stat()
+        self.files[tex_path.name] = {
+            "sha256": sha256,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "rows": [list(r) for r in rows],
+        }
+        self.extracted += 1
+
+    def prune(self, tex_paths: Iterable[Path]) -> None:
+        names = {p.name for p in tex_paths}
+        for name in [n for n in self.files if n not in names]:
+            del self.files[name]
+
+    def run_state(self, tex_paths: Iterable[Path], vocabulary_sha256: str, options: list) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps([vocabulary_sha256, options], ensure_ascii=False).encode("utf-8"))
+        for tex_path in tex_paths:
+            h.update(f"\0{tex_path.name}\0{self.file_hash(tex_path)}".encode("utf-8"))
+        return h.hexdigest()
+
+
+def extract_dialogues(
+    tex_paths: list[Path], *, cache: Optional[DialogueBuildCache] = None, jobs: int = 1
+) -> list[list[ExtractedRow]]:
+    """
+    Extracted rows per dialogue, in the order of `tex_paths`.
+
+    Files not served by the cache are extracted with `jobs` worker processes;
+    results are merged back in input order, so the output does not depend on
+    `jobs`.
+    """
+    if cache is None:
+        return [rows for _sha, rows in _extract_files(tex_paths, jobs)]
+
+    results: list[Optional[list[ExtractedRow]]] = [cache.rows_for(p) for p in tex_paths]
+    pending = [i for i, rows in enumerate(results) if rows is None]
+    for i, (sha, rows) in zip(pending, _extract_files([tex_paths[i] for i in pending], jobs)):
+        cache.store(tex_paths[i], sha, rows)
+        results[i] = rows
+    return results
+
+
 def generate_dialogue_vocab_sets(
     dialogos_dir: Path,
     vocabulary_json_path: Path,
     *,
     english_todo_placeholder: str = "[TODO]",
     basic_stoplist: Iterable[str] = DEFAULT_BASIC_STOPLIST,
+    vocabulary_data: Optional[dict] = None,
+    cache: Optional[DialogueBuildCache] = None,
+    jobs: int = 1,
 ) -> dict[str, list[dict]]:
     basic_norm = {normalize_spanish_term(x) for x in basic_stoplist}
 
-    vocabulary_data = load_vocabulary_json(vocabulary_json_path)
+    if vocabulary_data is None:
+        vocabulary_data = load_vocabulary_json(vocabulary_json_path)
     existing_idx = build_existing_vocab_index(vocabulary_data)
 
+    tex_paths = discover_dialogue_tex_files(dialogos_dir)
     result: dict[str, list[dict]] = {}
-    for tex_path in discover_dialogue_tex_files(dialogos_dir):
+    for tex_path, rows in zip(tex_paths, extract_dialogues(tex_paths, cache=cache, jobs=jobs)):
         set_key = dialogue_set_key_from_path(tex_path)
-        tex_content = tex_path.read_text(encoding="utf-8")
-        vocab_items = extract_vocabulario_items(tex_content)
-
-        seen: set[str] = set()
-        entries: list[dict] = []
-        for item in vocab_items:
-            norm = normalize_spanish_term(item.spanish)
-            if not norm or norm in basic_norm:
-                continue
-            if norm in seen:
-                continue
-            seen.add(norm)
-
-            existing = existing_idx.get(norm)
-            english = None
-            if isinstance(existing, dict):
-                eng = existing.get("english")
-                if isinstance(eng, str) and eng.strip():
-                    english = eng.strip()
-
-            entries.append(
-                {
-                    "spanish": item.spanish.strip(),
-                    "german": item.german.strip(),
-                    "english": english or english_todo_placeholder,
-                }
-            )
-
-        result[set_key] = entries
+        result[set_key] = build_dialogue_entries(rows, existing_idx, basic_norm, english_todo_placeholder)
 
     return result
 
@@ -215,23 +344,269 @@ def merge_dialogue_sets_into_vocabulary_json(
     return vocabulary_data
 
 
-def write_vocabulary_json(path: Path, vocabulary_data: dict) -> None:
+@dataclass(frozen=True)
+class SetChange:
+    """How one vocab set differs between two versions of vocabulary.json."""
+
+    set_key: str
+    status: str  # "added", "removed" or "changed"
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    count: int = 0  # entries in the new version
+
+    def summary(self) -> str:
+        if self.status == "added":
+            return f"{self.set_key}: new set, {self.count} entries"
+        if self.status == "removed":
+            return f"{self.set_key}: removed"
+        if not (self.added or self.removed or self.modified):
+            return f"{self.set_key}: reordered"
+        return f"{self.set_key}: +{self.added} -{self.removed} ~{self.modified} ({self.count} entries)"
+
+
+def _entries_by_term(entries) -> dict[str, object]:
+    by_term: dict[str, object] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        spanish = entry.get("spanish") if isinstance(entry, dict) else None
+        by_term[normalize_spanish_term(spanish) if isinstance(spanish, str) else repr(entry)] = entry
+    return by_term
+
+
+def diff_vocab_sets(old_sets: dict, new_sets: dict) -> list[SetChange]:
+    """Per-set changes from `old_sets` to `new_sets`; entries are matched by normalized Spanish term."""
+    changes: list[SetChange] = []
+    for set_key, entries in new_sets.items():
+        count = len(entries) if isinstance(entries, list) else 0
+        if set_key not in old_sets:
+            changes.append(SetChange(set_key, "added", added=count, count=count))
+            continue
+        if old_sets[set_key] == entries:
+            continue
+        old_terms = _entries_by_term(old_sets[set_key])
+        new_terms = _entries_by_term(entries)
+        changes.append(
+            SetChange(
+                set_key,
+                "changed",
+                added=sum(1 for t in new_terms if t not in old_terms),
+                removed=sum(1 for t in old_terms if t not in new_terms),
+                modified=sum(1 for t, e in new_terms.items() if t in old_terms and old_terms[t] != e),
+                count=count,
+            )
+        )
+    for set_key, entries in old_sets.items():
+        if set_key not in new_sets:
+            changes.append(SetChange(set_key, "removed", removed=len(entries) if isinstance(entries, list) else 0))
+    return changes
+
+
+_JSON_WS_RE = re.compile(r"\s*")
+
+
+def _vocab_set_spans(text: str) -> Optional[dict[str, tuple[int, int]]]:
+    """
+    Source offsets of each set's value inside "vocab_sets", or None if the
+    text is not laid out as expected.
+    """
+    decoder = json.JSONDecoder()
+    try:
+        i = _JSON_WS_RE.match(text, 0).end()
+        if text[i] != "{":
+            return None
+        i = _JSON_WS_RE.match(text, i + 1).end()
+        while text[i] != "}":
+            key, i = decoder.raw_decode(text, i)
+            i = _JSON_WS_RE.match(text, i).end()
+            if text[i] != ":":
+                return None
+            i = _JSON_WS_RE.match(text, i + 1).end()
+            if key == "vocab_sets" and text[i] == "{":
+                spans: dict[str, tuple[int, int]] = {}
+                i = _JSON_WS_RE.match(text, i + 1).end()
+                while text[i] != "}":
+                    set_key, i = decoder.raw_decode(text, i)
+                    i = _JSON_WS_RE.match(text, i).end()
+                    if text[i] != ":":
+                        return None
+                    start = _JSON_WS_RE.match(text, i + 1).end()
+                    _value, i = decoder.raw_decode(text, start)
+                    spans[set_key] = (start, i)
+                    i = _JSON_WS_RE.match(text, i).end()
+                    if text[i] == ",":
+                        i = _JSON_WS_RE.match(text, i + 1).end()
+                return spans
+            _value, i = decoder.raw_decode(text, i)
+            i = _JSON_WS_RE.match(text, i).end()
+            if text[i] == ",":
+                i = _JSON_WS_RE.match(text, i + 1).end()
+    except (IndexError, ValueError):
+        return None
+    return None
+
+
+def _dump_set(entries: list) -> str:
+    # Same layout json.dump(indent=2) gives a set nested in {"vocab_sets": {...}}
+    return json.dumps(entries, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+
+
+def _splice_sets(text: str, new_sets: dict, changes: list[SetChange]) -> Optional[str]:
+    """
+    Rewrites only the changed sets in `text`, leaving every other byte as
+    it is (hand-formatted sets stay hand-formatted). None if that is not
+    possible, e.g. when sets were removed.
+    """
+    if any(c.status == "removed" for c in changes):
+        return None
+    spans = _vocab_set_spans(text)
+    if not spans:
+        return None
+
+    pieces: list[str] = []
+    pos = 0
+    for set_key, (start, end) in sorted(spans.items(), key=lambda kv: kv[1][0]):
+        if any(c.set_key == set_key for c in changes):
+            pieces += [text[pos:start], _dump_set(new_sets[set_key])]
+            pos = end
+    last_end = max(end for _start, end in spans.values())
+    pieces.append(text[pos:last_end])
+    for change in changes:
+        if change.status == "added":
+            key = json.dumps(change.set_key, ensure_ascii=False)
+            pieces.append(f",\n    {key}: {_dump_set(new_sets[change.set_key])}")
+    pieces.append(text[last_end:])
+    return "".join(pieces)
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(vocabulary_data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def write_vocabulary_json(
+    path: Path, vocabulary_data: dict, *, previous_text: Optional[str] = None
+) -> list[SetChange]:
+    """
+    Writes `vocabulary_data` to `path` if any set differs from what is on
+    disk, and returns the per-set changes ([] means the file was left alone).
 
+    The file is replaced atomically (temp file, fsync, os.replace), so a
+    server reloading content never sees a half-written file. Unchanged sets
+    keep their exact formatting. `previous_text` is the current file content
+    if the caller has already read it.
+    """
+    if previous_text is None and path.exists():
+        previous_text = path.read_text(encoding="utf-8")
+    previous = json.loads(previous_text) if previous_text else {}
+
+    old_sets = previous.get("vocab_sets") if isinstance(previous.get("vocab_sets"), dict) else {}
+    new_sets = vocabulary_data.get("vocab_sets") if isinstance(vocabulary_data.get("vocab_sets"), dict) else {}
+    changes = diff_vocab_sets(old_sets, new_sets)
+    other_keys_changed = {k: v for k, v in previous.items() if k != "vocab_sets"} != {
+        k: v for k, v in vocabulary_data.items() if k != "vocab_sets"
+    }
+    if not changes and not other_keys_changed and previous_text is not None:
+        return []
 
-def main() -> int:
-    repo_root = Path(__file__).resolve().parents[1]
-    dialogos_dir = repo_root / "ressources" / "dialogos"
-    vocab_path = repo_root / "data" / "vocabulary.json"
+    text = None
+    if previous_text and not other_keys_changed:
+        text = _splice_sets(previous_text, new_sets, changes)
+    if text is None:
+        text = json.dumps(vocabulary_data, indent=2, ensure_ascii=False) + "\n"
+    _atomic_write_text(path, text)
+    return changes
 
-    dialogue_sets = generate_dialogue_vocab_sets(dialogos_dir, vocab_path)
-    vocab_data = load_vocabulary_json(vocab_path)
-    merged = merge_dialogue_sets_into_vocabulary_json(vocab_data, dialogue_sets)
-    write_vocabulary_json(vocab_path, merged)
 
+def update_dialogue_vocab_sets(
+    dialogos_dir: Path,
+    vocabulary_json_path: Path,
+    *,
+    cache_path: Optional[Path] = None,
+    jobs: int = 1,
+    english_todo_placeholder: str = "[TODO]",
+    basic_stoplist: Iterable[str] = DEFAULT_BASIC_STOPLIST,
+) -> list[SetChange]:
+    """
+    Regenerates the dialogue sets in vocabulary.json and returns the sets
+    that changed. Only those sets are rewritten in the file; if none changed
+    it is not written at all.
+
+    With a cache_path, unchanged dialogues are not parsed again, and a run in
+    which neither the dialogues nor vocabulary.json changed returns before
+    loading anything. `jobs` > 1 extracts the remaining dialogues in that many
+    processes.
+    """
+    cache = DialogueBuildCache.load(cache_path) if cache_path else None
+    tex_paths = discover_dialogue_tex_files(dialogos_dir)
+    options = [english_todo_placeholder, sorted(basic_stoplist)]
+
+    if cache is not None:
+        state = cache.run_state(tex_paths, _sha256_file(vocabulary_json_path), options)
+        if state == cache.state:
+            return []
+
+    vocabulary_text = vocabulary_json_path.read_text(encoding="utf-8")
+    vocabulary_data = json.loads(vocabulary_text)
+    dialogue_sets = generate_dialogue_vocab_sets(
+        dialogos_dir,
+        vocabulary_json_path,
+        english_todo_placeholder=english_todo_placeholder,
+        basic_stoplist=basic_stoplist,
+        vocabulary_data=vocabulary_data,
+        cache=cache,
+        jobs=jobs,
+    )
+    changes = write_vocabulary_json(
+        vocabulary_json_path,
+        merge_dialogue_sets_into_vocabulary_json(vocabulary_data, dialogue_sets),
+        previous_text=vocabulary_text,
+    )
+    if changes and cache is not None:
+        # English translations come from the first occurrence of a term in the
+        # file, which the written sets now reproduce, so regenerating from the
+        # new file gives the same sets and its hash can mark the run as done.
+        state = cache.run_state(tex_paths, _sha256_file(vocabulary_json_path), options)
+
+    if cache is not None:
+        cache.prune(tex_paths)
+        cache.state = state
+        cache.save()
+    return changes
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    repo_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Generate dialog_* vocab sets from the dialogue .tex files.")
+    parser.add_argument("--dialogos-dir", type=Path, default=repo_root / "ressources" / "dialogos")
+    parser.add_argument("--vocabulary", type=Path, default=repo_root / "data" / "vocabulary.json")
+    parser.add_argument("--cache", type=Path, default=repo_root / ".cache" / "dialog_vocab.json")
+    parser.add_argument("--no-cache", action="store_true", help="re-extract every dialogue")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, help="worker processes for extraction (0 = one per CPU)"
+    )
+    args = parser.parse_args(argv)
+
+    changes = update_dialogue_vocab_sets(
+        args.dialogos_dir,
+        args.vocabulary,
+        cache_path=None if args.no_cache else args.cache,
+        jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+    )
+    if changes:
+        print(f"Updated {len(changes)} dialogue sets in {args.vocabulary}:")
+        for change in changes:
+            print(f"  {change.summary()}")
+    else:
+        print("Dialogue vocab sets are up to date")
     return 0
 
 
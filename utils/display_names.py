@@ -0,0 +1,39 @@
+"""
+Display names of the shipped vocab sets and por/para categories.
+
+Keys without an entry are shown title-cased ('motivation_reason' ->
+'Motivation Reason'). Kept out of app.py so the command-line tools can use
+them without importing Flask.
+"""
+
+VOCAB_SET_NAMES = {
+    'dele_b1_info': 'DELE B1 — Info Page',
+    'por_para': 'Por/Para Vocabulary',
+    'dialog_01_saludo_presentacion': 'Dialog 01 — Saludo y Presentación',
+    'dialog_05_hablar_del_tiempo': 'Dialog 05 — Hablar del Tiempo',
+    'dialog_09_decir_la_hora': 'Dialog 09 — Decir la Hora',
+    'dialog_13_describir_objetos': 'Dialog 13 — Describir Objetos',
+    'dialog_18_en_el_transporte_publico': 'Dialog 18 — En el Transporte Público',
+    'dialog_23_describir_el_lugar_donde_vives': 'Dialog 23 — Describir el Lugar donde Vives',
+    'dialog_33_hablar_de_salud_y_ejercicio': 'Dialog 33 — Hablar de Salud y Ejercicio',
+    'dialog_45_hablar_de_medio_ambiente': 'Dialog 45 — Hablar de Medio Ambiente',
+}
+
+POR_CATEGORY_NAMES = {
+    'motivation_reason': 'Motivation/Reason',
+    'duration': 'Duration',
+    'cost_price': 'Cost/Price',
+    'location_movement': 'Location/Movement',
+    'means_of_travel': 'Means of Travel',
+    'means_of_communication': 'Means of Communication',
+    'passive_voice_action': 'Passive Voice Action'
+}
+
+PARA_CATEGORY_NAMES = {
+    'destination': 'Destination',
+    'goal': 'Goal',
+    'recipients': 'Recipients',
+    'deadlines': 'Deadlines',
+    'expression_of_opinion': 'Expression of Opinion',
+    'disparate_idea': 'Disparate Idea'
+}
@@ -0,0 +1,182 @@
+"""
+Plausible wrong answers for multiple-choice vocab questions.
+
+For every vocab set and answer field (spanish/german/english) a neighbor
+list is precomputed per entry: the other values of the same set that share
+the most character trigrams, have a similar length and the same rough word
+class (verb, noun, phrase). Candidates come from a trigram inverted index and
+a length-sorted fallback, so a set is indexed without comparing every pair,
+and drawing distractors for a question is a slice of a stored tuple.
+
+Columns are built when the content snapshot is built for in-memory
+vocabularies and on first use for lazy backends. On reload, columns whose
+values did not change are carried over from the previous index.
+"""
+from __future__ import annotations
+
+import heapq
+import random
+import threading
+from bisect import bisect_left
+from typing import Mapping, Optional, Sequence
+
+from utils.form_index import fold_accents
+from utils.records import VOCAB_FIELDS, is_in_memory
+
+# Neighbors stored per entry; distractors are drawn from these
+NEIGHBORS = 6
+# Options shown per question (the answer plus CHOICES - 1 distractors)
+CHOICES = 4
+# Trigrams shared by more entries than this carry no signal and are skipped
+MAX_POSTING = 64
+
+_SPANISH_VERB_ENDINGS = ("ar", "er", "ir", "ír", "arse", "erse", "irse")
+
+
+def _is_placeholder(value: str) -> bool:
+    return not value or value.lstrip().startswith("[")
+
+
+def _head(value: str) -> str:
+    """First alternative without parentheticals: 'to pass (an exam), x' -> 'to pass'."""
+    head = value.split(",")[0].split(";")[0]
+    if "(" in head:
+        head = head[:head.index("(")]
+    return head.strip()
+
+
+def word_class(value: str, field: str) -> str:
+    """Rough part of speech: 'verb', 'noun', 'phrase' or 'word'."""
+    head = _head(value)
+    if field == "english" and head.lower().startswith("to "):
+        return "verb"
+    if " " in head or any(c in head for c in "¿?¡!"):
+        return "phrase"
+    if field == "spanish" and head.lower().endswith(_SPANISH_VERB_ENDINGS):
+        return "verb"
+    if field == "german" and head[:1].isupper():
+        return "noun"
+    return "word"
+
+
+def _trigrams(value: str) -> frozenset[str]:
+    padded = f" {fold_accents(_head(value))} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class DistractorColumn:
+    """Neighbor lists for one (set, field) column of values."""
+
+    __slots__ = ("values", "neighbors")
+
+    def __init__(self, values: Sequence[str], field: str) -> None:
+        self.values: tuple[str, ...] = tuple(values)
+        self.neighbors: tuple[tuple[int, ...], ...] = _build_neighbors(self.values, field)
+
+    def distractors(self, position: int, k: int = CHOICES - 1, rng=random) -> list[str]:
+        candidates = self.neighbors[position]
+        picked = rng.sample(candidates, k) if len(candidates) > k else list(candidates)
+        return [self.values[j] for j in picked]
+
+
+def _build_neighbors(values: tuple[str, ...], field: str) -> tuple[tuple[int, ...], ...]:
+    grams = [_trigrams(v) for v in values]
+    lengths = [len(_head(v)) for v in values]
+    classes = [word_class(v, field) for v in values]
+    folded = [fold_accents(v) for v in values]
+    usable = [i for i, v in enumerate(values) if not _is_placeholder(v)]
+
+    postings: dict[str, list[int]] = {}
+    for i in usable:
+        for gram in grams[i]:
+            postings.setdefault(gram, []).append(i)
+
+    by_length = sorted(usable, key=lambda i: lengths[i])
+    sorted_lengths = [lengths[i] for i in by_length]
+
+    neighbors: list[tuple[int, ...]] = []
+    for i, value in enumerate(values):
+        if _is_placeholder(value):
+            neighbors.append(())
+            continue
+        shared: dict[int, int] = {}
+        for gram in grams[i]:
+            posting = postings[gram]
+            if len(posting) > MAX_POSTING:
+                continue
+            for j in posting:
+                shared[j] = shared.get(j, 0) + 1
+        # Entries of similar length fill up sets with little trigram overlap
+        at = bisect_left(sorted_lengths, lengths[i])
+        for j in by_length[max(0, at - NEIGHBORS):at + NEIGHBORS]:
+            shared.setdefault(j, 0)
+
+        def score(j: int) -> float:
+            overlap = shared[j] / (len(grams[i]) + len(grams[j]) - shared[j] or 1)
+            same_class = 0.5 if classes[j] == classes[i] else 0.0
+            return overlap + same_class - 0.02 * abs(lengths[j] - lengths[i])
+
+        candidates = (j for j in shared if j != i and folded[j] != folded[i])
+        best = heapq.nlargest(NEIGHBORS * 2, candidates, key=score)
+        # The same distractor text can appear twice in a set; keep it once
+        unique = {folded[j]: j for j in reversed(best)}
+        neighbors.append(tuple(j for j in best if unique[folded[j]] == j)[:NEIGHBORS])
+    return tuple(neighbors)
+
+
+class DistractorIndex:
+    """
+    (set key, field) -> DistractorColumn for one content snapshot.
+
+    Columns of in-memory vocab sets (tuples and lists) are built up front;
+    sets of lazy backends are indexed on first use. Passing the previous
+    snapshot's index reuses every column whose values are unchanged. An index
+    with a `fallback` holds only the sets of its own vocabulary_data and reads
+    every other set's columns from the fallback (a class overlay on the shared
+    base).
+    """
+
+    __slots__ = ("_columns", "_lock", "_own", "_fallback")
+
+    def __init__(
+        self,
+        vocabulary_data: Mapping,
+        previous: Optional["DistractorIndex"] = None,
+        fallback: Optional["DistractorIndex"] = None,
+    ) -> None:
+        self._columns: dict[tuple[str, str], DistractorColumn] = {}
+        self._lock = threading.Lock()
+        self._fallback = fallback
+        vocab_sets = vocabulary_data.get("vocab_sets", {})
+        self._own: frozenset[str] = frozenset(vocab_sets) if fallback is not None else frozenset()
+        reused = previous._columns if previous is not None else {}
+        for set_key, entries in vocab_sets.items():
+            # Sets of lazy backends (blob, shards, SQLite) are not forced to load here
+            if not is_in_memory(entries):
+                continue
+            for field in VOCAB_FIELDS:
+                values = tuple(getattr(entry, field) for entry in entries)
+                column = reused.get((set_key, field))
+                if column is None or column.values != values:
+                    column = DistractorColumn(values, field)
+                self._columns[(set_key, field)] = column
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def column(self, set_key: str, entries: Sequence, field: str) -> DistractorColumn:
+        if self._fallback is not None and set_key not in self._own:
+            return self._fallback.column(set_key, entries, field)
+        column = self._columns.get((set_key, field))
+        if column is None:
+            built = DistractorColumn([getattr(entry, field) for entry in entries], field)
+            with self._lock:
+                column = self._columns.setdefault((set_key, field), built)
+        return column
+
+    def choices(self, set_key: str, entries: Sequence, position: int, field: str, rng=random) -> list[str]:
+        """The answer at `position` plus its distractors, shuffled."""
+        column = self.column(set_key, entries, field)
+        options = [column.values[position], *column.distractors(position, rng=rng)]
+        rng.shuffle(options)
+        return options
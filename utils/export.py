@@ -0,0 +1,145 @@
+"""
+Streaming export of flashcards as CSV, Anki-importable TSV or printable HTML.
+
+Cards are produced by generators over the content (vocab sets, the
+conjugation table) or over a generated quiz, and every writer is itself a
+generator that yields the document in chunks of CHUNK_CARDS cards. A Flask
+response built on them starts sending at once and never holds the whole
+document.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from html import escape
+from typing import Callable, Iterable, Iterator, Mapping, NamedTuple, Sequence
+
+# Cards per yielded chunk
+CHUNK_CARDS = 500
+
+
+class Card(NamedTuple):
+    front: str
+    back: str
+
+
+def conjugation_front(verb: str, tense: str, person: str) -> str:
+    """'yo + ser (pretérito indefinido)'"""
+    return f"{person} + {verb} ({tense.replace('_', ' ')})"
+
+
+def vocab_cards(sets: Iterable[Sequence], question_field: str, answer_field: str) -> Iterator[Card]:
+    for entries in sets:
+        for entry in entries:
+            yield Card(getattr(entry, question_field), getattr(entry, answer_field))
+
+
+def conjugation_cards(
+    quiz_data: Mapping,
+    verbs: Iterable[str],
+    tenses: Sequence[str],
+    persons_for: Callable[[str], Sequence[str]],
+) -> Iterator[Card]:
+    """Every (person, verb, tense) of the selection, one verb at a time."""
+    for verb in verbs:
+        conjugations = quiz_data[verb]
+        for tense in tenses:
+            forms = conjugations[tense]
+            for person in persons_for(tense):
+                yield Card(conjugation_front(verb, tense, person), forms[person])
+
+
+def quiz_cards(questions: Iterable[Mapping]) -> Iterator[Card]:
+    """Cards for the question dicts of a generated quiz (any quiz type)."""
+    for question in questions:
+        if "sentence" in question:
+            yield Card(question["sentence"], question["answer"])
+        elif question.get("mode") == "identify":
+            yield Card(question["answer"], "; ".join(question.get("analyses", ())))
+        elif "verb" in question:
+            yield Card(conjugation_front(question["verb"], question["tense"], question["person"]), question["answer"])
+        else:
+            yield Card(question["question"], question["answer"])
+
+
+def _chunks(cards: Iterable[Card]) -> Iterator[list[Card]]:
+    chunk: list[Card] = []
+    for card in cards:
+        chunk.append(card)
+        if len(chunk) >= CHUNK_CARDS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(cards: Iterable[Card], title: str = "") -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(Card._fields)
+    for chunk in _chunks(cards):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _anki_field(value: str) -> str:
+    return " ".join(value.split())
+
+
+def stream_anki(cards: Iterable[Card], title: str = "") -> Iterator[str]:
+    """Anki 'Notes in Plain Text' format: tab-separated, one note per line."""
+    yield "#separator:tab\n#html:false\n"
+    for chunk in _chunks(cards):
+        yield "".join(f"{_anki_field(card.front)}\t{_anki_field(card.back)}\n" for card in chunk)
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 1cm; }}
+h1 {{ font-size: 1.2rem; }}
+.cards {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 0; }}
+.card {{ border: 1px dashed #999; padding: 0.6cm 0.4cm; min-height: 3cm; break-inside: avoid; }}
+.front {{ font-size: 1.1rem; font-weight: bold; }}
+.back {{ margin-top: 0.4cm; color: #444; }}
+@media print {{ body {{ margin: 0; }} h1 {{ display: none; }} }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="cards">
+"""
+
+
+def stream_html(cards: Iterable[Card], title: str = "Flashcards") -> Iterator[str]:
+    """A printable sheet: three cards per row, each with its answer underneath."""
+    yield _HTML_HEAD.format(title=escape(title))
+    for chunk in _chunks(cards):
+        yield "".join(
+            f'<div class="card"><div class="front">{escape(card.front)}</div>'
+            f'<div class="back">{escape(card.back)}</div></div>\n'
+            for card in chunk
+        )
+    yield "</div>\n</body>\n</html>\n"
+
+
+class ExportFormat(NamedTuple):
+    write: Callable[[Iterable[Card], str], Iterator[str]]
+    mimetype: str
+    extension: str
+    # Printable sheets open in the browser; the others download
+    attachment: bool
+
+
+EXPORT_FORMATS: dict[str, ExportFormat] = {
+    "csv": ExportFormat(stream_csv, "text/csv", "csv", True),
+    "anki": ExportFormat(stream_anki, "text/tab-separated-values", "txt", True),
+    "html": ExportFormat(stream_html, "text/html", "html", False),
+}
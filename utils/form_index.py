@@ -0,0 +1,190 @@
+"""
+Reverse conjugation index: surface form -> every (verb, tense, person) it can be.
+
+Built from the conjugations_quiz mapping on the first lookup, not with the
+content snapshot: it needs every paradigm (and, with the SQLite backend, a
+scan of the conjugations table), and only the identify-the-form quiz and the
+CLI below read it. Lookups are single dict probes, exact first and then
+accent-folded, so ambiguous forms (`fue` = ser/ir, `vaya` = ir in three
+slots) resolve in O(1).
+
+The same index scans running text for conjugated forms, including the
+two-word compound and negative-imperative forms (`he sido`, `no vayas`):
+
+    python -m utils.form_index                     # forms used per dialogue
+    python -m utils.form_index --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Mapping, NamedTuple, Optional
+
+from utils.conjugation_engine import NOT_APPLICABLE, quiz_data_from_json
+from utils.dialog_tex import parse_dialogue_file
+from utils.dialog_vocab_generator import dialogue_set_key_from_path, discover_dialogue_tex_files
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+class FormAnalysis(NamedTuple):
+    verb: str
+    tense: str
+    person: str
+
+    def label(self) -> str:
+        return f"{self.verb} · {self.tense.replace('_', ' ')} · {self.person}"
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase without accents or diaeresis; ñ is kept (año != ano)."""
+    decomposed = unicodedata.normalize("NFD", text.strip().lower())
+    out = []
+    for i, c in enumerate(decomposed):
+        if unicodedata.combining(c) and not (c == "\u0303" and decomposed[i - 1:i] == "n"):
+            continue
+        out.append(c)
+    return unicodedata.normalize("NFC", "".join(out))
+
+
+class FormIndex:
+    """
+    Exact and accent-folded hash maps from forms to their analyses.
+
+    Analyses are kept in data order (verb, then tense, then person), so
+    `analyses(form)[0]` is stable across rebuilds. The maps are built on
+    first use; concurrent first lookups build them once.
+    """
+
+    __slots__ = ("_quiz_data", "_lock", "_exact", "_folded", "_max_words")
+
+    def __init__(self, quiz_data: Mapping) -> None:
+        self._quiz_data = quiz_data
+        self._lock = threading.Lock()
+        self._exact: Optional[dict[str, tuple[FormAnalysis, ...]]] = None
+        self._folded: dict[str, tuple[FormAnalysis, ...]] = {}
+        self._max_words = 1
+
+    @property
+    def built(self) -> bool:
+        return self._exact is not None
+
+    def _tables(self) -> dict[str, tuple[FormAnalysis, ...]]:
+        exact = self._exact
+        if exact is None:
+            with self._lock:
+                if self._exact is None:
+                    self._build()
+                exact = self._exact
+        return exact
+
+    def _build(self) -> None:
+        exact: dict[str, list[FormAnalysis]] = {}
+        for verb, tenses in self._quiz_data.items():
+            for tense, persons in tenses.items():
+                for person, form in persons.items():
+                    if not form or form == NOT_APPLICABLE or form.startswith("["):
+                        continue
+                    exact.setdefault(form.lower(), []).append(FormAnalysis(verb, tense, person))
+
+        folded: dict[str, list[FormAnalysis]] = {}
+        for form, analyses in exact.items():
+            folded.setdefault(fold_accents(form), []).extend(analyses)
+
+        self._folded = {f: tuple(a) for f, a in folded.items()}
+        self._max_words = max((form.count(" ") + 1 for form in exact), default=1)
+        # Set last: other threads read the maps once _exact is not None
+        self._exact = {f: tuple(a) for f, a in exact.items()}
+
+    def __len__(self) -> int:
+        return len(self._tables())
+
+    def __contains__(self, form: str) -> bool:
+        return form.strip().lower() in self._tables()
+
+    def exact(self, form: str) -> tuple[FormAnalysis, ...]:
+        return self._tables().get(form.strip().lower(), ())
+
+    def folded(self, form: str) -> tuple[FormAnalysis, ...]:
+        self._tables()
+        return self._folded.get(fold_accents(form), ())
+
+    def analyses(self, form: str) -> tuple[FormAnalysis, ...]:
+        """Exact matches, or the accent-folded ones when the form has none (`esta` -> está)."""
+        return self.exact(form) or self.folded(form)
+
+    def verbs(self, form: str) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(a.verb for a in self.analyses(form)))
+
+    def scan(self, text: str) -> Counter:
+        """
+        Count the conjugated forms in `text` (exact spelling, any case).
+
+        Longer forms win: `he sido` is counted once as a compound form, not
+        as `he` + `sido`.
+        """
+        exact = self._tables()
+        words = [w.lower() for w in _WORD_RE.findall(text)]
+        found: Counter = Counter()
+        i = 0
+        while i < len(words):
+            for size in range(min(self._max_words, len(words) - i), 0, -1):
+                candidate = " ".join(words[i:i + size])
+                if candidate in exact:
+                    found[candidate] += 1
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
+
+
+def dialogue_form_usage(index: FormIndex, tex_paths: Iterable[Path]) -> dict[str, Counter]:
+    """set key -> Counter of conjugated forms used in that dialogue's text."""
+    usage: dict[str, Counter] = {}
+    for path in tex_paths:
+        document = parse_dialogue_file(path)
+        counts: Counter = Counter()
+        for turn in document.turns:
+            counts.update(index.scan(turn.text))
+        usage[dialogue_set_key_from_path(path)] = counts
+    return usage
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    repo_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="List the conjugated forms each dialogue uses.")
+    parser.add_argument("--dialogos-dir", type=Path, default=repo_root / "ressources" / "dialogos")
+    parser.add_argument("--conjugations", type=Path, default=repo_root / "data" / "conjugations.json")
+    parser.add_argument("--json", action="store_true", help="print {set_key: {verb: {form: count}}}")
+    args = parser.parse_args(argv)
+
+    with open(args.conjugations, "r", encoding="utf-8") as f:
+        index = FormIndex(quiz_data_from_json(json.load(f)))
+    usage = dialogue_form_usage(index, discover_dialogue_tex_files(args.dialogos_dir))
+
+    by_verb: dict[str, dict[str, dict[str, int]]] = {}
+    for set_key, counts in usage.items():
+        verbs: dict[str, dict[str, int]] = {}
+        for form, count in sorted(counts.items()):
+            for verb in index.verbs(form):
+                verbs.setdefault(verb, {})[form] = count
+        by_verb[set_key] = dict(sorted(verbs.items()))
+
+    if args.json:
+        print(json.dumps(by_verb, indent=2, ensure_ascii=False))
+        return 0
+    for set_key, verbs in by_verb.items():
+        print(f"{set_key}: {len(verbs)} verbs")
+        for verb, forms in verbs.items():
+            print(f"  {verb}: " + ", ".join(f"{form} ({count})" for form, count in forms.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
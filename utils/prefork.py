@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import gc
+import sys
+from typing import Any
+
+
+def freeze_content(value: Any) -> Any:
+    """
+    Return a read-only, fork-friendly copy of JSON-shaped content.
+
+    - lists become tuples (smaller, and a tuple holding only strings is
+      untracked by the cyclic GC, so collections never write to its pages)
+    - strings are interned, so repeated keys/values ('yo', tense names,
+      'spanish'/'german'/'english') are stored once
+    - dicts stay dicts (dicts holding only atomic values are untracked too)
+    """
+    if isinstance(value, dict):
+        return {
+            (sys.intern(k) if isinstance(k, str) else k): freeze_content(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_content(v) for v in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def prepare_for_fork() -> None:
+    """
+    Move every object that exists right now into the GC's permanent generation.
+
+    Call this in the pre-fork master once the content snapshot is built
+    (gunicorn's when_ready hook). Forked workers then never touch those
+    objects during garbage collection, so the pages stay shared copy-on-write
+    instead of being duplicated into each worker.
+    """
+    gc.collect()
+    gc.freeze()
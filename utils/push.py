@@ -0,0 +1,144 @@
+"""
+Broadcast rooms for push connections (Server-Sent Events).
+
+A room is a set of subscriber queues living on the event loop; publishing
+puts the event on every queue and each subscriber's SSE response writes it
+out. An idle subscriber is one coroutine waiting on its queue (plus a
+heartbeat comment every HEARTBEAT_SECONDS), not a thread, so one process
+holds thousands of them.
+
+Rooms live in the process that serves them: publishers and subscribers of a
+room must reach the same process (one ASGI worker, or sticky routing).
+
+    GET  /events/rooms/<room>   text/event-stream of the room's events
+    POST /events/rooms/<room>   {"event": "score", "data": {...}} -> {"delivered": n}
+
+Subscribing is open; publishing requires the PUSH_PUBLISH_TOKEN bearer token
+(checked in utils.asgi).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import defaultdict
+from typing import Any, Optional
+
+HEARTBEAT_SECONDS = 15.0
+# Undelivered events kept per subscriber; a slow client loses the oldest
+QUEUE_SIZE = 100
+MAX_EVENT_BYTES = 16 * 1024
+
+ROOM_RE = re.compile(r"^[A-Za-z0-9_.:-]{1,64}$")
+EVENT_RE = ROOM_RE
+
+# Put on a queue to end its subscription (server shutdown)
+_CLOSE = object()
+
+
+def format_event(event: str, data: Any) -> bytes:
+    """One SSE message; `data` is sent as JSON on a single line."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class Broadcaster:
+    """Room name -> subscriber queues. Use from the event loop thread only."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE) -> None:
+        self._rooms: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._queue_size = queue_size
+
+    def subscribe(self, room: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self._queue_size)
+        self._rooms[room].add(queue)
+        return queue
+
+    def unsubscribe(self, room: str, queue: asyncio.Queue) -> None:
+        subscribers = self._rooms.get(room)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._rooms[room]
+
+    def subscribers(self, room: Optional[str] = None) -> int:
+        if room is not None:
+            return len(self._rooms.get(room, ()))
+        return sum(len(subscribers) for subscribers in self._rooms.values())
+
+    def publish(self, room: str, event: str, data: Any) -> int:
+        """Queue the event for every subscriber of `room`; returns how many there are."""
+        message = format_event(event, data)
+        subscribers = self._rooms.get(room, ())
+        for queue in subscribers:
+            _put_dropping_oldest(queue, message)
+        return len(subscribers)
+
+    def close(self) -> None:
+        """End every subscription (their responses finish)."""
+        for subscribers in self._rooms.values():
+            for queue in subscribers:
+                _put_dropping_oldest(queue, _CLOSE)
+
+
+def _put_dropping_oldest(queue: asyncio.Queue, item: Any) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def stream_room(broadcaster: Broadcaster, room: str, receive, send) -> None:
+    """ASGI response: the events of `room` until the client disconnects."""
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream; charset=utf-8"),
+            (b"cache-control", b"no-cache"),
+            # Reverse proxies must not buffer the stream
+            (b"x-accel-buffering", b"no"),
+        ],
+    })
+    queue = broadcaster.subscribe(room)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    message = asyncio.ensure_future(queue.get())
+    try:
+        await send({"type": "http.response.body", "body": b": connected\n\n", "more_body": True})
+        while True:
+            done, _ = await asyncio.wait(
+                {message, disconnect}, timeout=HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnect in done:
+                return
+            if message in done:
+                body = message.result()
+                if body is _CLOSE:
+                    break
+                message = asyncio.ensure_future(queue.get())
+            else:
+                body = b": keep-alive\n\n"
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        disconnect.cancel()
+        message.cancel()
+        broadcaster.unsubscribe(room, queue)
+
+
+def publish_to_room(broadcaster: Broadcaster, room: str, body: bytes) -> tuple[int, dict]:
+    """(status, JSON payload) for a publish request body {"event": str, "data": any}."""
+    if len(body) > MAX_EVENT_BYTES:
+        return 413, {"error": f"event larger than {MAX_EVENT_BYTES} bytes"}
+    try:
+        payload = json.loads(body or b"null")
+    except ValueError:
+        return 400, {"error": "body must be JSON"}
+    event = payload.get("event", "message") if isinstance(payload, dict) else None
+    if not isinstance(event, str) or not EVENT_RE.match(event):
+        return 400, {"error": 'expected {"event": "<name>", "data": ...}'}
+    delivered = broadcaster.publish(room, event, payload.get("data"))
+    return 202, {"delivered": delivered}
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Iterable, Mapping, NamedTuple, Optional, Sequence
+
+VOCAB_FIELDS = ("spanish", "german", "english")
+
+
+class StringPool:
+    """
+    Deduplicates equal strings while content is being built.
+
+    Unlike sys.intern the pool is dropped once the snapshot exists, so it does
+    not keep strings alive or grow the interpreter's interned table.
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+
+class VocabEntry(NamedTuple):
+    """
+    One vocabulary entry.
+
+    A tuple subclass without per-instance dict: about a third of the size of
+    the equivalent dict, and immutable.
+    """
+
+    spanish: str
+    german: str
+    english: str
+
+    @classmethod
+    def from_dict(cls, entry: Mapping, pool: Optional[StringPool] = None) -> "VocabEntry":
+        values = [str(entry.get(field, "")) for field in VOCAB_FIELDS]
+        if pool is not None:
+            values = [pool(v) for v in values]
+        return cls(*values)
+
+
+def entry_as_dict(entry) -> Optional[dict]:
+    """vocabulary.json form of an entry (dict or VocabEntry); None for anything else."""
+    if isinstance(entry, VocabEntry):
+        return entry._asdict()
+    if isinstance(entry, dict):
+        return entry
+    return None
+
+
+def is_in_memory(entries) -> bool:
+    """True for a set held as a tuple or list; lazy backends (blob, shards, SQLite) hand out views."""
+    return isinstance(entries, (list, tuple))
+
+
+def compact_vocab_entries(entries: Iterable, pool: Optional[StringPool] = None) -> tuple[VocabEntry, ...]:
+    return tuple(
+        e if isinstance(e, VocabEntry) else VocabEntry.from_dict(e, pool)
+        for e in entries
+        if isinstance(e, (Mapping, VocabEntry))
+    )
+
+
+def compact_vocabulary_data(vocabulary_data: Mapping, pool: Optional[StringPool] = None) -> dict:
+    """vocabulary.json-shaped data with every set as a tuple of VocabEntry."""
+    pool = pool or StringPool()
+    vocab_sets = vocabulary_data.get("vocab_sets", {})
+    return {
+        "vocab_sets": {
+            pool(set_key): compact_vocab_entries(entries, pool)
+            for set_key, entries in vocab_sets.items()
+            if isinstance(entries, (list, tuple))
+        }
+    }
+
+
+class PorParaCategory(NamedTuple):
+    answer: str  # 'por' or 'para'
+    key: str
+
+
+class PorParaIndex:
+    """
+    Por/para sentences as parallel arrays keyed by small integer category ids.
+
+    `categories[i]` describes category i and `sentences[i]` is its sentence
+    sequence (a tuple, or a lazy sequence for the SQLite backend);
+    `lengths[i]` is its size. No per-sentence objects are built; a question
+    is materialized only when a sentence is drawn.
+    """
+
+    __slots__ = ("categories", "sentences", "lengths", "_ids")
+
+    def __init__(self, por_para_data: Mapping) -> None:
+        categories: list[PorParaCategory] = []
+        sentences: list[Sequence[str]] = []
+        for answer in ("por", "para"):
+            for key, category_sentences in por_para_data.get(answer, {}).items():
+                categories.append(PorParaCategory(answer, key))
+                sentences.append(category_sentences)
+        self.categories: tuple[PorParaCategory, ...] = tuple(categories)
+        self.sentences: tuple[Sequence[str], ...] = tuple(sentences)
+        self.lengths: tuple[int, ...] = tuple(len(s) for s in self.sentences)
+        self._ids = {category: i for i, category in enumerate(self.categories)}
+
+    def category_id(self, answer: str, key: str) -> Optional[int]:
+        return self._ids.get(PorParaCategory(answer, key))
+
+    def category_ids(self, answer: str, keys: Iterable[str]) -> list[int]:
+        """Ids of the known categories among `keys`, in the given order."""
+        ids = (self._ids.get(PorParaCategory(answer, key)) for key in keys)
+        return [i for i in ids if i is not None]
+
+    def question(self, category_id: int, position: int) -> dict:
+        category = self.categories[category_id]
+        return {
+            "sentence": self.sentences[category_id][position],
+            "answer": category.answer,
+            "category": category.key,
+        }
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def sample_positions(lengths: Sequence[int], k: int, rng=random) -> list[tuple[int, int]]:
+    """
+    Draw `k` (sequence_index, item_index) pairs uniformly, with replacement,
+    over sequences of the given lengths, as if they were concatenated.
+    """
+    bounds = list(accumulate(lengths))
+    total = bounds[-1] if bounds else 0
+    if total <= 0 or k <= 0:
+        return []
+
+    drawn: list[tuple[int, int]] = []
+    for _ in range(k):
+        r = rng.randrange(total)
+        i = bisect_right(bounds, r)
+        drawn.append((i, r - (bounds[i - 1] if i else 0)))
+    return drawn
+
+
+def sample_from_sequences(sequences: Sequence[Sequence[T]], k: int, rng=random) -> list[T]:
+    """
+    Draw `k` items uniformly, with replacement, from the concatenation of
+    `sequences` without building the concatenated list.
+
+    Equivalent to `[rng.choice(flat) for _ in range(k)]`, but only the drawn
+    items are touched, so lazily decoded sequences (memory-mapped blobs,
+    shards) stay unmaterialized.
+    """
+    return [sequences[i][j] for i, j in sample_positions([len(s) for s in sequences], k, rng)]
+
+
+def allocate(k: int, shares: Sequence[float], rng=random) -> list[int]:
+    """
+    Split `k` into integer counts proportional to `shares` (largest remainder).
+
+    Ties between equal remainders are broken randomly, so a 50/50 split of an
+    odd `k` does not always favour the first share.
+    """
+    total = sum(s for s in shares if s > 0)
+    if k <= 0 or total <= 0:
+        return [0] * len(shares)
+    exact = [k * max(s, 0) / total for s in shares]
+    counts = [int(x) for x in exact]
+    order = sorted(range(len(shares)), key=lambda i: (exact[i] - counts[i], rng.random()), reverse=True)
+    for i in order[:k - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def stratified_positions(
+    strata: Sequence[Sequence[int]],
+    lengths: Sequence[int],
+    k: int,
+    shares: Sequence[float],
+    rng=random,
+) -> list[tuple[int, int]]:
+    """
+    Draw `k` (sequence_index, item_index) pairs split across strata.
+
+    Each stratum lists sequence indexes into `lengths` (e.g. the por and the
+    para category ids) and receives its share of `k`; empty strata give their
+    share to the others. Within a stratum the sequences are visited
+    round-robin from a random starting order, so every selected sequence is
+    used before any repeats, and positions within one sequence are drawn
+    without replacement while it has enough items. The result is shuffled.
+
+    Runs in O(k + number of sequences); nothing is flattened.
+    """
+    strata = [[i for i in stratum if lengths[i] > 0] for stratum in strata]
+    effective = [share if stratum else 0 for share, stratum in zip(shares, strata)]
+    if sum(effective) <= 0:
+        # e.g. 100% por requested but only para categories selected
+        effective = [1 if stratum else 0 for stratum in strata]
+    counts = allocate(k, effective, rng)
+
+    drawn: list[tuple[int, int]] = []
+    for stratum, count in zip(strata, counts):
+        if not count:
+            continue
+        order = list(stratum)
+        rng.shuffle(order)
+        per_sequence = [0] * len(order)
+        for n in range(count):
+            per_sequence[n % len(order)] += 1
+        for seq, m in zip(order, per_sequence):
+            if not m:
+                continue
+            length = lengths[seq]
+            if m <= length:
+                positions = rng.sample(range(length), m)
+            else:
+                positions = [rng.randrange(length) for _ in range(m)]
+            drawn.extend((seq, p) for p in positions)
+    rng.shuffle(drawn)
+    return drawn
+
+
+def interleave(sequences: Sequence[Sequence[T]], rng=random) -> list[T]:
+    """
+    Merge `sequences` so each is spread evenly over the result.
+
+    Item i of a sequence of length n is placed at fraction (i + offset) / n
+    with a random offset per sequence, so no kind comes in a long run and the
+    first item is not always from the first sequence. O(total log total).
+    """
+    keyed = []
+    for s, sequence in enumerate(sequences):
+        offset = rng.random()
+        n = len(sequence)
+        keyed.extend(((i + offset) / n, s, item) for i, item in enumerate(sequence))
+    keyed.sort(key=lambda entry: entry[:2])
+    return [item for _, _, item in keyed]
@@ -17,6 +17,7 @@ def _sanitize_section(section: Any, *, allowed_keys: Dict[str, str]) -> Dict[str
     - "str_list"
     - "int"
     - "str"
+    - "bool"
     """
     if not isinstance(section, dict):
         return {}
@@ -32,6 +33,8 @@ def _sanitize_section(section: Any, *, allowed_keys: Dict[str, str]) -> Dict[str
             sanitized[key] = val
         elif expected == "str" and isinstance(val, str):
             sanitized[key] = val
+        elif expected == "bool" and isinstance(val, bool):
+            sanitized[key] = val
     return sanitized
 
 
@@ -39,7 +42,7 @@ def validate_settings(settings: Any) -> Dict[str, Any]:
     """
     Validate + sanitize the persisted settings structure.
 
-    Returns a dict with up to these top-level keys: conjugations, porpara, vocab.
+    Returns a dict with up to these top-level keys: conjugations, porpara, vocab, mixed.
     Unknown keys are dropped.
     """
     if not isinstance(settings, dict):
@@ -48,6 +51,8 @@ def validate_settings(settings: Any) -> Dict[str, Any]:
     conjugations_keys = {
         "selected_verbs": "str_list",
         "selected_tenses": "str_list",
+        "mode": "str",
+        "typed_answers": "bool",
         "seconds_per_question": "int",
         "seconds_per_answer": "int",
         "num_questions": "int",
@@ -56,6 +61,7 @@ def validate_settings(settings: Any) -> Dict[str, Any]:
     porpara_keys = {
         "selected_por_categories": "str_list",
         "selected_para_categories": "str_list",
+        "por_share": "int",
         "seconds_per_question": "int",
         "seconds_per_answer": "int",
         "num_questions": "int",
@@ -64,6 +70,18 @@ def validate_settings(settings: Any) -> Dict[str, Any]:
     vocab_keys = {
         "selected_vocab_sets": "str_list",
         "direction": "str",
+        "mode": "str",
+        "typed_answers": "bool",
+        "seconds_per_question": "int",
+        "seconds_per_answer": "int",
+        "num_questions": "int",
+        "contestants": "str_list",
+    }
+    mixed_keys = {
+        "conjugations_share": "int",
+        "porpara_share": "int",
+        "vocab_share": "int",
+        "typed_answers": "bool",
         "seconds_per_question": "int",
         "seconds_per_answer": "int",
         "num_questions": "int",
@@ -74,6 +92,7 @@ def validate_settings(settings: Any) -> Dict[str, Any]:
     out["conjugations"] = _sanitize_section(settings.get("conjugations"), allowed_keys=conjugations_keys)
     out["porpara"] = _sanitize_section(settings.get("porpara"), allowed_keys=porpara_keys)
     out["vocab"] = _sanitize_section(settings.get("vocab"), allowed_keys=vocab_keys)
+    out["mixed"] = _sanitize_section(settings.get("mixed"), allowed_keys=mixed_keys)
     return out
 
 
@@ -0,0 +1,397 @@
+"""
+SQLite content backend.
+
+Conjugations, por/para sentences and vocabulary entries live in one SQLite
+file. Every vocab set and por/para category occupies a contiguous rowid range
+recorded in its header row, so drawing entry i of a set is a single primary
+key lookup; nothing is loaded into Python lists up front.
+
+The JSON loaders in utils.data_validator act as the importers:
+
+    python -m utils.sqlite_content data/content.sqlite3
+
+Teachers' edits replace one set at a time (replace_vocab_set) instead of
+rewriting vocabulary.json.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from uuid import uuid4
+
+from utils.data_validator import (
+    PERSONS,
+    load_and_validate_data,
+    load_and_validate_por_para_data,
+    load_and_validate_vocabulary_data,
+)
+from utils.records import VocabEntry, entry_as_dict
+
+SCHEMA_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE verbs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE tenses (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE conjugations (
+    verb_id INTEGER NOT NULL REFERENCES verbs(id),
+    tense_id INTEGER NOT NULL REFERENCES tenses(id),
+    person TEXT NOT NULL,
+    form TEXT NOT NULL,
+    PRIMARY KEY (verb_id, tense_id, person)
+) WITHOUT ROWID;
+CREATE TABLE por_para_categories (
+    id INTEGER PRIMARY KEY,
+    answer TEXT NOT NULL CHECK (answer IN ('por', 'para')),
+    key TEXT NOT NULL,
+    first_rowid INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    UNIQUE (answer, key)
+);
+CREATE TABLE por_para_sentences (
+    id INTEGER PRIMARY KEY,
+    category_id INTEGER NOT NULL REFERENCES por_para_categories(id),
+    sentence TEXT NOT NULL
+);
+CREATE INDEX idx_por_para_sentences_category ON por_para_sentences(category_id);
+CREATE TABLE vocab_sets (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    first_rowid INTEGER NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE vocab_entries (
+    id INTEGER PRIMARY KEY,
+    set_id INTEGER NOT NULL REFERENCES vocab_sets(id),
+    spanish TEXT NOT NULL,
+    german TEXT NOT NULL,
+    english TEXT NOT NULL
+);
+CREATE INDEX idx_vocab_entries_set ON vocab_entries(set_id);
+CREATE INDEX idx_vocab_entries_spanish ON vocab_entries(spanish);
+"""
+
+
+def _insert_range(conn: sqlite3.Connection, table: str, columns: str, rows: Iterable[tuple]) -> tuple[int, int]:
+    """Append rows to `table` and return (first_rowid, count) of the contiguous block."""
+    first = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+    placeholders = ", ".join("?" for _ in columns.split(","))
+    count = 0
+    for offset, row in enumerate(rows):
+        conn.execute(f"INSERT INTO {table} (id, {columns}) VALUES (?, {placeholders})", (first + offset, *row))
+        count += 1
+    return first, count
+
+
+def import_content_to_sqlite(
+    conjugations_path: str,
+    por_para_path: str,
+    vocabulary_path: str,
+    db_path: str,
+) -> None:
+    """Validate the JSON data files and build a fresh database at `db_path`, atomically."""
+    conjugations_data = load_and_validate_data(conjugations_path)
+    por_para_data = load_and_validate_por_para_data(por_para_path)
+    vocabulary_data = load_and_validate_vocabulary_data(vocabulary_path)
+
+    directory = os.path.dirname(db_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(db_path)}.{uuid4().hex}.tmp")
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+
+            tense_ids: dict[str, int] = {}
+            for verb, tenses in conjugations_data.get("conjugations_quiz", {}).items():
+                verb_id = conn.execute("INSERT INTO verbs (name) VALUES (?)", (verb,)).lastrowid
+                for tense, persons in tenses.items():
+                    if tense not in tense_ids:
+                        tense_ids[tense] = conn.execute("INSERT INTO tenses (name) VALUES (?)", (tense,)).lastrowid
+                    conn.executemany(
+                        "INSERT INTO conjugations (verb_id, tense_id, person, form) VALUES (?, ?, ?, ?)",
+                        [(verb_id, tense_ids[tense], person, form) for person, form in persons.items()],
+                    )
+
+            for answer in ("por", "para"):
+                for key, sentences in por_para_data.get(answer, {}).items():
+                    category_id = conn.execute(
+                        "INSERT INTO por_para_categories (answer, key, first_rowid, count) VALUES (?, ?, 0, 0)",
+                        (answer, key),
+                    ).lastrowid
+                    first, count = _insert_range(
+                        conn, "por_para_sentences", "category_id, sentence", ((category_id, s) for s in sentences)
+                    )
+                    conn.execute(
+                        "UPDATE por_para_categories SET first_rowid = ?, count = ? WHERE id = ?",
+                        (first, count, category_id),
+                    )
+
+            for set_key, entries in vocabulary_data.get("vocab_sets", {}).items():
+                if isinstance(entries, list):
+                    _write_vocab_set(conn, set_key, entries)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+
+
+def _write_vocab_set(conn: sqlite3.Connection, set_key: str, entries: Iterable[dict]) -> None:
+    row = conn.execute("SELECT id, first_rowid, count FROM vocab_sets WHERE key = ?", (set_key,)).fetchone()
+    if row is None:
+        set_id = conn.execute(
+            "INSERT INTO vocab_sets (key, first_rowid, count) VALUES (?, 0, 0)", (set_key,)
+        ).lastrowid
+    else:
+        # The range being replaced stays readable for snapshots opened before
+        # this write; only older generations of the set are dropped
+        set_id, first, count = row
+        conn.execute(
+            "DELETE FROM vocab_entries WHERE set_id = ? AND id NOT BETWEEN ? AND ?",
+            (set_id, first, first + count - 1),
+        )
+
+    first, count = _insert_range(
+        conn,
+        "vocab_entries",
+        "set_id, spanish, german, english",
+        (
+            (set_id, *VocabEntry.from_dict(e))
+            for e in map(entry_as_dict, entries)
+            if e is not None
+        ),
+    )
+    conn.execute("UPDATE vocab_sets SET first_rowid = ?, count = ? WHERE id = ?", (first, count, set_id))
+
+
+def replace_vocab_set(db_path: str, set_key: str, entries: Iterable[dict]) -> None:
+    """
+    Create or replace one vocab set in place.
+
+    The set's rows are re-appended as a new contiguous rowid range, so only
+    this set is rewritten. The previous range is kept until the set is
+    replaced again, so running apps keep drawing from it until they notice
+    the new database_version() and reload.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            _write_vocab_set(conn, set_key, entries)
+    finally:
+        conn.close()
+
+
+def database_version(db_path: str) -> Optional[tuple[int, int]]:
+    """
+    (inode, SQLite file change counter) of the database; None if it cannot be
+    read. Changes with every committed write and when the file is replaced.
+    """
+    try:
+        with open(db_path, "rb") as f:
+            header = f.read(28)
+            return os.fstat(f.fileno()).st_ino, int.from_bytes(header[24:28], "big")
+    except OSError:
+        return None
+
+
+class _Connections:
+    """
+    One read-only connection per (process, thread).
+
+    Connections must not cross a fork, so the pid is part of the key; a
+    snapshot preloaded in the gunicorn master opens fresh connections in each
+    worker.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != pid:
+            uri = Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True)
+            self._local.conn = conn
+            self._local.pid = pid
+        return conn
+
+
+class RowRange(Sequence):
+    """A contiguous rowid range of `table`, indexed like a list."""
+
+    __slots__ = ("_db", "_get_sql", "_scan_sql", "_first", "_count", "_row_factory")
+
+    def __init__(self, db: _Connections, table: str, columns: str, first: int, count: int, row_factory) -> None:
+        self._db = db
+        self._get_sql = f"SELECT {columns} FROM {table} WHERE id = ?"
+        self._scan_sql = f"SELECT {columns} FROM {table} WHERE id BETWEEN ? AND ? ORDER BY id"
+        self._first = first
+        self._count = count
+        self._row_factory = row_factory
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("row range index out of range")
+        row = self._db.get().execute(self._get_sql, (self._first + index,)).fetchone()
+        if row is None:
+            # Replaced twice since this snapshot was opened
+            raise IndexError("row range is no longer in the database")
+        return self._row_factory(row)
+
+    def __iter__(self):
+        cursor = self._db.get().execute(self._scan_sql, (self._first, self._first + self._count - 1))
+        for row in cursor:
+            yield self._row_factory(row)
+
+
+def _vocab_row(row) -> VocabEntry:
+    return VocabEntry(*row)
+
+
+def _sentence_row(row) -> str:
+    return row[0]
+
+
+class _Verb(Mapping):
+    def __init__(self, db: _Connections, verb_id: int) -> None:
+        self._db = db
+        self._verb_id = verb_id
+
+    def _tense_names(self) -> list[str]:
+        rows = self._db.get().execute(
+            "SELECT DISTINCT t.name FROM conjugations c JOIN tenses t ON t.id = c.tense_id "
+            "WHERE c.verb_id = ? ORDER BY t.id",
+            (self._verb_id,),
+        )
+        return [r[0] for r in rows]
+
+    def __getitem__(self, tense: str) -> dict:
+        rows = self._db.get().execute(
+            "SELECT c.person, c.form FROM conjugations c JOIN tenses t ON t.id = c.tense_id "
+            "WHERE c.verb_id = ? AND t.name = ?",
+            (self._verb_id, tense),
+        ).fetchall()
+        if not rows:
+            raise KeyError(tense)
+        forms = dict(rows)
+        return {person: forms[person] for person in PERSONS if person in forms}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tense_names())
+
+    def __len__(self) -> int:
+        return len(self._tense_names())
+
+
+class _Conjugations(Mapping):
+    def __init__(self, db: _Connections, verb_ids: dict[str, int]) -> None:
+        self._db = db
+        self._verb_ids = verb_ids
+
+    def __getitem__(self, verb: str) -> _Verb:
+        return _Verb(self._db, self._verb_ids[verb])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._verb_ids)
+
+    def __len__(self) -> int:
+        return len(self._verb_ids)
+
+
+class SqliteVocabSets(Mapping):
+    """set_key -> RowRange of its entries, in set order (read-only)."""
+
+    def __init__(self, sets: dict[str, RowRange]) -> None:
+        self._sets = sets
+
+    def __getitem__(self, key: str) -> RowRange:
+        return self._sets[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sets)
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+
+class SqliteContent:
+    """
+    Read-only views over a content database in the shapes of the JSON files.
+
+    Opening reads only the verb list and the set/category headers.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Content database not found: {db_path}")
+        self.db_path = db_path
+        self._db = _Connections(db_path)
+        conn = self._db.get()
+
+        version = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if not version or version[0] != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported content database schema in {db_path}")
+
+        verb_ids = dict(conn.execute("SELECT name, id FROM verbs ORDER BY id"))
+        self.conjugations_data = {"conjugations_quiz": _Conjugations(self._db, verb_ids)}
+
+        por_para: dict[str, dict[str, RowRange]] = {"por": {}, "para": {}}
+        for answer, key, first, count in conn.execute(
+            "SELECT answer, key, first_rowid, count FROM por_para_categories ORDER BY id"
+        ):
+            por_para[answer][key] = RowRange(
+                self._db, "por_para_sentences", "sentence", first, count, _sentence_row
+            )
+        self.por_para_data = por_para
+
+        vocab_sets: dict[str, RowRange] = {}
+        for key, first, count in conn.execute("SELECT key, first_rowid, count FROM vocab_sets ORDER BY id"):
+            vocab_sets[key] = RowRange(
+                self._db, "vocab_entries", "spanish, german, english", first, count, _vocab_row
+            )
+        self.vocabulary_data = {"vocab_sets": SqliteVocabSets(vocab_sets)}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    repo_root = Path(__file__).resolve().parents[1]
+    data_dir = repo_root / "data"
+    db_path = args[0] if args else str(data_dir / "content.sqlite3")
+
+    import_content_to_sqlite(
+        str(data_dir / "conjugations.json"),
+        str(data_dir / "por_para.json"),
+        str(data_dir / "vocabulary.json"),
+        db_path,
+    )
+    print(f"Wrote {db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
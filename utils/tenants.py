@@ -0,0 +1,282 @@
+"""
+Per-class content overlays on top of the shared content snapshot.
+
+Each class (tenant) is one JSON file `<key>.json` in the tenants directory
+holding only its deltas:
+
+    {
+      "name": "Klasse 7b",
+      "vocab_sets": {"klasse_7b_extra": [{"spanish": ..., "german": ..., "english": ...}]},
+      "vocab_set_names": {"dele_b1_info": "DELE B1"},
+      "hidden_vocab_sets": ["por_para"],
+      "hidden_verbs": ["haber"],
+      "hidden_tenses": []
+    }
+
+Its own vocab sets add to the base sets or replace the base set of the same
+key. A class snapshot is the base ContentSnapshot with four fields swapped:
+the vocab sets become a LayeredSets lookup (own sets first, then the visible
+base sets), distractors and search hold only the class's own sets and fall
+back to the base indexes, and the option view models are filtered and
+renamed. Conjugations, por/para, the form index and answer keys are the base
+objects themselves, so fifty classes cost one base snapshot plus their
+deltas.
+
+Class snapshots are cached per (base snapshot, overlay file version) and
+rebuilt when either changes.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any, Iterable, Optional
+
+from utils.content import ContentSnapshot
+from utils.content_validator import ERROR, format_issue, iter_vocabulary_issues
+from utils.distractors import DistractorIndex
+from utils.records import StringPool, compact_vocabulary_data
+from utils.vocab_search import DEFAULT_LIMIT, MAX_LIMIT, SearchResult, VocabSearchIndex, fold_search
+from utils.view_models import ConjugationsOptionsView, VocabOptionsView, build_vocab_options_view
+
+TENANT_KEY_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+
+def _string_list(data: Mapping, name: str) -> frozenset[str]:
+    values = data.get(name, [])
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise ValueError(f"{name} must be a list of strings")
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class TenantOverlay:
+    key: str
+    name: str
+    # Sets added by the class, or replacing the base set of the same key
+    vocab_sets: Mapping[str, tuple] = field(default_factory=dict)
+    vocab_set_names: Mapping[str, str] = field(default_factory=dict)
+    hidden_vocab_sets: frozenset[str] = frozenset()
+    hidden_verbs: frozenset[str] = frozenset()
+    hidden_tenses: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_json(cls, data: Any, key: str) -> "TenantOverlay":
+        """Validate one overlay; raises ValueError with the reason."""
+        if not TENANT_KEY_RE.match(key):
+            raise ValueError(f"invalid class key {key!r}")
+        if not isinstance(data, dict):
+            raise ValueError("class overlay must be an object")
+        name = data.get("name", key)
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("name must be a non-empty string")
+        vocab_sets = data.get("vocab_sets", {})
+        if not isinstance(vocab_sets, dict):
+            raise ValueError("vocab_sets must be an object of set key -> entries")
+        for issue in iter_vocabulary_issues(vocab_sets, cross_set=False):
+            if issue.severity == ERROR:
+                raise ValueError(format_issue(issue))
+        names = data.get("vocab_set_names", {})
+        if not isinstance(names, dict) or not all(isinstance(v, str) for v in names.values()):
+            raise ValueError("vocab_set_names must be an object of set key -> name")
+        return cls(
+            key=key,
+            name=name.strip(),
+            vocab_sets=compact_vocabulary_data({"vocab_sets": vocab_sets}, StringPool())["vocab_sets"],
+            vocab_set_names=dict(names),
+            hidden_vocab_sets=_string_list(data, "hidden_vocab_sets"),
+            hidden_verbs=_string_list(data, "hidden_verbs"),
+            hidden_tenses=_string_list(data, "hidden_tenses"),
+        )
+
+
+def load_overlay(path: str, key: str) -> TenantOverlay:
+    """Read and validate `path`; raises ValueError if it is unreadable or invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:
+        raise ValueError(f"cannot read class overlay {key!r}: {exc}") from exc
+    return TenantOverlay.from_json(data, key)
+
+
+class LayeredSets(Mapping):
+    """vocab_sets of one class: its own sets first, then the base sets it does not hide."""
+
+    __slots__ = ("_base", "_overlay", "base_keys", "shadowed", "_keys")
+
+    def __init__(self, base: Mapping, overlay: Mapping, hidden: Iterable[str] = ()) -> None:
+        self._base = base
+        self._overlay = overlay
+        hidden = frozenset(hidden)
+        # Only the key lists are read; lazy base sets stay unloaded
+        self.base_keys = frozenset(k for k in base if k not in hidden and k not in overlay)
+        # Base sets hidden or replaced here; their positions mean nothing in this class
+        self.shadowed = frozenset(k for k in base if k not in self.base_keys)
+        self._keys = tuple(k for k in dict.fromkeys([*base, *overlay]) if k in overlay or k in self.base_keys)
+
+    def __getitem__(self, set_key):
+        if set_key in self._overlay:
+            return self._overlay[set_key]
+        if set_key in self.base_keys:
+            return self._base[set_key]
+        raise KeyError(set_key)
+
+    def __contains__(self, set_key) -> bool:
+        return set_key in self._overlay or set_key in self.base_keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _rank(values: tuple[str, str, str]) -> tuple[int, str]:
+    # Same order as VocabSearchIndex: shorter Spanish terms first
+    return len(values[0]), fold_search(values[0])
+
+
+class LayeredSearch:
+    """
+    Vocab search of one class: base results limited to its visible base sets,
+    merged with a small index over the class's own sets.
+    """
+
+    __slots__ = ("_base", "_overlay", "_base_keys", "set_names")
+
+    def __init__(self, base: VocabSearchIndex, overlay: VocabSearchIndex, base_keys: frozenset[str],
+                 set_names: Mapping[str, str]) -> None:
+        self._base = base
+        self._overlay = overlay
+        self._base_keys = base_keys
+        self.set_names = set_names
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchResult]:
+        limit = max(0, min(limit, MAX_LIMIT))
+        if not limit:
+            return []
+        merged: dict[tuple[str, str, str], list[tuple[str, int]]] = {}
+        # Hidden sets can drop base hits, so the base is asked for its full page
+        for result in self._base.search(query, MAX_LIMIT):
+            refs = [ref for ref in result.refs if ref[0] in self._base_keys]
+            if refs:
+                merged.setdefault(tuple(result[:3]), []).extend(refs)
+        for result in self._overlay.search(query, MAX_LIMIT):
+            merged.setdefault(tuple(result[:3]), []).extend(result.refs)
+        ordered = sorted(merged, key=_rank)[:limit]
+        return [SearchResult(*values, tuple(merged[values])) for values in ordered]
+
+    def refs(self, query: str, set_keys: Iterable[str] = ()) -> tuple[tuple[str, int], ...]:
+        scope = frozenset(set_keys)
+        base_scope = self._base_keys & scope if scope else self._base_keys
+        base_refs = self._base.refs(query, base_scope) if base_scope else ()
+        return tuple(sorted((*base_refs, *self._overlay.refs(query, scope))))
+
+
+def _conjugations_view(view: ConjugationsOptionsView, overlay: TenantOverlay) -> ConjugationsOptionsView:
+    if not overlay.hidden_verbs and not overlay.hidden_tenses:
+        return view
+    verbs = tuple(v for v in view.verbs if v not in overlay.hidden_verbs)
+    tenses = tuple(t for t in view.tenses if t not in overlay.hidden_tenses)
+    return ConjugationsOptionsView(verbs=verbs, tenses=tenses, verb_set=frozenset(verbs), tense_set=frozenset(tenses))
+
+
+def _vocab_view(view: VocabOptionsView, vocab_sets: LayeredSets, overlay: TenantOverlay) -> VocabOptionsView:
+    base_names = {set_key: name for set_key, name, _ in view.vocab_sets}
+    names = overlay.vocab_set_names
+    # Base rows keep their stored counts; only the class's own sets are counted here
+    rows = [
+        (set_key, names.get(set_key, name), count)
+        for set_key, name, count in view.vocab_sets
+        if set_key in vocab_sets.base_keys
+    ]
+    own = build_vocab_options_view({"vocab_sets": overlay.vocab_sets}, vocab_set_names={**base_names, **names})
+    rows.extend(own.vocab_sets)
+    rows.sort()
+    set_keys = tuple(set_key for set_key, _, _ in rows)
+    return VocabOptionsView(vocab_sets=tuple(rows), set_keys=set_keys, set_key_set=frozenset(set_keys))
+
+
+def build_tenant_snapshot(
+    base: ContentSnapshot,
+    overlay: TenantOverlay,
+    previous: Optional[ContentSnapshot] = None,
+) -> ContentSnapshot:
+    """The class's view of `base`; distractor columns of `previous` are reused where unchanged."""
+    vocab_sets = LayeredSets(base.vocabulary_data.get("vocab_sets", {}), overlay.vocab_sets, overlay.hidden_vocab_sets)
+    option_views = replace(
+        base.option_views,
+        conjugations=_conjugations_view(base.option_views.conjugations, overlay),
+        vocab=_vocab_view(base.option_views.vocab, vocab_sets, overlay),
+    )
+    set_names = {set_key: name for set_key, name, _ in option_views.vocab.vocab_sets}
+    own = {"vocab_sets": dict(overlay.vocab_sets)}
+    return replace(
+        base,
+        vocabulary_data={**base.vocabulary_data, "vocab_sets": vocab_sets},
+        distractors=DistractorIndex(
+            own, previous.distractors if previous is not None else None, fallback=base.distractors
+        ),
+        vocab_search=LayeredSearch(base.vocab_search, VocabSearchIndex(own, set_names), vocab_sets.base_keys, set_names),
+        option_views=option_views,
+    )
+
+
+class TenantStore:
+    """
+    The overlay files of one app plus the class snapshots built from them.
+
+    A snapshot is rebuilt when the base snapshot is replaced (reload, import)
+    or the class's overlay file changes.
+    """
+
+    def __init__(self, directory: Optional[str]) -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+        # key -> (base snapshot, overlay file version, overlay, class snapshot)
+        self._cache: dict[str, tuple[ContentSnapshot, int, TenantOverlay, ContentSnapshot]] = {}
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.directory or not TENANT_KEY_RE.match(key):
+            return None
+        return os.path.join(self.directory, f"{key}.json")
+
+    def keys(self) -> list[str]:
+        try:
+            names = os.listdir(self.directory) if self.directory else []
+        except OSError:
+            return []
+        return sorted(
+            name[:-5] for name in names if name.endswith(".json") and TENANT_KEY_RE.match(name[:-5])
+        )
+
+    def overlay(self, base: ContentSnapshot, key: str) -> Optional[TenantOverlay]:
+        entry = self._entry(base, key)
+        return entry[2] if entry is not None else None
+
+    def get(self, base: ContentSnapshot, key: str) -> Optional[ContentSnapshot]:
+        """The class snapshot of `key` over `base`; None for an unknown class, ValueError for an invalid overlay."""
+        entry = self._entry(base, key)
+        return entry[3] if entry is not None else None
+
+    def _entry(self, base: ContentSnapshot, key: str):
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            version = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] is base and cached[1] == version:
+                return cached
+            overlay = load_overlay(path, key)
+            snapshot = build_tenant_snapshot(base, overlay, cached[3] if cached is not None else None)
+            entry = (base, version, overlay, snapshot)
+            self._cache[key] = entry
+            return entry
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+
+def _display_name(key: str, names: Mapping[str, str]) -> str:
+    return names.get(key, key.replace("_", " ").title())
+
+
+@dataclass(frozen=True)
+class ConjugationsOptionsView:
+    verbs: tuple[str, ...]
+    tenses: tuple[str, ...]
+    verb_set: frozenset[str]
+    tense_set: frozenset[str]
+
+
+@dataclass(frozen=True)
+class PorParaOptionsView:
+    # key -> display name, in data order (read-only)
+    por_categories: Mapping[str, str]
+    para_categories: Mapping[str, str]
+    por_keys: tuple[str, ...]
+    para_keys: tuple[str, ...]
+    por_set: frozenset[str]
+    para_set: frozenset[str]
+
+
+@dataclass(frozen=True)
+class VocabOptionsView:
+    # (set_key, display_name, word_count), sorted by set_key
+    vocab_sets: tuple[tuple[str, str, int], ...]
+    set_keys: tuple[str, ...]
+    set_key_set: frozenset[str]
+
+
+@dataclass(frozen=True)
+class OptionViewModels:
+    conjugations: ConjugationsOptionsView
+    porpara: PorParaOptionsView
+    vocab: VocabOptionsView
+
+
+def build_conjugations_options_view(conjugations_data: dict) -> ConjugationsOptionsView:
+    quiz_data = conjugations_data.get("conjugations_quiz", {})
+    verbs = tuple(sorted(quiz_data.keys()))
+
+    # A ConjugationTable knows its tenses without generating every verb
+    tenses: set[str] = set(getattr(quiz_data, "tenses", ()))
+    if not tenses:
+        for verb_data in quiz_data.values():
+            tenses.update(verb_data.keys())
+    sorted_tenses = tuple(sorted(tenses))
+
+    return ConjugationsOptionsView(
+        verbs=verbs,
+        tenses=sorted_tenses,
+        verb_set=frozenset(verbs),
+        tense_set=frozenset(sorted_tenses),
+    )
+
+
+def build_porpara_options_view(
+    por_para_data: dict,
+    *,
+    por_category_names: Mapping[str, str],
+    para_category_names: Mapping[str, str],
+) -> PorParaOptionsView:
+    por_data = por_para_data.get("por", {})
+    para_data = por_para_data.get("para", {})
+
+    por_categories = {key: _display_name(key, por_category_names) for key in por_data.keys()}
+    para_categories = {key: _display_name(key, para_category_names) for key in para_data.keys()}
+    por_keys = tuple(por_categories.keys())
+    para_keys = tuple(para_categories.keys())
+
+    return PorParaOptionsView(
+        por_categories=MappingProxyType(por_categories),
+        para_categories=MappingProxyType(para_categories),
+        por_keys=por_keys,
+        para_keys=para_keys,
+        por_set=frozenset(por_keys),
+        para_set=frozenset(para_keys),
+    )
+
+
+def build_vocab_options_view(vocabulary_data: dict, *, vocab_set_names: Mapping[str, str]) -> VocabOptionsView:
+    vocab_sets = vocabulary_data.get("vocab_sets", {})
+
+    vocab_set_list = []
+    for set_key in sorted(vocab_sets.keys()):
+        entries = vocab_sets[set_key]
+        word_count = len(entries) if isinstance(entries, Sequence) and not isinstance(entries, str) else 0
+        vocab_set_list.append((set_key, _display_name(set_key, vocab_set_names), word_count))
+
+    set_keys = tuple(set_key for set_key, _, _ in vocab_set_list)
+    return VocabOptionsView(
+        vocab_sets=tuple(vocab_set_list),
+        set_keys=set_keys,
+        set_key_set=frozenset(set_keys),
+    )
+
+
+def build_option_view_models(
+    conjugations_data: dict,
+    por_para_data: dict,
+    vocabulary_data: dict,
+    *,
+    vocab_set_names: Mapping[str, str],
+    por_category_names: Mapping[str, str],
+    para_category_names: Mapping[str, str],
+) -> OptionViewModels:
+    """
+    Precompute everything the options pages need from one content snapshot.
+
+    The result is immutable; request handlers only merge persisted/session
+    preferences on top of it.
+    """
+    return OptionViewModels(
+        conjugations=build_conjugations_options_view(conjugations_data),
+        porpara=build_porpara_options_view(
+            por_para_data,
+            por_category_names=por_category_names,
+            para_category_names=para_category_names,
+        ),
+        vocab=build_vocab_options_view(vocabulary_data, vocab_set_names=vocab_set_names),
+    )
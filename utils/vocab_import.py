@@ -0,0 +1,311 @@
+"""
+Bulk import of a vocab set from CSV, TSV or Anki text exports.
+
+Rows are parsed one at a time from the open file (csv.reader over its lines),
+normalized, and checked against a dict of the normalized Spanish terms already
+in vocabulary.json (normalize_spanish_term, as the dialogue generator uses),
+so memory grows with the imported set, not with the input. Problems are
+reported per row as content_validator Issues; only the first
+MAX_REPORTED_ISSUES are kept, the rest are counted.
+
+The new set is written in one atomic replace of vocabulary.json; other sets
+keep their exact formatting.
+
+    python -m utils.vocab_import deck.txt --set my_deck
+    python -m utils.vocab_import words.csv --set dele_extra --replace --report import.json
+
+Columns are spanish, german[, english] by position, or named in a header row
+(spanish/español, german/deutsch, english/inglés; Anki `#columns:` headers
+are understood too). A missing English column is filled with the [TODO]
+placeholder, as for the dialogue sets.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import html
+import json
+import re
+import sys
+import threading
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional, Union
+
+from utils.content_validator import ERROR, WARNING, Issue, format_issue, write_report
+from utils.dialog_vocab_generator import normalize_spanish_term, write_vocabulary_json
+from utils.records import VOCAB_FIELDS
+
+FORMATS = ("csv", "tsv", "anki")
+MAX_REPORTED_ISSUES = 1000
+ENGLISH_PLACEHOLDER = "[TODO]"
+
+_SET_KEY_RE = re.compile(r"^[a-z0-9_]+$")
+_TAG_RE = re.compile(r"<[^>]+>")
+_BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_ANKI_SEPARATORS = {
+    "tab": "\t", "comma": ",", "semicolon": ";", "pipe": "|", "colon": ":", "space": " ",
+}
+_COLUMN_NAMES = {
+    "spanish": "spanish", "español": "spanish", "espanol": "spanish", "es": "spanish",
+    "german": "german", "deutsch": "german", "de": "german",
+    "english": "english", "inglés": "english", "ingles": "english", "en": "english",
+}
+
+# One import at a time per process; the file replace itself is atomic
+_WRITE_LOCK = threading.Lock()
+
+
+@dataclass
+class ImportReport:
+    set_key: str
+    rows: int = 0
+    imported: int = 0
+    skipped: int = 0
+    issue_count: int = 0
+    # The first MAX_REPORTED_ISSUES issues, in file order
+    issues: list[Issue] = field(default_factory=list)
+    written: bool = False
+
+    def add(self, issue: Issue) -> None:
+        self.issue_count += 1
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append(issue)
+
+    def summary(self) -> str:
+        text = f"{self.set_key}: {self.imported} imported, {self.skipped} skipped of {self.rows} rows"
+        return text + ("" if self.written else " (nothing written)")
+
+    def to_dict(self) -> dict:
+        return {
+            "set_key": self.set_key,
+            "rows": self.rows,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "written": self.written,
+            "issue_count": self.issue_count,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+def detect_format(first_line: str, filename: str = "") -> str:
+    if first_line.startswith("#separator:") or first_line.startswith("#html:"):
+        return "anki"
+    if filename.lower().endswith(".csv"):
+        return "csv"
+    if filename.lower().endswith((".tsv", ".txt")):
+        return "tsv"
+    return "tsv" if "\t" in first_line else "csv"
+
+
+def _clean(value: str, strip_html: bool) -> str:
+    if strip_html:
+        value = html.unescape(_TAG_RE.sub("", _BREAK_RE.sub(" ", value)))
+    return _WHITESPACE_RE.sub(" ", value).strip()
+
+
+def _header_columns(cells: list[str]) -> Optional[dict[str, int]]:
+    """Field -> column index if `cells` is a header row naming the Spanish and German columns."""
+    columns: dict[str, int] = {}
+    for i, cell in enumerate(cells):
+        name = _COLUMN_NAMES.get(cell.strip().lower())
+        if name and name not in columns:
+            columns[name] = i
+    return columns if "spanish" in columns and "german" in columns else None
+
+
+def iter_rows(
+    lines: Iterable[str], fmt: Optional[str] = None, filename: str = ""
+) -> Iterator[tuple[int, Union[dict, csv.Error]]]:
+    """
+    Yield (line number, {field: value}) for every data row of `lines`.
+
+    Rows with fewer than two columns are yielded with only the fields they
+    have, and rows the csv module cannot read (a field over its size limit,
+    a NUL byte) as the csv.Error, so the caller can report them. Reading
+    continues with the next line.
+    """
+    lines = iter(lines)
+    first = next(lines, "")
+    if fmt is None:
+        fmt = detect_format(first, filename)
+
+    delimiter = "," if fmt == "csv" else "\t"
+    strip_html = False
+    columns: Optional[dict[str, int]] = None
+    # Anki metadata columns (guid, notetype, deck, tags) are not fields
+    reserved: set[int] = set()
+    skip = 0
+    if fmt == "anki":
+        # Leading '#key:value' lines configure the export
+        while first.startswith("#"):
+            key, _, value = first[1:].rstrip("\r\n").partition(":")
+            if key == "separator":
+                delimiter = _ANKI_SEPARATORS.get(value.strip().lower(), value[:1] or "\t")
+            elif key == "html":
+                strip_html = value.strip().lower() == "true"
+            elif key == "columns":
+                columns = _header_columns(value.split(delimiter))
+            elif key.endswith(" column") and value.strip().isdigit():
+                reserved.add(int(value) - 1)
+            skip += 1
+            first = next(lines, "")
+
+    reader = csv.reader(chain([first], lines), delimiter=delimiter)
+    while True:
+        try:
+            cells = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield reader.line_num + skip, exc
+            continue
+        line = reader.line_num + skip
+        if not any(cell.strip() for cell in cells):
+            continue
+        if columns is None:
+            columns = _header_columns(cells)
+            if columns is not None:
+                continue
+            positions = [i for i in range(len(cells) + len(reserved)) if i not in reserved]
+            columns = dict(zip(VOCAB_FIELDS, positions))
+        yield line, {
+            name: _clean(cells[i], strip_html) for name, i in columns.items() if i < len(cells)
+        }
+
+
+def _existing_terms(vocab_sets: Mapping, exclude: str) -> dict[str, str]:
+    """Normalized Spanish term -> first set containing it (like build_existing_vocab_index)."""
+    terms: dict[str, str] = {}
+    for set_key, entries in vocab_sets.items():
+        if set_key == exclude or not isinstance(entries, list):
+            continue
+        for entry in entries:
+            spanish = entry.get("spanish") if isinstance(entry, dict) else None
+            if isinstance(spanish, str):
+                term = normalize_spanish_term(spanish)
+                if term:
+                    terms.setdefault(term, set_key)
+    return terms
+
+
+def import_entries(
+    rows: Iterable[tuple[int, Union[dict, csv.Error]]], existing: Mapping[str, str], report: ImportReport
+) -> list[dict]:
+    """Validated, normalized, deduplicated entries; every rejected row is added to `report`."""
+    entries: list[dict] = []
+    first_line: dict[str, int] = {}
+    for line, row in rows:
+        report.rows += 1
+        location = {"line": line}
+        if isinstance(row, csv.Error):
+            report.skipped += 1
+            report.add(Issue(ERROR, "unreadable_row", "import", location, {"error": str(row)}))
+            continue
+        if len(row) < 2:
+            report.skipped += 1
+            report.add(Issue(ERROR, "too_few_columns", "import", location, {"count": len(row)}))
+            continue
+        empty = next((key for key in ("spanish", "german") if not row.get(key)), None)
+        if empty:
+            report.skipped += 1
+            report.add(Issue(ERROR, "empty_field", "import", location, {"key": empty}))
+            continue
+        term = normalize_spanish_term(row["spanish"])
+        if term in existing:
+            report.skipped += 1
+            report.add(Issue(WARNING, "duplicate_existing", "import", location, {"term": term, "set": existing[term]}))
+            continue
+        if term in first_line:
+            report.skipped += 1
+            report.add(Issue(WARNING, "duplicate_in_import", "import", location,
+                             {"term": term, "first": first_line[term]}))
+            continue
+        first_line[term] = line
+        entries.append({
+            "spanish": row["spanish"],
+            "german": row["german"],
+            "english": row.get("english") or ENGLISH_PLACEHOLDER,
+        })
+    report.imported = len(entries)
+    return entries
+
+
+def import_vocab_set(
+    vocabulary_path: Path,
+    set_key: str,
+    lines: Iterable[str],
+    *,
+    fmt: Optional[str] = None,
+    filename: str = "",
+    replace: bool = False,
+    dry_run: bool = False,
+) -> ImportReport:
+    """
+    Import `lines` as vocab set `set_key` of the vocabulary.json at `vocabulary_path`.
+
+    Raises ValueError for an invalid set key or format, or when the set
+    exists and `replace` is not given. Nothing is written if no row was
+    imported or with `dry_run`.
+    """
+    if not _SET_KEY_RE.match(set_key):
+        raise ValueError(f"invalid set key {set_key!r} (use lowercase letters, digits and _)")
+    if fmt is not None and fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r} (expected one of {', '.join(FORMATS)})")
+
+    with _WRITE_LOCK:
+        previous_text = vocabulary_path.read_text(encoding="utf-8")
+        vocabulary_data = json.loads(previous_text)
+        vocab_sets = vocabulary_data.setdefault("vocab_sets", {})
+        if set_key in vocab_sets and not replace:
+            raise ValueError(f"vocab set {set_key!r} already exists")
+
+        report = ImportReport(set_key)
+        entries = import_entries(iter_rows(lines, fmt, filename), _existing_terms(vocab_sets, set_key), report)
+        if entries and not dry_run:
+            vocab_sets[set_key] = entries
+            write_vocabulary_json(vocabulary_path, vocabulary_data, previous_text=previous_text)
+            report.written = True
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    repo_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Import a vocab set from a CSV, TSV or Anki text export.")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("--set", dest="set_key", required=True, help="key of the new vocab set")
+    parser.add_argument("--format", choices=FORMATS, help="default: detected from the file")
+    parser.add_argument("--vocabulary", type=Path, default=repo_root / "data" / "vocabulary.json")
+    parser.add_argument("--replace", action="store_true", help="replace the set if it exists")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, do not write")
+    parser.add_argument("--report", help="write the row issues as a JSON report here ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.source, "r", encoding="utf-8-sig", newline="") as f:
+        try:
+            report = import_vocab_set(
+                args.vocabulary, args.set_key, f,
+                fmt=args.format, filename=args.source.name, replace=args.replace, dry_run=args.dry_run,
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.report == "-":
+        write_report(report.issues, sys.stdout)
+    elif args.report:
+        with open(args.report, "w", encoding="utf-8") as out:
+            write_report(report.issues, out)
+    if args.report != "-":
+        print(report.summary())
+        for issue in report.issues[:15]:
+            print(f"  {format_issue(issue)}")
+        if report.issue_count > 15:
+            print(f"  ... and {report.issue_count - 15} more")
+    return 0 if report.imported or not report.rows else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+"""
+Accent-insensitive vocabulary search with prefix autocomplete.
+
+Every Spanish, German and English term is folded (lowercase, no accents,
+ñ -> n) and split into words. Two structures are built per content snapshot:
+
+- an inverted index, folded word -> ids of the entries containing it, used
+  for the complete words of a multi-word query;
+- a prefix trie over the same words whose nodes keep the best few entry ids
+  below them, so a one-word prefix is answered by walking len(prefix) nodes.
+
+Identical entries in several sets are one result carrying all their set
+keys. Entry ids are `set_key:position`, the same references custom sets use.
+
+    python -m utils.vocab_search examen
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import threading
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Mapping, NamedTuple, Optional
+
+from utils.data_validator import load_and_validate_vocabulary_data
+from utils.form_index import fold_accents
+from utils.records import VOCAB_FIELDS, StringPool, compact_vocabulary_data, is_in_memory
+
+DEFAULT_LIMIT = 10
+# Results per query; also the number of entry ids each trie node keeps
+MAX_LIMIT = 25
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold_search(text: str) -> str:
+    """Search folding: fold_accents plus ñ -> n, so 'nino' finds niño."""
+    return fold_accents(text).replace("ñ", "n")
+
+
+def search_words(text: str) -> list[str]:
+    return _WORD_RE.findall(fold_search(text))
+
+
+def entry_id(set_key: str, position: int) -> str:
+    return f"{set_key}:{position}"
+
+
+def parse_entry_id(value: str) -> Optional[tuple[str, int]]:
+    """'set_key:position' -> (set_key, position); None if malformed."""
+    set_key, sep, position = value.rpartition(":")
+    if not sep or not set_key or not position.isdigit():
+        return None
+    return set_key, int(position)
+
+
+class SearchResult(NamedTuple):
+    spanish: str
+    german: str
+    english: str
+    # (set_key, position) of every occurrence, in set order
+    refs: tuple[tuple[str, int], ...]
+
+    def as_json(self, set_names: Mapping[str, str]) -> dict:
+        set_keys = tuple(dict.fromkeys(set_key for set_key, _ in self.refs))
+        return {
+            "spanish": self.spanish,
+            "german": self.german,
+            "english": self.english,
+            "ids": [entry_id(set_key, position) for set_key, position in self.refs],
+            "sets": [{"key": key, "name": set_names.get(key, key)} for key in set_keys],
+        }
+
+
+class _Node:
+    __slots__ = ("children", "top")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.top: list[int] = []
+
+
+class VocabSearchIndex:
+    """
+    Inverted index and prefix trie over one snapshot's vocabulary.
+
+    Vocabularies whose sets are all in memory (tuples and lists) are indexed
+    on construction. Lazy backends (blob, shards, SQLite) are indexed on the
+    first search, which reads every set once.
+    """
+
+    __slots__ = ("_vocabulary_data", "set_names", "_results", "_words", "_postings", "_sorted_words", "_trie", "_lock")
+
+    def __init__(self, vocabulary_data: Mapping, set_names: Mapping[str, str]) -> None:
+        self._vocabulary_data = vocabulary_data
+        self.set_names = set_names
+        self._results: Optional[tuple[SearchResult, ...]] = None
+        self._words: tuple[frozenset[str], ...] = ()
+        self._postings: dict[str, tuple[int, ...]] = {}
+        self._sorted_words: tuple[str, ...] = ()
+        self._trie = _Node()
+        self._lock = threading.Lock()
+        if all(is_in_memory(entries) for entries in vocabulary_data.get("vocab_sets", {}).values()):
+            self._build()
+
+    def __len__(self) -> int:
+        return len(self._ensure())
+
+    def _ensure(self) -> tuple[SearchResult, ...]:
+        results = self._results
+        if results is None:
+            with self._lock:
+                if self._results is None:
+                    self._build()
+                results = self._results
+        return results
+
+    def _build(self) -> None:
+        refs: dict[tuple[str, str, str], list[tuple[str, int]]] = {}
+        for set_key, entries in self._vocabulary_data.get("vocab_sets", {}).items():
+            for position, entry in enumerate(entries):
+                values = tuple(str(getattr(entry, field)) for field in VOCAB_FIELDS)
+                refs.setdefault(values, []).append((set_key, position))
+
+        # Shorter Spanish terms first: 'examen' before 'aprobar (un examen)'
+        ordered = sorted(refs, key=lambda values: (len(values[0]), fold_search(values[0])))
+        results = tuple(SearchResult(*values, tuple(refs[values])) for values in ordered)
+
+        postings: dict[str, list[int]] = {}
+        words_per_result: list[frozenset[str]] = []
+        trie = _Node()
+        for result_id, result in enumerate(results):
+            words = frozenset(
+                word
+                for value in result[:3]
+                if not value.lstrip().startswith("[")
+                for word in search_words(value)
+            )
+            words_per_result.append(words)
+            for word in words:
+                postings.setdefault(word, []).append(result_id)
+                # Results arrive in rank order, so each node keeps its best ones
+                node = trie
+                for char in word:
+                    node = node.children.setdefault(char, _Node())
+                    if len(node.top) < MAX_LIMIT and (not node.top or node.top[-1] != result_id):
+                        node.top.append(result_id)
+
+        self._words = tuple(words_per_result)
+        self._postings = {word: tuple(ids) for word, ids in postings.items()}
+        self._sorted_words = tuple(sorted(postings))
+        self._trie = trie
+        self._results = results
+
+    def _prefix_ids(self, prefix: str, limit: int) -> list[int]:
+        node = self._trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchResult]:
+        """
+        Entries matching every word of `query`, the last one as a prefix.
+
+        'exam' finds 'examen'; 'aprobar exa' finds 'aprobar (un examen)'.
+        """
+        results = self._ensure()
+        words = search_words(query)
+        limit = max(0, min(limit, MAX_LIMIT))
+        if not words or not limit:
+            return []
+        *complete, prefix = words
+        if not complete:
+            return [results[i] for i in self._prefix_ids(prefix, limit)]
+
+        postings = sorted((self._postings.get(word, ()) for word in complete), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        matched = sorted(
+            i for i in candidates
+            if any(word.startswith(prefix) for word in self._words[i])
+        )
+        return [results[i] for i in matched[:limit]]
+
+    def refs(self, query: str, set_keys: Iterable[str] = ()) -> tuple[tuple[str, int], ...]:
+        """
+        Every (set_key, position) matching `query`, without a result limit.
+
+        Same matching as search(). With `set_keys`, only occurrences in those
+        sets are returned. Used to resolve stored queries, not per keystroke.
+        """
+        results = self._ensure()
+        words = search_words(query)
+        if not words:
+            return ()
+        *complete, prefix = words
+        sorted_words = self._sorted_words
+        matched: set[int] = set()
+        i = bisect_left(sorted_words, prefix)
+        while i < len(sorted_words) and sorted_words[i].startswith(prefix):
+            matched.update(self._postings[sorted_words[i]])
+            i += 1
+        for word in complete:
+            matched.intersection_update(self._postings.get(word, ()))
+        scope = frozenset(set_keys)
+        return tuple(sorted(
+            ref
+            for i in matched
+            for ref in results[i].refs
+            if not scope or ref[0] in scope
+        ))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    repo_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Search the vocabulary sets.")
+    parser.add_argument("query")
+    parser.add_argument("--vocabulary", type=Path, default=repo_root / "data" / "vocabulary.json")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+    args = parser.parse_args(argv)
+
+    data = compact_vocabulary_data(load_and_validate_vocabulary_data(str(args.vocabulary)), StringPool())
+    index = VocabSearchIndex(data, {})
+    for result in index.search(args.query, args.limit):
+        sets = ", ".join(dict.fromkeys(set_key for set_key, _ in result.refs))
+        print(f"{result.spanish} | {result.german} | {result.english}  [{sets}]")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
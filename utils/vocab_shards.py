@@ -0,0 +1,176 @@
+"""
+Per-set vocabulary shards with lazy loading and an LRU memory budget.
+
+Layout of a shard directory:
+
+    index.json        {"version": 1, "sets": [{"key", "file", "count",
+                       "display_name", "bytes"}, ...]}
+    <set_key>.json    list of {"spanish", "german", "english"} entries
+
+Opening a ShardedVocabulary reads only index.json, so startup is
+O(number of sets). A set's shard is parsed the first time one of its entries
+is accessed; once the loaded shards exceed the budget (measured in shard file
+bytes) the least recently used ones are dropped and re-read on demand.
+
+    python -m utils.vocab_shards data/vocabulary.json data/vocab_shards
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from utils.display_names import VOCAB_SET_NAMES
+from utils.records import StringPool, compact_vocab_entries, entry_as_dict
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+
+
+def _atomic_write_json(path: str, payload) -> int:
+    directory = os.path.dirname(path) or "."
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid4().hex}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def write_vocab_shards(
+    vocabulary_data: dict,
+    shard_dir: str,
+    *,
+    display_names: Optional[Mapping[str, str]] = None,
+) -> dict:
+    """Split vocabulary.json-shaped data into one shard per set plus index.json."""
+    os.makedirs(shard_dir, exist_ok=True)
+    display_names = display_names or {}
+
+    sets = []
+    for set_key, entries in vocabulary_data.get("vocab_sets", {}).items():
+        if not isinstance(entries, (list, tuple)):
+            continue
+        file_name = f"{set_key}.json"
+        rows = [e for e in map(entry_as_dict, entries) if e is not None]
+        size = _atomic_write_json(os.path.join(shard_dir, file_name), rows)
+        sets.append(
+            {
+                "key": set_key,
+                "file": file_name,
+                "count": len(rows),
+                "display_name": display_names.get(set_key, set_key.replace("_", " ").title()),
+                "bytes": size,
+            }
+        )
+
+    index = {"version": INDEX_VERSION, "sets": sets}
+    _atomic_write_json(os.path.join(shard_dir, INDEX_FILE), index)
+    return index
+
+
+class LazyShard(Sequence):
+    """Sequence view of one set; the length comes from the index, items from the shard."""
+
+    __slots__ = ("_owner", "_key", "_count")
+
+    def __init__(self, owner: "ShardedVocabulary", key: str, count: int) -> None:
+        self._owner = owner
+        self._key = key
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        return self._owner.load(self._key)[index]
+
+    def __iter__(self):
+        return iter(self._owner.load(self._key))
+
+
+class ShardedVocabulary(Mapping):
+    """set_key -> LazyShard, backed by a shard directory."""
+
+    def __init__(self, shard_dir: str, *, budget_bytes: int = DEFAULT_BUDGET_BYTES) -> None:
+        self.shard_dir = shard_dir
+        self.budget_bytes = budget_bytes
+
+        with open(os.path.join(shard_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported vocab shard index version in {shard_dir}")
+
+        self._meta: dict[str, dict] = {row["key"]: row for row in index.get("sets", [])}
+        self._views = {key: LazyShard(self, key, int(row.get("count", 0))) for key, row in self._meta.items()}
+        self.display_names = {key: row["display_name"] for key, row in self._meta.items() if row.get("display_name")}
+
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, tuple]" = OrderedDict()
+        self._loaded_bytes = 0
+
+    def __getitem__(self, key: str) -> LazyShard:
+        return self._views[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._views)
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    @property
+    def loaded_keys(self) -> list[str]:
+        """Currently resident shards, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    def load(self, key: str) -> tuple:
+        with self._lock:
+            entries = self._loaded.get(key)
+            if entries is not None:
+                self._loaded.move_to_end(key)
+                return entries
+
+        row = self._meta[key]
+        with open(os.path.join(self.shard_dir, row["file"]), "r", encoding="utf-8") as f:
+            entries = compact_vocab_entries(json.load(f), StringPool())
+
+        with self._lock:
+            if key not in self._loaded:
+                self._loaded[key] = entries
+                self._loaded_bytes += int(row.get("bytes", 0))
+            self._loaded.move_to_end(key)
+            # Evict cold shards, but always keep the one just requested
+            while self._loaded_bytes > self.budget_bytes and len(self._loaded) > 1:
+                cold_key, _ = self._loaded.popitem(last=False)
+                self._loaded_bytes -= int(self._meta[cold_key].get("bytes", 0))
+            return self._loaded[key]
+
+    def as_vocabulary_data(self) -> dict:
+        return {"vocab_sets": self}
+
+
+def main(argv: list[str] | None = None) -> int:
+    from utils.data_validator import load_and_validate_vocabulary_data
+
+    args = sys.argv[1:] if argv is None else argv
+    repo_root = Path(__file__).resolve().parents[1]
+    src = args[0] if len(args) > 0 else str(repo_root / "data" / "vocabulary.json")
+    dst = args[1] if len(args) > 1 else str(repo_root / "data" / "vocab_shards")
+
+    index = write_vocab_shards(load_and_validate_vocabulary_data(src), dst, display_names=VOCAB_SET_NAMES)
+    print(f"Wrote {len(index['sets'])} shards to {dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,196 @@
+"""
+Printable drill worksheets of hundreds to thousands of items.
+
+Items are drawn in batches of BATCH_SIZE from the compiled content indexes
+with one seeded random.Random, so the same seed always gives the same sheet:
+
+- conjugations: the selection is compiled once into a tuple of
+  (question, answer) slots and each batch is a single rng.choices() call;
+- por/para: each batch is one stratified_positions() draw over the
+  PorParaIndex, keeping the configured por share and category coverage.
+
+Nothing is stored per item. The HTML sheet streams the question pages and
+then regenerates the same items from the seed for the answer key, so memory
+stays at one batch whatever the item count.
+
+    python -m utils.worksheet conjugations --count 1000 --verbs ser estar --tenses presente > sheet.html
+    python -m utils.worksheet porpara --count 500 --seed 7 --format csv
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+from html import escape
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, NamedTuple, Optional, Sequence
+
+from utils.conjugation_engine import persons_for, quiz_data_from_json
+from utils.export import Card, conjugation_front
+from utils.records import PorParaIndex
+from utils.sampling import stratified_positions
+
+BATCH_SIZE = 4096
+# Upper bound for one sheet served over HTTP
+MAX_ITEMS = 100_000
+
+Batches = Callable[[], Iterable[Sequence[Card]]]
+
+
+def conjugation_slots(
+    quiz_data: Mapping,
+    verbs: Iterable[str],
+    tenses: Sequence[str],
+    persons_for: Callable[[str], Sequence[str]],
+) -> tuple[Card, ...]:
+    """Every (question, answer) of the selection, compiled once per sheet."""
+    slots = []
+    for verb in verbs:
+        conjugations = quiz_data[verb]
+        for tense in tenses:
+            forms = conjugations[tense]
+            slots.extend(Card(conjugation_front(verb, tense, person), forms[person]) for person in persons_for(tense))
+    return tuple(slots)
+
+
+def conjugation_batches(slots: Sequence[Card], count: int, seed: int) -> Iterator[list[Card]]:
+    rng = random.Random(seed)
+    remaining = count if slots else 0
+    while remaining > 0:
+        batch = rng.choices(slots, k=min(BATCH_SIZE, remaining))
+        remaining -= len(batch)
+        yield batch
+
+
+def por_para_batches(
+    index: PorParaIndex, strata: Sequence[Sequence[int]], count: int, shares: Sequence[float], seed: int
+) -> Iterator[list[Card]]:
+    rng = random.Random(seed)
+    sentences, categories = index.sentences, index.categories
+    remaining = count
+    while remaining > 0:
+        drawn = stratified_positions(strata, index.lengths, min(BATCH_SIZE, remaining), shares, rng)
+        if not drawn:
+            return
+        remaining -= len(drawn)
+        yield [Card(sentences[c][p], categories[c].answer) for c, p in drawn]
+
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 1.5cm; }}
+h1, h2 {{ font-size: 1.2rem; }}
+.meta {{ color: #666; font-size: 0.9rem; }}
+ol.questions li {{ margin: 0.35cm 0; }}
+ol.answers {{ columns: 4; font-size: 0.9rem; }}
+.answer-key {{ break-before: page; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="meta">{count} items · seed {seed}</p>
+<ol class="questions">
+"""
+
+
+def stream_worksheet_html(batches: Batches, title: str, count: int, seed: int) -> Iterator[str]:
+    """Question pages, then the answer key on a new page; `batches` is called once for each."""
+    yield _HTML_HEAD.format(title=escape(title), count=count, seed=seed)
+    for batch in batches():
+        yield "".join(f"<li>{escape(card.front)} ________</li>\n" for card in batch)
+    yield '</ol>\n<section class="answer-key">\n<h2>Answer key</h2>\n<ol class="answers">\n'
+    for batch in batches():
+        yield "".join(f"<li>{escape(card.back)}</li>\n" for card in batch)
+    yield "</ol>\n</section>\n</body>\n</html>\n"
+
+
+def stream_worksheet_csv(batches: Batches, title: str, count: int, seed: int) -> Iterator[str]:
+    """number, question, answer; one pass."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(("number", "question", "answer"))
+    number = 0
+    for batch in batches():
+        writer.writerows((number + i, card.front, card.back) for i, card in enumerate(batch, 1))
+        number += len(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class WorksheetFormat(NamedTuple):
+    write: Callable[[Batches, str, int, int], Iterator[str]]
+    mimetype: str
+    extension: str
+    attachment: bool
+
+
+WORKSHEET_FORMATS: dict[str, WorksheetFormat] = {
+    "html": WorksheetFormat(stream_worksheet_html, "text/html", "html", False),
+    "csv": WorksheetFormat(stream_worksheet_csv, "text/csv", "csv", True),
+}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    data_dir = Path(__file__).resolve().parents[1] / "data"
+    parser = argparse.ArgumentParser(description="Generate a printable conjugation or por/para worksheet.")
+    parser.add_argument("quiz_type", choices=("conjugations", "porpara"))
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, help="default: random (printed on the sheet)")
+    parser.add_argument("--format", choices=tuple(WORKSHEET_FORMATS), default="html")
+    parser.add_argument("--verbs", nargs="*", help="default: all verbs")
+    parser.add_argument("--tenses", nargs="*", help="default: all tenses")
+    parser.add_argument("--por-categories", nargs="*", help="default: all por categories")
+    parser.add_argument("--para-categories", nargs="*", help="default: all para categories")
+    parser.add_argument("--por-share", type=int, default=50, help="percentage of por items")
+    parser.add_argument("--conjugations", type=Path, default=data_dir / "conjugations.json")
+    parser.add_argument("--por-para", type=Path, default=data_dir / "por_para.json")
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else random.randrange(2**31)
+    if args.quiz_type == "conjugations":
+        with open(args.conjugations, "r", encoding="utf-8") as f:
+            quiz_data = quiz_data_from_json(json.load(f))
+        verbs = args.verbs or list(quiz_data)
+        unknown = [verb for verb in verbs if verb not in quiz_data]
+        if unknown or not verbs:
+            parser.error(f"unknown verbs: {', '.join(unknown) or '(none loaded)'}")
+        known_tenses = list(quiz_data[verbs[0]])
+        tenses = args.tenses or known_tenses
+        unknown = [tense for tense in tenses if tense not in known_tenses]
+        if unknown:
+            parser.error(f"unknown tenses: {', '.join(unknown)}")
+        slots = conjugation_slots(quiz_data, verbs, tenses, persons_for)
+
+        def batches():
+            return conjugation_batches(slots, args.count, seed)
+        title = "Conjugations"
+    else:
+        with open(args.por_para, "r", encoding="utf-8") as f:
+            index = PorParaIndex(json.load(f))
+        strata = [
+            index.category_ids("por", args.por_categories or [c.key for c in index.categories if c.answer == "por"]),
+            index.category_ids("para", args.para_categories or [c.key for c in index.categories if c.answer == "para"]),
+        ]
+        share = min(100, max(0, args.por_share))
+
+        def batches():
+            return por_para_batches(index, strata, args.count, (share, 100 - share), seed)
+        title = "Por o para"
+
+    for chunk in WORKSHEET_FORMATS[args.format].write(batches, title, args.count, seed):
+        sys.stdout.write(chunk)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())